@@ -9,6 +9,7 @@ import time
 from asyncio import StreamReader
 from asyncio import StreamWriter
 from asyncio import open_connection
+from collections.abc import Sequence
 from logging import getLogger
 from typing import Any
 from typing import Self
@@ -23,6 +24,10 @@ from simple_rdp.credssp import build_ts_request_with_credentials
 from simple_rdp.credssp import build_ts_request_with_pub_key_auth
 from simple_rdp.credssp import parse_ts_request
 from simple_rdp.display import Display
+from simple_rdp.input import KeyEvent
+from simple_rdp.input import KeyModifier
+from simple_rdp.input import MouseButton
+from simple_rdp.input import MouseEvent
 from simple_rdp.mcs import build_client_cluster_data
 from simple_rdp.mcs import build_client_core_data
 from simple_rdp.mcs import build_client_network_data
@@ -53,14 +58,18 @@ from simple_rdp.pdu import PERF_DISABLE_WALLPAPER
 from simple_rdp.pdu import SEC_INFO_PKT
 from simple_rdp.pdu import UPDATETYPE_BITMAP
 from simple_rdp.pdu import build_client_info_pdu
+from simple_rdp.pdu import build_confirm_active_pdu
 from simple_rdp.pdu import build_control_pdu
 from simple_rdp.pdu import build_fast_path_input_pdu
 from simple_rdp.pdu import build_fast_path_mouse_event
+from simple_rdp.pdu import build_fast_path_mouse_move_pdu
 from simple_rdp.pdu import build_font_list_pdu
 from simple_rdp.pdu import build_input_event_pdu
 from simple_rdp.pdu import build_mouse_event
+from simple_rdp.pdu import build_mouse_move_input_event_pdu
 from simple_rdp.pdu import build_refresh_rect_pdu
 from simple_rdp.pdu import build_scancode_event
+from simple_rdp.pdu import build_share_data_header
 from simple_rdp.pdu import build_suppress_output_pdu
 from simple_rdp.pdu import build_synchronize_pdu
 from simple_rdp.pdu import build_unicode_event
@@ -182,6 +191,21 @@ KEY_MAP: dict[str, int] = {
     "pause": 0xE11D,
 }
 
+# Scancodes held down for each KeyEvent modifier
+_MODIFIER_SCANCODES: dict[KeyModifier, int] = {
+    KeyModifier.SHIFT: KEY_MAP["shift"],
+    KeyModifier.CTRL: KEY_MAP["ctrl"],
+    KeyModifier.ALT: KEY_MAP["alt"],
+    KeyModifier.WIN: KEY_MAP["win"],
+}
+
+# Button numbers understood by the mouse event builders
+_MOUSE_BUTTON_CODES: dict[MouseButton, int] = {
+    MouseButton.LEFT: 1,
+    MouseButton.RIGHT: 2,
+    MouseButton.MIDDLE: 3,
+}
+
 
 class RDPClient:
     """RDP Client for automation purposes.
@@ -802,6 +826,82 @@ class RDPClient:
             if delay > 0 and i < len(text) - 1:
                 await asyncio.sleep(delay)
 
+    async def send_text_batch(self, text: str) -> None:
+        """Send a text string as keyboard input in a single write.
+
+        Like send_text, but all press/release events are packed into as few
+        input PDUs as possible instead of one PDU per key with a pause in
+        between. Use this when typing speed doesn't need to look human.
+
+        Args:
+            text: The text to type.
+
+        """
+        if not text:
+            return
+
+        event_time = int(time.time() * 1000) & 0xFFFFFFFF
+        events = []
+        for char in text:
+            code = ord(char)
+            events.append((event_time, INPUT_EVENT_UNICODE, build_unicode_event(code, is_release=False)))
+            events.append((event_time, INPUT_EVENT_UNICODE, build_unicode_event(code, is_release=True)))
+
+        # Keep each PDU well inside the 16-bit TPKT length
+        for i in range(0, len(events), 1024):
+            await self._send_input_events(events[i : i + 1024])
+
+    async def send_input(self, events: Sequence[MouseEvent | KeyEvent]) -> None:
+        """Send a batch of input events in as few input PDUs as possible.
+
+        A MouseEvent without a button is a move; with a button it presses
+        or releases that button at (x, y). A KeyEvent's key_code is a
+        scancode (0xE0XX for extended keys); its modifiers are pressed
+        before a key press and released after a key release.
+
+        Args:
+            events: Mouse and keyboard events, sent in order.
+
+        """
+        if not events:
+            return
+
+        event_time = int(time.time() * 1000) & 0xFFFFFFFF
+        encoded: list[tuple[int, int, bytes]] = []
+        last_mouse: MouseEvent | None = None
+
+        def add_scancode(scancode: int, is_release: bool) -> None:
+            is_extended = (scancode & 0xFF00) == 0xE000
+            event_data = build_scancode_event(scancode & 0xFF, is_release=is_release, is_extended=is_extended)
+            encoded.append((event_time, INPUT_EVENT_SCANCODE, event_data))
+
+        for event in events:
+            if isinstance(event, MouseEvent):
+                if event.button is None:
+                    event_data = build_mouse_event(event.x, event.y)
+                else:
+                    button = _MOUSE_BUTTON_CODES[event.button]
+                    event_data = build_mouse_event(
+                        event.x, event.y, button=button, is_down=event.pressed, is_move=False
+                    )
+                encoded.append((event_time, INPUT_EVENT_MOUSE, event_data))
+                last_mouse = event
+            elif event.pressed:
+                for modifier in event.modifiers:
+                    add_scancode(_MODIFIER_SCANCODES[modifier], is_release=False)
+                add_scancode(event.key_code, is_release=False)
+            else:
+                add_scancode(event.key_code, is_release=True)
+                for modifier in reversed(event.modifiers):
+                    add_scancode(_MODIFIER_SCANCODES[modifier], is_release=True)
+
+        # Keep each PDU well inside the 16-bit TPKT length
+        for i in range(0, len(encoded), 1024):
+            await self._send_input_events(encoded[i : i + 1024])
+
+        if last_mouse is not None:
+            self._display.update_pointer(x=last_mouse.x, y=last_mouse.y)
+
     async def mouse_move(self, x: int, y: int) -> None:
         """Move the mouse to a position.
 
@@ -815,6 +915,56 @@ class RDPClient:
         # Update local pointer position for compositing
         self._display.update_pointer(x=x, y=y)
 
+    async def mouse_move_path(self, points: Sequence[tuple[int, int]], interval: float = 0.0) -> None:
+        """Move the mouse through a sequence of positions.
+
+        With an interval of 0, all moves are packed into as few input PDUs as
+        possible and written in one go. Otherwise one move is sent every
+        ``interval`` seconds, paced against a fixed schedule so time spent
+        sending or oversleeping doesn't accumulate over long paths.
+
+        A point equal to the one before it is skipped (its time slot is left
+        empty when paced), since it would only resend the same position.
+
+        Args:
+            points: (x, y) positions to move through, in order.
+            interval: Delay in seconds between moves.
+
+        """
+        if not points:
+            return
+
+        if interval > 0:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            previous = None
+            for i, point in enumerate(points):
+                if point == previous:
+                    continue
+                previous = point
+                if i:
+                    remaining = start + i * interval - loop.time()
+                    if remaining > 0:
+                        await asyncio.sleep(remaining)
+                await self.mouse_move(*point)
+            return
+
+        points = [point for i, point in enumerate(points) if not i or point != points[i - 1]]
+        if self._use_fast_path_input:
+            # numEvents is a single byte in the fast-path input header
+            for i in range(0, len(points), 255):
+                self._writer.write(build_fast_path_mouse_move_pdu(points[i : i + 255]))
+            await self._writer.drain()
+        else:
+            event_time = int(time.time() * 1000) & 0xFFFFFFFF
+            # Keep each PDU well inside the 16-bit TPKT length
+            for i in range(0, len(points), 1024):
+                await self._send_input_pdu(build_mouse_move_input_event_pdu(points[i : i + 1024], event_time))
+
+        # Update local pointer position for compositing (final position)
+        x, y = points[-1]
+        self._display.update_pointer(x=x, y=y)
+
     async def mouse_click(
         self,
         x: int,
@@ -939,6 +1089,79 @@ class RDPClient:
         # Update local pointer position for compositing (final position)
         self._display.update_pointer(x=x2, y=y2)
 
+    async def drag_path(
+        self,
+        points: Sequence[tuple[int, int]],
+        button: int = 1,
+        interval: float = 0.0,
+    ) -> None:
+        """Drag the mouse along a path with a button held.
+
+        The button press is carried on the move to the first point and the
+        release on the move to the last point, so no separate button events
+        are sent. Pacing works as in mouse_move_path. If sending fails or is
+        cancelled part way, a separate release is sent so the button is not
+        left held on the server.
+
+        Args:
+            points: (x, y) positions to drag through, in order.
+            button: Button to hold during drag.
+            interval: Delay in seconds between moves.
+
+        """
+        if not points:
+            return
+
+        # (x, y, button, is_down) per move; press on the first, release on the last
+        moves = [(x, y, 0, False) for x, y in points]
+        moves[0] = (*points[0], button, True)
+        if len(points) == 1:
+            moves.append((*points[0], button, False))
+        else:
+            moves[-1] = (*points[-1], button, False)
+
+        # Set once the move carrying the release has been sent
+        released = False
+        try:
+            if interval > 0:
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                for i, (x, y, btn, is_down) in enumerate(moves):
+                    if i:
+                        remaining = start + i * interval - loop.time()
+                        if remaining > 0:
+                            await asyncio.sleep(remaining)
+                    await self._send_mouse_event(x, y, button=btn, is_down=is_down)
+            elif self._use_fast_path_input:
+                events = [
+                    build_fast_path_mouse_event(x, y, button=btn, is_down=is_down) for x, y, btn, is_down in moves
+                ]
+                # numEvents is a single byte in the fast-path input header
+                for i in range(0, len(events), 255):
+                    self._writer.write(build_fast_path_input_pdu(events[i : i + 255]))
+                await self._writer.drain()
+            else:
+                event_time = int(time.time() * 1000) & 0xFFFFFFFF
+                input_events = [
+                    (event_time, INPUT_EVENT_MOUSE, build_mouse_event(x, y, button=btn, is_down=is_down))
+                    for x, y, btn, is_down in moves
+                ]
+                # Keep each PDU well inside the 16-bit TPKT length
+                for i in range(0, len(input_events), 1024):
+                    await self._send_input_events(input_events[i : i + 1024])
+            released = True
+        finally:
+            if not released:
+                # A failed or cancelled send must not leave the button held on
+                # the server; the original error still propagates
+                x, y, _, _ = moves[-1]
+                with contextlib.suppress(Exception):
+                    await self._send_mouse_event(x, y, button=button, is_down=False)
+
+        # Update local pointer position for compositing (final position)
+        x, y = points[-1]
+        self._display.update_pointer(x=x, y=y)
+
     # ==================== Connection Sequence Methods ====================
 
     async def _start_tcp_connection(self) -> None:
@@ -1283,16 +1506,10 @@ class RDPClient:
         source_descriptor = b"RDP\x00"
         capabilities = build_client_capabilities(self._width, self._height, self._color_depth)
 
-        confirm_data = bytearray()
-        confirm_data += struct.pack("<I", self._share_id)
-        confirm_data += struct.pack("<H", 0x03EA)  # originator ID
-        confirm_data += struct.pack("<H", len(source_descriptor))
-        confirm_data += struct.pack("<H", len(capabilities))
-        confirm_data += source_descriptor
-        confirm_data += capabilities
+        confirm_data = build_confirm_active_pdu(self._share_id, 0x03EA, source_descriptor, capabilities)
 
         # Wrap in share control header
-        share_control_data = self._build_share_control_pdu(PDUTYPE_CONFIRMACTIVEPDU, bytes(confirm_data))
+        share_control_data = self._build_share_control_pdu(PDUTYPE_CONFIRMACTIVEPDU, confirm_data)
 
         await self._send_mcs_data(share_control_data, self._io_channel_id)
         logger.debug("Sent Confirm Active PDU")
@@ -1497,8 +1714,14 @@ class RDPClient:
 
     async def _process_fast_path_update(self, update_code: int, update_data: bytes, compression_flags: int) -> None:
         """Process a complete (possibly reassembled) Fast-Path update."""
+        # Most frequent first: screen updates, then pointer moves and cached
+        # pointer shapes while the mouse is in use
         if update_code == 0x01:  # FASTPATH_UPDATETYPE_BITMAP
             await self._process_fast_path_bitmap(update_data, compression_flags)
+        elif update_code == 0x08:  # FASTPATH_UPDATETYPE_PTR_POSITION
+            await self._process_pointer_position(update_data)
+        elif update_code == 0x0A:  # FASTPATH_UPDATETYPE_CACHED
+            await self._process_cached_pointer(update_data)
         elif update_code == 0x00:  # FASTPATH_UPDATETYPE_ORDERS
             pass  # Skip GDI orders for now
         elif update_code == 0x03:  # FASTPATH_UPDATETYPE_SYNCHRONIZE
@@ -1512,13 +1735,9 @@ class RDPClient:
             self._pointer_image = None  # Use system default
             self._display.update_pointer(visible=True, image=None)
             logger.debug("Pointer set to default (PTR_DEFAULT)")
-        elif update_code == 0x08:  # FASTPATH_UPDATETYPE_PTR_POSITION
-            await self._process_pointer_position(update_data)
         elif update_code == 0x09:  # FASTPATH_UPDATETYPE_COLOR
             logger.debug(f"Color pointer received, data_len={len(update_data)}")
             await self._process_color_pointer(update_data)
-        elif update_code == 0x0A:  # FASTPATH_UPDATETYPE_CACHED
-            await self._process_cached_pointer(update_data)
         elif update_code == 0x0B:  # FASTPATH_UPDATETYPE_POINTER (new pointer)
             logger.debug(f"New pointer received, data_len={len(update_data)}")
             await self._process_new_pointer(update_data)
@@ -1813,7 +2032,10 @@ class RDPClient:
 
     async def _send_input_events(self, events: list[tuple[int, int, bytes]]) -> None:
         """Send input events to the server (slow-path)."""
-        input_pdu = build_input_event_pdu(events)
+        await self._send_input_pdu(build_input_event_pdu(events))
+
+    async def _send_input_pdu(self, input_pdu: bytes) -> None:
+        """Send an already built Input Event PDU to the server (slow-path)."""
         share_data = self._build_share_data_pdu(PDUTYPE2_INPUT, input_pdu)
         share_control = self._build_share_control_pdu(PDUTYPE_DATAPDU, share_data)
         await self._send_mcs_data(share_control, self._io_channel_id)
@@ -1862,15 +2084,8 @@ class RDPClient:
 
     def _build_share_data_pdu(self, pdu_type2: int, data: bytes) -> bytes:
         """Build a Share Data PDU."""
-        header = bytearray()
-        header += struct.pack("<I", self._share_id)
-        header += bytes([0])  # padding
-        header += bytes([0x01])  # stream ID = STREAM_MED
-        header += struct.pack("<H", len(data) + 4)  # uncompressed length
-        header += bytes([pdu_type2])
-        header += bytes([0])  # compressed type
-        header += struct.pack("<H", 0)  # compressed length
-        return bytes(header) + data
+        header = build_share_data_header(self._share_id, self._user_id, pdu_type2, uncompressed_length=len(data) + 4)
+        return header + data
 
     def _extract_pdu_from_mcs(self, data: bytes) -> bytes:
         """Extract PDU data from MCS Send Data Indication.
@@ -8,8 +8,6 @@ import os
 from hashlib import sha256
 from logging import getLogger
 
-import spnego
-
 logger = getLogger(__name__)
 
 # CredSSP version
@@ -34,17 +32,51 @@ ASN1_INTEGER = 0x02
 ASN1_OCTET_STRING = 0x04
 
 
+# Encoded DER lengths 0-255 (short form and 1-byte long form), which covers
+# nearly every field in a TSRequest
+_SHORT_ASN1_LENGTHS = tuple(bytes([n]) if n < 0x80 else bytes([0x81, n]) for n in range(0x100))
+
+
 def _encode_asn1_length(length: int) -> bytes:
     """Encode length in ASN.1 DER format."""
-    if length < 0x80:
-        return bytes([length])
     if length < 0x100:
-        return bytes([0x81, length])
+        return _SHORT_ASN1_LENGTHS[length]
     if length < 0x10000:
         return bytes([0x82, (length >> 8) & 0xFF, length & 0xFF])
     return bytes([0x83, (length >> 16) & 0xFF, (length >> 8) & 0xFF, length & 0xFF])
 
 
+# One-byte tag prefixes, so encoders don't build bytes([tag]) per call
+_ASN1_TAGS = tuple(bytes([tag]) for tag in range(0x100))
+
+# Complete encodings of each tag with empty content
+_EMPTY_ASN1_ELEMENTS = tuple(bytes([tag, 0]) for tag in range(0x100))
+
+
+def _encode_asn1_tlv(tag: int, content: bytes) -> bytes:
+    """Encode a tag-length-value element in ASN.1 DER format."""
+    if not content:
+        return _EMPTY_ASN1_ELEMENTS[tag]
+    return _ASN1_TAGS[tag] + _encode_asn1_length(len(content)) + content
+
+
+def _encode_asn1_nested(content: bytes, *tags: int) -> bytes:
+    """Wrap content in several nested ASN.1 tags, innermost tag first.
+
+    Equivalent to applying _encode_asn1_tlv once per tag, but the headers are
+    worked out from the lengths alone so the content is copied only once.
+    """
+    length = len(content)
+    headers = []
+    for tag in tags:
+        header = _ASN1_TAGS[tag] + _encode_asn1_length(length)
+        headers.append(header)
+        length += len(header)
+    headers.reverse()
+    headers.append(content)
+    return b"".join(headers)
+
+
 def _encode_asn1_integer(value: int) -> bytes:
     """Encode an integer in ASN.1 DER format."""
     if value < 0x80:
@@ -56,42 +88,65 @@ def _encode_asn1_integer(value: int) -> bytes:
         content = value.to_bytes((value.bit_length() + 8) // 8, "big")
         if content[0] & 0x80:
             content = b"\x00" + content
-    return bytes([ASN1_INTEGER]) + _encode_asn1_length(len(content)) + content
+    return _encode_asn1_tlv(ASN1_INTEGER, content)
 
 
 def _encode_asn1_octet_string(data: bytes) -> bytes:
     """Encode an octet string in ASN.1 DER format."""
-    return bytes([ASN1_OCTET_STRING]) + _encode_asn1_length(len(data)) + data
+    return _encode_asn1_tlv(ASN1_OCTET_STRING, data)
 
 
 def _encode_asn1_context(tag: int, content: bytes) -> bytes:
     """Encode content with a context-specific tag."""
-    return bytes([tag]) + _encode_asn1_length(len(content)) + content
+    return _encode_asn1_tlv(tag, content)
 
 
 def _encode_asn1_sequence(content: bytes) -> bytes:
     """Encode content as an ASN.1 SEQUENCE."""
-    return bytes([ASN1_SEQUENCE]) + _encode_asn1_length(len(content)) + content
+    return _encode_asn1_tlv(ASN1_SEQUENCE, content)
 
 
 def _decode_asn1_length(data: bytes, offset: int) -> tuple[int, int]:
     """Decode ASN.1 DER length. Returns (length, bytes_consumed)."""
-    if data[offset] < 0x80:
-        return data[offset], 1
-    num_octets = data[offset] & 0x7F
+    first = data[offset]
+    if first < 0x80:
+        return first, 1
+    if first == 0x81:
+        return data[offset + 1], 2
+    if first == 0x82:
+        return (data[offset + 1] << 8) | data[offset + 2], 3
+    num_octets = first & 0x7F
     length = 0
     for i in range(num_octets):
         length = (length << 8) | data[offset + 1 + i]
     return length, 1 + num_octets
 
 
+def _decode_asn1_header(data: bytes, offset: int) -> tuple[int, int, int]:
+    """Decode an ASN.1 tag and length. Returns (tag, content_start, content_length)."""
+    length, len_bytes = _decode_asn1_length(data, offset + 1)
+    return data[offset], offset + 1 + len_bytes, length
+
+
 def _decode_asn1_element(data: bytes, offset: int) -> tuple[int, bytes, int]:
     """Decode an ASN.1 element. Returns (tag, content, total_bytes_consumed)."""
-    tag = data[offset]
-    length, len_bytes = _decode_asn1_length(data, offset + 1)
-    content_start = offset + 1 + len_bytes
+    tag, content_start, length = _decode_asn1_header(data, offset)
     content = data[content_start : content_start + length]
-    return tag, content, 1 + len_bytes + length
+    return tag, content, content_start - offset + length
+
+
+def _encode_nego_tokens(nego_token: bytes) -> bytes:
+    """Encode the negoTokens [1] field carrying a single SPNEGO token.
+
+    NegoData ::= SEQUENCE OF SEQUENCE { negoToken [0] OCTET STRING }
+    """
+    return _encode_asn1_nested(
+        nego_token, ASN1_OCTET_STRING, ASN1_CONTEXT_0, ASN1_SEQUENCE, ASN1_SEQUENCE, ASN1_CONTEXT_1
+    )
+
+
+# TSRequest carrying only the default version, e.g. the initial handshake probe
+_DEFAULT_TS_REQUEST = _encode_asn1_sequence(_encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_integer(CREDSSP_VERSION)))
 
 
 def build_ts_request(nego_token: bytes | None = None, version: int = CREDSSP_VERSION) -> bytes:
@@ -106,21 +161,17 @@ def build_ts_request(nego_token: bytes | None = None, version: int = CREDSSP_VER
         clientNonce [5] OCTET STRING OPTIONAL
     }
     """
-    # Version field [0]
-    version_content = _encode_asn1_integer(version)
-    version_field = _encode_asn1_context(ASN1_CONTEXT_0, version_content)
+    if not nego_token and version == CREDSSP_VERSION:
+        return _DEFAULT_TS_REQUEST
 
-    content = version_field
+    # Version field [0]
+    fields = [_encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_integer(version))]
 
     # NegoTokens field [1] if present
     if nego_token:
-        # NegoData ::= SEQUENCE OF SEQUENCE { negoToken [0] OCTET STRING }
-        nego_token_inner = _encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_octet_string(nego_token))
-        nego_data_seq = _encode_asn1_sequence(nego_token_inner)
-        nego_data = _encode_asn1_sequence(nego_data_seq)
-        content += _encode_asn1_context(ASN1_CONTEXT_1, nego_data)
+        fields.append(_encode_nego_tokens(nego_token))
 
-    return _encode_asn1_sequence(content)
+    return _encode_asn1_sequence(b"".join(fields))
 
 
 def build_ts_request_with_pub_key_auth(
@@ -136,39 +187,27 @@ def build_ts_request_with_pub_key_auth(
     - The pubKeyAuth (encrypted hash)
     - The clientNonce (32 bytes)
     """
-    version_content = _encode_asn1_integer(version)
-    version_field = _encode_asn1_context(ASN1_CONTEXT_0, version_content)
-
-    content = version_field
+    fields = [_encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_integer(version))]
 
     # NegoTokens field [1] if present (final SPNEGO token)
     if nego_token:
-        nego_token_inner = _encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_octet_string(nego_token))
-        nego_data_seq = _encode_asn1_sequence(nego_token_inner)
-        nego_data = _encode_asn1_sequence(nego_data_seq)
-        content += _encode_asn1_context(ASN1_CONTEXT_1, nego_data)
+        fields.append(_encode_nego_tokens(nego_token))
 
     # pubKeyAuth field [3]
-    pub_key_auth_field = _encode_asn1_context(ASN1_CONTEXT_3, _encode_asn1_octet_string(pub_key_auth))
-    content += pub_key_auth_field
+    fields.append(_encode_asn1_nested(pub_key_auth, ASN1_OCTET_STRING, ASN1_CONTEXT_3))
 
     # clientNonce field [5] for v5+
     if client_nonce:
-        client_nonce_field = _encode_asn1_context(ASN1_CONTEXT_5, _encode_asn1_octet_string(client_nonce))
-        content += client_nonce_field
+        fields.append(_encode_asn1_nested(client_nonce, ASN1_OCTET_STRING, ASN1_CONTEXT_5))
 
-    return _encode_asn1_sequence(content)
+    return _encode_asn1_sequence(b"".join(fields))
 
 
 def build_ts_request_with_credentials(auth_info: bytes, version: int = CREDSSP_VERSION) -> bytes:
     """Build a TSRequest with authInfo (encrypted credentials)."""
-    version_content = _encode_asn1_integer(version)
-    version_field = _encode_asn1_context(ASN1_CONTEXT_0, version_content)
-
-    auth_info_field = _encode_asn1_context(ASN1_CONTEXT_2, _encode_asn1_octet_string(auth_info))
-
-    content = version_field + auth_info_field
-    return _encode_asn1_sequence(content)
+    version_field = _encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_integer(version))
+    auth_info_field = _encode_asn1_nested(auth_info, ASN1_OCTET_STRING, ASN1_CONTEXT_2)
+    return _encode_asn1_sequence(version_field + auth_info_field)
 
 
 def parse_ts_request(data: bytes) -> dict[str, bytes | int | None]:
@@ -185,46 +224,40 @@ def parse_ts_request(data: bytes) -> dict[str, bytes | int | None]:
         "client_nonce": None,
     }
 
-    offset = 0
-
-    # Outer SEQUENCE
-    tag, content, _ = _decode_asn1_element(data, offset)
+    # Walk the fields by offset into the original buffer; only the leaf
+    # values that end up in the result are sliced out
+    tag, offset, length = _decode_asn1_header(data, 0)
     if tag != ASN1_SEQUENCE:
         raise ValueError(f"Expected SEQUENCE, got {tag:#x}")
+    end = offset + length
 
-    # Parse fields within the sequence
-    inner_offset = 0
-    while inner_offset < len(content):
-        field_tag, field_content, field_len = _decode_asn1_element(content, inner_offset)
-        inner_offset += field_len
+    while offset < end:
+        field_tag, field_start, field_len = _decode_asn1_header(data, offset)
+        offset = field_start + field_len
 
-        if field_tag == ASN1_CONTEXT_0:  # version
-            _, int_content, _ = _decode_asn1_element(field_content, 0)
-            result["version"] = int.from_bytes(int_content, "big")
-
-        elif field_tag == ASN1_CONTEXT_1:  # negoTokens
+        if field_tag == ASN1_CONTEXT_1:  # negoTokens
             # NegoData is SEQUENCE OF SEQUENCE { negoToken [0] OCTET STRING }
-            _, outer_seq, _ = _decode_asn1_element(field_content, 0)
-            _, inner_seq, _ = _decode_asn1_element(outer_seq, 0)
-            _, token_ctx, _ = _decode_asn1_element(inner_seq, 0)
-            _, token_data, _ = _decode_asn1_element(token_ctx, 0)
-            result["nego_token"] = token_data
+            _, pos, _ = _decode_asn1_header(data, field_start)
+            _, pos, _ = _decode_asn1_header(data, pos)
+            _, pos, _ = _decode_asn1_header(data, pos)
+            _, pos, value_len = _decode_asn1_header(data, pos)
+            result["nego_token"] = data[pos : pos + value_len]
+            continue
 
-        elif field_tag == ASN1_CONTEXT_2:  # authInfo
-            _, auth_data, _ = _decode_asn1_element(field_content, 0)
-            result["auth_info"] = auth_data
+        # Every other field wraps a single INTEGER or OCTET STRING
+        _, pos, value_len = _decode_asn1_header(data, field_start)
+        value = data[pos : pos + value_len]
 
+        if field_tag == ASN1_CONTEXT_0:  # version
+            result["version"] = int.from_bytes(value, "big")
+        elif field_tag == ASN1_CONTEXT_2:  # authInfo
+            result["auth_info"] = value
         elif field_tag == ASN1_CONTEXT_3:  # pubKeyAuth
-            _, pub_key_data, _ = _decode_asn1_element(field_content, 0)
-            result["pub_key_auth"] = pub_key_data
-
+            result["pub_key_auth"] = value
         elif field_tag == ASN1_CONTEXT_4:  # errorCode
-            _, err_content, _ = _decode_asn1_element(field_content, 0)
-            result["error_code"] = int.from_bytes(err_content, "big")
-
+            result["error_code"] = int.from_bytes(value, "big")
         elif field_tag == ASN1_CONTEXT_5:  # clientNonce
-            _, nonce_data, _ = _decode_asn1_element(field_content, 0)
-            result["client_nonce"] = nonce_data
+            result["client_nonce"] = value
 
     return result
 
@@ -250,15 +283,17 @@ def build_ts_credentials(domain: str, username: str, password: str) -> bytes:
     password_bytes = password.encode("utf-16-le")
 
     # TSPasswordCreds
-    domain_field = _encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_octet_string(domain_bytes))
-    username_field = _encode_asn1_context(ASN1_CONTEXT_1, _encode_asn1_octet_string(username_bytes))
-    password_field = _encode_asn1_context(ASN1_CONTEXT_2, _encode_asn1_octet_string(password_bytes))
-
-    ts_password_creds = _encode_asn1_sequence(domain_field + username_field + password_field)
+    ts_password_creds = b"".join(
+        (
+            _encode_asn1_nested(domain_bytes, ASN1_OCTET_STRING, ASN1_CONTEXT_0),
+            _encode_asn1_nested(username_bytes, ASN1_OCTET_STRING, ASN1_CONTEXT_1),
+            _encode_asn1_nested(password_bytes, ASN1_OCTET_STRING, ASN1_CONTEXT_2),
+        )
+    )
 
     # TSCredentials
     cred_type_field = _encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_integer(1))  # 1 = password
-    credentials_field = _encode_asn1_context(ASN1_CONTEXT_1, _encode_asn1_octet_string(ts_password_creds))
+    credentials_field = _encode_asn1_nested(ts_password_creds, ASN1_SEQUENCE, ASN1_OCTET_STRING, ASN1_CONTEXT_1)
 
     return _encode_asn1_sequence(cred_type_field + credentials_field)
 
@@ -290,10 +325,18 @@ class CredSSPAuth:
         self._password = password
         self._domain = domain
         self._server_public_key: bytes | None = None
+        # Drawn fresh per connection rather than from a pre-drawn pool: a pool
+        # would be duplicated into forked children, and one urandom call is
+        # negligible next to setting up the SPNEGO context below
         self._client_nonce: bytes = os.urandom(NONCE_SIZE)
         self._server_version: int = CREDSSP_VERSION
         self._pending_token: bytes | None = None  # Store token to send with pubKeyAuth
 
+        # Imported here rather than at module level: pyspnego pulls in a large
+        # crypto stack that only the NLA handshake needs, and deferring it keeps
+        # `import simple_rdp` (and the PDU/ASN.1 helpers) quick to load
+        import spnego
+
         # Create SPNEGO context for NTLM authentication
         self._spnego_ctx = spnego.client(
             username=username,
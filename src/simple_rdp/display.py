@@ -36,11 +36,15 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import os
 import subprocess
 import tempfile
 import time
 from asyncio import Queue
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import asdict
 from dataclasses import dataclass
 from dataclasses import field
 from logging import getLogger
@@ -51,6 +55,9 @@ from PIL import Image
 logger = getLogger(__name__)
 stat_logger = getLogger("simple_rdp.display.stats")
 
+# Image modes PIL can pack directly to raw RGB by dropping the fourth byte
+_RGB_PACKABLE_MODES = frozenset({"RGB", "RGBA", "RGBX"})
+
 
 def _create_default_pointer() -> Image.Image:
     """Create a default arrow pointer image.
@@ -115,20 +122,20 @@ def _get_default_pointer() -> Image.Image:
     return _DEFAULT_POINTER
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VideoChunk:
     """A chunk of encoded video data."""
 
     data: bytes
     timestamp: float
     sequence: int
+    size_bytes: int = field(init=False)
 
-    @property
-    def size_bytes(self) -> int:
-        return len(self.data)
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "size_bytes", len(self.data))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PipelineStats:
     """Statistics for the video encoding pipeline.
 
@@ -146,6 +153,7 @@ class PipelineStats:
         queue_drops: Number of chunks dropped due to full queue.
         bitmaps_applied: Number of bitmap updates applied to display.
         consumer_lag_chunks: Current number of chunks waiting in queue.
+        frames_in_flight: Frames handed off but not yet written to ffmpeg.
 
     """
 
@@ -159,9 +167,24 @@ class PipelineStats:
     queue_drops: int = 0
     bitmaps_applied: int = 0
     consumer_lag_chunks: int = 0
+    frames_in_flight: int = 0
 
     def __post_init__(self) -> None:
-        self.total_e2e_estimate_ms = self.bitmap_to_buffer_ms + self.frame_to_ffmpeg_ms + self.ffmpeg_latency_ms
+        total = self.bitmap_to_buffer_ms + self.frame_to_ffmpeg_ms + self.ffmpeg_latency_ms
+        object.__setattr__(self, "total_e2e_estimate_ms", total)
+
+
+@dataclass(slots=True)
+class _Counters:
+    """Running counters behind Display.stats, updated on every frame."""
+
+    frames_received: int = 0
+    frames_encoded: int = 0
+    chunks_produced: int = 0
+    queue_drops: int = 0
+    bitmaps_applied: int = 0
+    pointer_updates: int = 0
+    pointer_updates_throttled: int = 0
 
 
 class Display:
@@ -182,7 +205,8 @@ class Display:
 
         When streaming is active, frames are:
         1. Captured at fixed FPS from _final_display_image
-        2. Written to ffmpeg stdin as raw RGB
+        2. Handed to a writer task, which writes them to ffmpeg stdin as raw
+           RGB while the next frame is captured
         3. Encoded to H.264 fragmented MP4
         4. Output chunks are written to both:
            - A temp .ts file (always, for full session recording)
@@ -202,6 +226,13 @@ class Display:
     # Queue size: ~20 seconds at 30fps = 600 chunks
     DEFAULT_QUEUE_SIZE = 600
 
+    # Raw frames that may wait for the ffmpeg writer before add_raw_frame blocks
+    MAX_FRAMES_IN_FLIGHT = 2
+
+    # Seconds stop_streaming waits for queued frames and an in-progress
+    # stdin write to reach ffmpeg before giving up on them
+    STOP_FLUSH_TIMEOUT = 5.0
+
     def __init__(
         self,
         width: int = 1920,
@@ -230,6 +261,8 @@ class Display:
         self._raw_display_image: Image.Image | None = None
         self._final_display_image: Image.Image | None = None
         self._final_display_image_dirty: bool = True  # Needs redraw
+        self._final_frame_bytes: bytes | None = None  # RGB24 bytes of _final_display_image
+        self._blank_frame_bytes: bytes | None = None  # Black RGB24 frame served before the screen exists
         self._screen_lock = asyncio.Lock()
 
         # Pointer state and rate limiting
@@ -244,6 +277,8 @@ class Display:
         # Video encoding state
         self._ffmpeg_process: subprocess.Popen[bytes] | None = None
         self._reader_task: asyncio.Task[None] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
+        self._stdin_write: asyncio.Future[None] | None = None  # Write running in the executor, if any
         self._stderr_task: asyncio.Task[None] | None = None
         self._streaming = False
         self._shutting_down = False
@@ -254,19 +289,30 @@ class Display:
 
         # Async queue for video chunks (real-time streaming consumers)
         self._video_queue: Queue[VideoChunk] = Queue(maxsize=queue_size)
+        self._video_queue_bytes = 0  # Running total of data bytes in _video_queue
         self._chunk_sequence = 0
 
+        # Raw frames waiting to be written to ffmpeg stdin
+        self._frame_queue: Queue[bytes | memoryview] = Queue(maxsize=self.MAX_FRAMES_IN_FLIGHT)
+
+        # Reusable slots that non-bytes frames are copied into before queueing,
+        # allocated on first use. One more slot than can be queued plus the
+        # one being written, so a slot is never overwritten while still live.
+        self._frame_ring: list[bytearray] | None = None
+        self._frame_ring_index = 0
+
         # Timing for stats
         self._session_start_time: float = time.time()
         self._recording_start_time: float | None = None
         self._first_frame_time: float | None = None
 
         # Pipeline latency tracking
-        self._bitmap_apply_times: list[float] = []  # Rolling window
-        self._frame_write_times: list[float] = []  # Rolling window
-        self._ffmpeg_latency_samples: list[float] = []  # Rolling window
-        self._last_stdin_write_time: float = 0.0
+        # Rolling windows; a full deque drops its oldest sample on append
         self._max_latency_samples = 100  # Keep last 100 samples
+        self._bitmap_apply_times: deque[float] = deque(maxlen=self._max_latency_samples)
+        self._frame_write_times: deque[float] = deque(maxlen=self._max_latency_samples)
+        self._ffmpeg_latency_samples: deque[float] = deque(maxlen=self._max_latency_samples)
+        self._last_stdin_write_time: float = 0.0
 
         # Diagnostic tracking
         self._last_diag_time: float = 0.0
@@ -275,15 +321,7 @@ class Display:
         self._encode_time_total: float = 0.0
 
         # Stats counters
-        self._stats = {
-            "frames_received": 0,
-            "frames_encoded": 0,
-            "chunks_produced": 0,
-            "queue_drops": 0,
-            "bitmaps_applied": 0,
-            "pointer_updates": 0,
-            "pointer_updates_throttled": 0,
-        }
+        self._counters = _Counters()
 
     @property
     def width(self) -> int:
@@ -321,12 +359,12 @@ class Display:
         Calculated from frames received since first frame.
         Returns 0 if not enough data.
         """
-        if self._first_frame_time is None or self._stats["frames_received"] < 2:
+        if self._first_frame_time is None or self._counters.frames_received < 2:
             return 0.0
         elapsed = time.time() - self._first_frame_time
         if elapsed <= 0:
             return 0.0
-        return self._stats["frames_received"] / elapsed
+        return self._counters.frames_received / elapsed
 
     @property
     def consumer_lag_chunks(self) -> int:
@@ -358,6 +396,15 @@ class Display:
         """
         return self._video_queue.qsize() > threshold
 
+    @property
+    def video_buffer_size_mb(self) -> float:
+        """Return the size of the encoded video waiting in the queue, in MB.
+
+        Kept as a running total updated as chunks are queued and consumed,
+        so reading it doesn't walk the queue.
+        """
+        return self._video_queue_bytes / (1024 * 1024)
+
     @property
     def pointer_position(self) -> tuple[int, int]:
         """Return the current pointer position (x, y)."""
@@ -366,7 +413,7 @@ class Display:
     @property
     def stats(self) -> dict[str, int]:
         """Return current statistics counters."""
-        return self._stats.copy()
+        return asdict(self._counters)
 
     def get_pipeline_stats(self) -> PipelineStats:
         """Get detailed pipeline statistics including latency measurements.
@@ -397,12 +444,13 @@ class Display:
             bitmap_to_buffer_ms=avg_bitmap,
             frame_to_ffmpeg_ms=avg_frame,
             ffmpeg_latency_ms=avg_ffmpeg,
-            frames_received=self._stats["frames_received"],
-            frames_encoded=self._stats["frames_encoded"],
-            chunks_produced=self._stats["chunks_produced"],
-            queue_drops=self._stats["queue_drops"],
-            bitmaps_applied=self._stats["bitmaps_applied"],
+            frames_received=self._counters.frames_received,
+            frames_encoded=self._counters.frames_encoded,
+            chunks_produced=self._counters.chunks_produced,
+            queue_drops=self._counters.queue_drops,
+            bitmaps_applied=self._counters.bitmaps_applied,
             consumer_lag_chunks=self._video_queue.qsize(),
+            frames_in_flight=self._frame_queue.qsize(),
         )
 
     @property
@@ -415,12 +463,15 @@ class Display:
         self._raw_display_image = Image.new("RGB", (self._width, self._height), (0, 0, 0))
         self._final_display_image = Image.new("RGB", (self._width, self._height), (0, 0, 0))
         self._final_display_image_dirty = True
+        self._final_frame_bytes = None
 
     def _update_final_display_image(self) -> None:
         """Update the final display image with screen + pointer composited."""
         if self._raw_display_image is None:
             return
 
+        self._final_frame_bytes = None
+
         # Reuse existing buffer if same size, otherwise create new
         if self._final_display_image is None or self._final_display_image.size != self._raw_display_image.size:
             self._final_display_image = Image.new("RGB", (self._width, self._height), (0, 0, 0))
@@ -475,7 +526,7 @@ class Display:
         # Check rate limit for position-only updates
         is_position_only = image is None and hotspot is None and visible is None
         if is_position_only and now - self._last_pointer_update < self._pointer_update_interval:
-            self._stats["pointer_updates_throttled"] += 1
+            self._counters.pointer_updates_throttled += 1
             return False
 
         # Apply updates
@@ -492,7 +543,7 @@ class Display:
 
         self._last_pointer_update = now
         self._final_display_image_dirty = True
-        self._stats["pointer_updates"] += 1
+        self._counters.pointer_updates += 1
         return True
 
     async def screenshot(self) -> Image.Image:
@@ -513,6 +564,32 @@ class Display:
             assert self._final_display_image is not None
             return self._final_display_image.copy()
 
+    async def get_latest_frame(self) -> memoryview:
+        """Return the current screen with pointer composited as raw RGB24 bytes.
+
+        The view is over the same cached frame bytes that are fed to the
+        encoder, so repeated calls between redraws don't copy the frame.
+        Like screenshot(), this returns a black frame before the screen is
+        initialized; that frame is allocated once and shared between calls.
+
+        Returns:
+            Read-only memoryview of width * height * 3 bytes.
+
+        """
+        async with self._screen_lock:
+            if self._raw_display_image is None:
+                if self._blank_frame_bytes is None:
+                    self._blank_frame_bytes = bytes(self._width * self._height * 3)
+                return memoryview(self._blank_frame_bytes)
+
+            if self._final_display_image_dirty or self._final_display_image is None:
+                self._update_final_display_image()
+
+            assert self._final_display_image is not None
+            if self._final_frame_bytes is None:
+                self._final_frame_bytes = self._final_display_image.tobytes()
+            return memoryview(self._final_frame_bytes)
+
     async def save_screenshot(self, path: str) -> None:
         """Save a screenshot to a file.
 
@@ -669,7 +746,7 @@ class Display:
 
                 # Paste onto raw display image
                 self._raw_display_image.paste(img, (x, y))
-                self._stats["bitmaps_applied"] += 1
+                self._counters.bitmaps_applied += 1
                 self._final_display_image_dirty = True
 
             except Exception as e:
@@ -678,8 +755,6 @@ class Display:
         # Track bitmap apply time
         apply_time = time.perf_counter() - apply_start
         self._bitmap_apply_times.append(apply_time)
-        if len(self._bitmap_apply_times) > self._max_latency_samples:
-            self._bitmap_apply_times.pop(0)
 
     async def start_streaming(self) -> None:
         """Start video streaming.
@@ -758,7 +833,8 @@ class Display:
             bufsize=frame_size,
         )
 
-        # Start reader task to consume ffmpeg output
+        # Start writer task to feed ffmpeg and reader task to consume its output
+        self._writer_task = asyncio.create_task(self._write_video_input())
         self._reader_task = asyncio.create_task(self._read_video_output())
         self._stderr_task = asyncio.create_task(self._read_ffmpeg_stderr())
 
@@ -775,6 +851,12 @@ class Display:
         if not self._streaming:
             return
 
+        # Let the writer hand every frame already accepted to ffmpeg first
+        try:
+            await asyncio.wait_for(self.flush(), timeout=self.STOP_FLUSH_TIMEOUT)
+        except TimeoutError:
+            logger.warning(f"Timed out flushing {self._frame_queue.qsize()} queued frames to ffmpeg")
+
         self._shutting_down = True
         self._streaming = False
 
@@ -785,7 +867,9 @@ class Display:
         if temp_path and os.path.exists(temp_path):
             if record_to:
                 logger.info(f"Transcoding recording to: {record_to}")
-                success = self.transcode(temp_path, record_to)
+                # ffmpeg runs in a worker thread so the event loop stays responsive
+                loop = asyncio.get_event_loop()
+                success = await loop.run_in_executor(None, self.transcode, temp_path, record_to)
                 if success:
                     logger.info(f"Recording saved to: {record_to}")
                 else:
@@ -805,6 +889,28 @@ class Display:
 
     async def _stop_ffmpeg(self) -> None:
         """Internal: stop the ffmpeg process."""
+        if self._writer_task:
+            self._writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+
+        # Cancelling the writer doesn't stop a write already handed to the
+        # executor; let it finish before stdin is closed underneath it
+        if self._stdin_write is not None:
+            try:
+                await asyncio.wait_for(self._stdin_write, timeout=self.STOP_FLUSH_TIMEOUT)
+            except TimeoutError:
+                logger.debug("Timed out waiting for ffmpeg stdin write")
+            except Exception as e:
+                logger.debug(f"Error in ffmpeg stdin write: {e}")
+            self._stdin_write = None
+
+        # Discard frames the writer never got to, so flush() doesn't wait on them
+        while not self._frame_queue.empty():
+            self._frame_queue.get_nowait()
+            self._frame_queue.task_done()
+
         # Close temp file
         if self._temp_file:
             try:
@@ -821,7 +927,9 @@ class Display:
                     logger.debug(f"Error closing ffmpeg stdin: {e}")
 
             try:
-                self._ffmpeg_process.wait(timeout=5)
+                # Wait for ffmpeg to flush its output off the event loop
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, functools.partial(self._ffmpeg_process.wait, timeout=5))
             except subprocess.TimeoutExpired:
                 self._ffmpeg_process.kill()
 
@@ -866,7 +974,9 @@ class Display:
         """Add a frame from a PIL Image.
 
         This converts the image to raw RGB bytes and sends to ffmpeg
-        for encoding. The pointer is composited onto the frame.
+        for encoding. The pointer is composited onto the frame. The raw
+        bytes of the composited frame are cached until the next redraw,
+        so repeated frames of an unchanged screen skip the conversion.
 
         Args:
             image: PIL Image to add (will be converted to RGB if needed).
@@ -877,46 +987,110 @@ class Display:
             self._update_final_display_image()
 
         # Use final display image (with pointer) if available
-        frame_image = self._final_display_image if self._final_display_image is not None else image
-
-        if frame_image.mode != "RGB":
-            frame_image = frame_image.convert("RGB")
+        if self._final_display_image is not None:
+            if self._final_frame_bytes is None:
+                self._final_frame_bytes = self._final_display_image.tobytes()
+            raw_data = self._final_frame_bytes
+        elif image.mode in _RGB_PACKABLE_MODES:
+            # Pack straight to RGB, dropping the alpha/pad byte, without
+            # an intermediate converted image
+            raw_data = image.tobytes("raw", "RGB")
+        else:
+            raw_data = image.convert("RGB").tobytes()
 
-        raw_data = frame_image.tobytes()
         await self.add_raw_frame(raw_data)
 
-    async def add_raw_frame(self, data: bytes) -> None:
+    async def add_raw_frame(self, data: bytes | bytearray | memoryview) -> None:
         """Add a raw RGB frame.
 
+        The frame is queued for the ffmpeg writer task, so capture of the
+        next frame overlaps with this one being written. bytes, or a
+        memoryview over bytes, is queued as-is; anything else is copied
+        first, since the caller may reuse the underlying buffer before the
+        write (a read-only memoryview can still sit over a bytearray).
+        Full-size frames are copied into a preallocated slot rather than
+        a new bytes object.
+        Blocks only while MAX_FRAMES_IN_FLIGHT frames are already waiting.
+
         Args:
-            data: Raw RGB24 bytes (width * height * 3 bytes).
+            data: Raw RGB24 buffer (width * height * 3 bytes).
 
         """
-        timestamp = time.time()
+        await self.add_raw_frames((data,))
+
+    async def add_raw_frames(self, frames: Sequence[bytes | bytearray | memoryview]) -> None:
+        """Add several raw RGB frames in order.
+
+        Equivalent to calling add_raw_frame for each frame, but the stats
+        are updated once for the whole batch. Use this when a burst of
+        frames is already at hand.
+
+        Args:
+            frames: Raw RGB24 buffers (width * height * 3 bytes each).
+
+        """
+        if not frames:
+            return
 
         if self._first_frame_time is None:
-            self._first_frame_time = timestamp
+            self._first_frame_time = time.time()
+
+        self._counters.frames_received += len(frames)
+
+        # Hand off to the writer if encoding
+        if self._streaming and not self._shutting_down and self._writer_task:
+            for data in frames:
+                if isinstance(data, bytes) or (isinstance(data, memoryview) and isinstance(data.obj, bytes)):
+                    await self._frame_queue.put(data)
+                else:
+                    await self._frame_queue.put(self._copy_frame(data))
 
-        self._stats["frames_received"] += 1
+    def _copy_frame(self, data: bytearray | memoryview) -> bytes | memoryview:
+        """Copy a frame into the next ring slot, or into new bytes if it isn't full-size."""
+        frame_size = self._width * self._height * 3
+        if memoryview(data).nbytes != frame_size:
+            return bytes(data)
+
+        if self._frame_ring is None:
+            self._frame_ring = [bytearray(frame_size) for _ in range(self.MAX_FRAMES_IN_FLIGHT + 2)]
+        slot = self._frame_ring[self._frame_ring_index]
+        self._frame_ring_index = (self._frame_ring_index + 1) % len(self._frame_ring)
+        slot[:] = data
+        return memoryview(slot)
+
+    async def flush(self) -> None:
+        """Wait until every queued frame has been written to ffmpeg."""
+        await self._frame_queue.join()
+
+    async def _write_video_input(self) -> None:
+        """Write queued raw frames to ffmpeg stdin."""
+        loop = asyncio.get_event_loop()
+
+        def _write_frame(stdin: IO[bytes], data: bytes | memoryview) -> None:
+            stdin.write(data)
+            stdin.flush()
 
-        # Send to ffmpeg if encoding
-        if self._streaming and not self._shutting_down and self._ffmpeg_process and self._ffmpeg_process.stdin:
+        while True:
+            data = await self._frame_queue.get()
             try:
+                if not self._ffmpeg_process or not self._ffmpeg_process.stdin:
+                    continue
+
                 write_start = time.perf_counter()
                 self._last_stdin_write_time = write_start
 
-                loop = asyncio.get_event_loop()
-                stdin = self._ffmpeg_process.stdin
-                await loop.run_in_executor(None, lambda: (stdin.write(data), stdin.flush()))
+                # Shielded so cancelling the writer leaves the write for
+                # _stop_ffmpeg to wait on
+                self._stdin_write = loop.run_in_executor(None, _write_frame, self._ffmpeg_process.stdin, data)
+                await asyncio.shield(self._stdin_write)
+                self._stdin_write = None
 
                 write_time = time.perf_counter() - write_start
                 self._frame_write_times.append(write_time)
-                if len(self._frame_write_times) > self._max_latency_samples:
-                    self._frame_write_times.pop(0)
 
                 self._encode_time_total += write_time
                 self._frames_since_diag += 1
-                self._stats["frames_encoded"] += 1
+                self._counters.frames_encoded += 1
 
                 # Log diagnostics periodically
                 now = time.time()
@@ -926,6 +1100,8 @@ class Display:
 
             except (BrokenPipeError, OSError):
                 pass
+            finally:
+                self._frame_queue.task_done()
 
     def _log_diagnostics(self) -> None:
         """Log backend pipeline diagnostics."""
@@ -941,21 +1117,16 @@ class Display:
         queue_size = self._video_queue.qsize()
         queue_pct = (queue_size / self._queue_size) * 100
 
-        stat_logger.info(
+        message = (
             f"Pipeline: {status} by {abs(headroom_ms):.1f}ms | "
             f"encode={avg_encode_ms:.1f}ms/frame | "
             f"queue={queue_size}/{self._queue_size} ({queue_pct:.0f}%) | "
-            f"drops={self._stats['queue_drops']} | "
-            f"fps_in={self._frames_since_diag / self._diag_interval:.1f}",
+            f"drops={self._counters.queue_drops} | "
+            f"fps_in={self._frames_since_diag / self._diag_interval:.1f}"
         )
+        stat_logger.info(message)
         if status == "BEHIND":
-            stat_logger.warning(
-                f"Pipeline: {status} by {abs(headroom_ms):.1f}ms | "
-                f"encode={avg_encode_ms:.1f}ms/frame | "
-                f"queue={queue_size}/{self._queue_size} ({queue_pct:.0f}%) | "
-                f"drops={self._stats['queue_drops']} | "
-                f"fps_in={self._frames_since_diag / self._diag_interval:.1f}",
-            )
+            stat_logger.warning(message)
 
         self._frames_since_diag = 0
         self._encode_time_total = 0.0
@@ -985,8 +1156,6 @@ class Display:
                 if self._last_stdin_write_time > 0:
                     ffmpeg_latency = time.perf_counter() - self._last_stdin_write_time
                     self._ffmpeg_latency_samples.append(ffmpeg_latency)
-                    if len(self._ffmpeg_latency_samples) > self._max_latency_samples:
-                        self._ffmpeg_latency_samples.pop(0)
 
                 # Write to temp file
                 if self._temp_file:
@@ -996,21 +1165,17 @@ class Display:
                     except Exception as e:
                         logger.debug(f"Error writing to temp file: {e}")
 
-                # Create chunk
-                chunk = VideoChunk(
-                    data=data,
-                    timestamp=time.perf_counter(),
-                    sequence=self._chunk_sequence,
-                )
+                sequence = self._chunk_sequence
                 self._chunk_sequence += 1
-                self._stats["chunks_produced"] += 1
+                self._counters.chunks_produced += 1
 
-                # Put in queue (drop if full - back-pressure)
-                try:
-                    self._video_queue.put_nowait(chunk)
-                except asyncio.QueueFull:
-                    self._stats["queue_drops"] += 1
+                # Put in queue (drop if full - back-pressure); only build the
+                # chunk once it's known to have room
+                if self._video_queue.full():
+                    self._counters.queue_drops += 1
                     logger.debug("Video queue full, dropping chunk (back-pressure)")
+                else:
+                    self._queue_video_chunk(data, sequence)
 
             except asyncio.CancelledError:
                 break
@@ -1018,6 +1183,27 @@ class Display:
                 logger.debug(f"Error reading video output: {e}")
                 await asyncio.sleep(0.01)
 
+    def _queue_video_chunk(self, data: bytes, sequence: int) -> None:
+        """Queue an encoded chunk and add it to the queued byte total."""
+        self._video_queue.put_nowait(VideoChunk(data=data, timestamp=time.perf_counter(), sequence=sequence))
+        self._video_queue_bytes += len(data)
+
+    def drain_video_chunks(self) -> list[VideoChunk]:
+        """Return every chunk currently queued without waiting.
+
+        Use this rather than reading the queue directly so that
+        video_buffer_size_mb stays in step with the queue.
+
+        Returns:
+            The queued chunks, oldest first. Empty if nothing is queued.
+
+        """
+        chunks: list[VideoChunk] = []
+        while not self._video_queue.empty():
+            chunks.append(self._video_queue.get_nowait())
+        self._video_queue_bytes -= sum(chunk.size_bytes for chunk in chunks)
+        return chunks
+
     async def get_next_video_chunk(self, timeout: float = 1.0) -> VideoChunk | None:
         """Wait for and return the next video chunk.
 
@@ -1037,10 +1223,16 @@ class Display:
             ...         websocket.send(chunk.data)
 
         """
-        try:
-            return await asyncio.wait_for(self._video_queue.get(), timeout=timeout)
-        except TimeoutError:
-            return None
+        # A backlogged consumer shouldn't pay for a wait_for task per chunk
+        if not self._video_queue.empty():
+            chunk = self._video_queue.get_nowait()
+        else:
+            try:
+                chunk = await asyncio.wait_for(self._video_queue.get(), timeout=timeout)
+            except TimeoutError:
+                return None
+        self._video_queue_bytes -= chunk.size_bytes
+        return chunk
 
     @staticmethod
     def transcode(input_path: str, output_path: str) -> bool:
@@ -1105,5 +1297,6 @@ class Display:
         print(f"Frames encoded:      {stats.frames_encoded}")
         print(f"Chunks produced:     {stats.chunks_produced}")
         print(f"Consumer lag:        {stats.consumer_lag_chunks} chunks")
+        print(f"Frames in flight:    {stats.frames_in_flight}")
         print(f"Queue drops:         {stats.queue_drops}")
         print(f"{'=' * 50}\n")
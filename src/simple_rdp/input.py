@@ -26,7 +26,7 @@ class KeyModifier(Enum):
     WIN = auto()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MouseEvent:
     """Represents a mouse event."""
 
@@ -36,7 +36,7 @@ class MouseEvent:
     pressed: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KeyEvent:
     """Represents a keyboard event."""
 
@@ -3,6 +3,8 @@
 This module implements T.125 MCS PDUs for the RDP connection sequence.
 """
 
+import functools
+import struct
 from logging import getLogger
 from typing import Any
 
@@ -43,63 +45,74 @@ SC_MCS_MSGCHANNEL = 0x0C04
 SC_MULTITRANSPORT = 0x0C05
 
 
+# Short- and one-byte long-form BER lengths, so small elements skip building them
+_SHORT_BER_LENGTHS = tuple(bytes([n]) if n < 0x80 else bytes([0x81, n]) for n in range(0x100))
+
+_BER_TRUE = bytes([0x01, 0x01, 0xFF])
+_BER_FALSE = bytes([0x01, 0x01, 0x00])
+
+
 def _ber_write_length(length: int) -> bytes:
     """Encode length in BER definite form."""
-    if length < 0x80:
-        return bytes([length])
     if length < 0x100:
-        return bytes([0x81, length])
+        return _SHORT_BER_LENGTHS[length]
     if length < 0x10000:
-        return bytes([0x82, (length >> 8) & 0xFF, length & 0xFF])
+        return b"\x82" + length.to_bytes(2, "big")
     raise ValueError(f"Length too large: {length}")
 
 
+def _ber_write_tlv(tag: bytes, content: bytes) -> bytes:
+    """Encode a BER element from its tag octets and content in one join."""
+    return b"".join((tag, _ber_write_length(len(content)), content))
+
+
 def _ber_write_integer(value: int) -> bytes:
     """Encode an integer in BER format."""
-    # Determine the minimum number of bytes needed
-    if value == 0:
-        content = bytes([0])
-    elif value > 0:
-        content = value.to_bytes((value.bit_length() + 8) // 8, "big")
-        if content[0] & 0x80:
-            content = b"\x00" + content
-    else:
+    if value < 0:
         raise ValueError("Negative integers not supported")
-    return bytes([0x02]) + _ber_write_length(len(content)) + content
+    # bit_length() + 8 leaves room for the sign bit, so a high bit set in the
+    # top octet always gets a leading zero octet
+    length = (value.bit_length() + 8) // 8
+    return b"".join((b"\x02", _SHORT_BER_LENGTHS[length], value.to_bytes(length, "big")))
 
 
 def _ber_write_octet_string(data: bytes) -> bytes:
     """Encode an octet string in BER format."""
-    return bytes([0x04]) + _ber_write_length(len(data)) + data
+    return _ber_write_tlv(b"\x04", data)
 
 
 def _ber_write_boolean(value: bool) -> bytes:
     """Encode a boolean in BER format."""
-    return bytes([0x01, 0x01, 0xFF if value else 0x00])
+    return _BER_TRUE if value else _BER_FALSE
 
 
 def _ber_write_sequence(content: bytes) -> bytes:
     """Encode a sequence in BER format."""
-    return bytes([0x30]) + _ber_write_length(len(content)) + content
+    return _ber_write_tlv(b"\x30", content)
 
 
 def _ber_write_application_tag(tag: int, content: bytes) -> bytes:
     """Encode an APPLICATION tag in BER format."""
     # For tags > 30, use multi-byte encoding
     if tag > 30:
-        return bytes([0x7F, tag]) + _ber_write_length(len(content)) + content
-    return bytes([0x60 | tag]) + _ber_write_length(len(content)) + content
+        return _ber_write_tlv(bytes([0x7F, tag]), content)
+    return _ber_write_tlv(bytes([0x60 | tag]), content)
+
+
+# One-byte PER lengths, so the common short case is a table lookup
+_SHORT_PER_LENGTHS = tuple(bytes([n]) for n in range(0x80))
 
 
 def _per_write_length(length: int) -> bytes:
     """Encode length in PER format."""
     if length < 0x80:
-        return bytes([length])
+        return _SHORT_PER_LENGTHS[length]
     if length < 0x4000:
-        return bytes([0x80 | ((length >> 8) & 0x3F), length & 0xFF])
+        return (0x8000 | length).to_bytes(2, "big")
     raise ValueError(f"Length too large for PER: {length}")
 
 
+@functools.lru_cache(maxsize=8)
 def build_domain_parameters(
     max_channel_ids: int = 34,
     max_user_ids: int = 2,
@@ -110,20 +123,49 @@ def build_domain_parameters(
     max_mcs_pdu_size: int = 65535,
     protocol_version: int = 2,
 ) -> bytes:
-    """Build MCS DomainParameters structure."""
-    content = (
-        _ber_write_integer(max_channel_ids)
-        + _ber_write_integer(max_user_ids)
-        + _ber_write_integer(max_token_ids)
-        + _ber_write_integer(num_priorities)
-        + _ber_write_integer(min_throughput)
-        + _ber_write_integer(max_height)
-        + _ber_write_integer(max_mcs_pdu_size)
-        + _ber_write_integer(protocol_version)
+    """Build MCS DomainParameters structure.
+
+    The result only depends on the integer arguments, so it is memoized.
+    """
+    content = b"".join(
+        map(
+            _ber_write_integer,
+            (
+                max_channel_ids,
+                max_user_ids,
+                max_token_ids,
+                num_priorities,
+                min_throughput,
+                max_height,
+                max_mcs_pdu_size,
+                protocol_version,
+            ),
+        )
     )
     return _ber_write_sequence(content)
 
 
+# TS_UD_CS_CORE, packed in one call instead of field by field
+_CLIENT_CORE_DATA = struct.Struct(
+    "<"
+    "HH"  # header: type, length
+    "I"  # version
+    "HH"  # desktopWidth, desktopHeight
+    "HH"  # colorDepth, SASSequence
+    "I"  # keyboardLayout
+    "I"  # clientBuild
+    "32s"  # clientName
+    "III"  # keyboardType, keyboardSubType, keyboardFunctionKey
+    "64s"  # imeFileName
+    "HH"  # postBeta2ColorDepth, clientProductId
+    "I"  # serialNumber
+    "HHH"  # highColorDepth, supportedColorDepths, earlyCapabilityFlags
+    "64s"  # clientDigProductId
+    "Bx"  # connectionType, pad1octet
+    "I"  # serverSelectedProtocol
+)
+
+
 def build_client_core_data(
     version: int = 0x00080004,
     desktop_width: int = 1920,
@@ -148,90 +190,32 @@ def build_client_core_data(
     server_selected_protocol: int = 2,  # PROTOCOL_HYBRID (NLA)
 ) -> bytes:
     """Build Client Core Data (TS_UD_CS_CORE)."""
-    data = bytearray()
-
-    # Header: type (2) + length (2) - will be filled at the end
-    header_pos = len(data)
-    data += bytes(4)
-
-    # version (4 bytes)
-    data += version.to_bytes(4, "little")
-
-    # desktopWidth (2 bytes)
-    data += desktop_width.to_bytes(2, "little")
-
-    # desktopHeight (2 bytes)
-    data += desktop_height.to_bytes(2, "little")
-
-    # colorDepth (2 bytes)
-    data += color_depth.to_bytes(2, "little")
-
-    # SASSequence (2 bytes)
-    data += sas_sequence.to_bytes(2, "little")
-
-    # keyboardLayout (4 bytes)
-    data += keyboard_layout.to_bytes(4, "little")
-
-    # clientBuild (4 bytes)
-    data += client_build.to_bytes(4, "little")
-
-    # clientName (32 bytes, UTF-16LE, null-terminated)
-    name_encoded = client_name[:15].encode("utf-16-le")
-    name_padded = name_encoded.ljust(32, b"\x00")
-    data += name_padded
-
-    # keyboardType (4 bytes)
-    data += keyboard_type.to_bytes(4, "little")
-
-    # keyboardSubType (4 bytes)
-    data += keyboard_sub_type.to_bytes(4, "little")
-
-    # keyboardFunctionKey (4 bytes)
-    data += keyboard_function_key.to_bytes(4, "little")
-
-    # imeFileName (64 bytes, UTF-16LE)
-    ime_encoded = ime_file_name[:31].encode("utf-16-le")
-    ime_padded = ime_encoded.ljust(64, b"\x00")
-    data += ime_padded
-
-    # postBeta2ColorDepth (2 bytes)
-    data += post_beta2_color_depth.to_bytes(2, "little")
-
-    # clientProductId (2 bytes)
-    data += client_product_id.to_bytes(2, "little")
-
-    # serialNumber (4 bytes)
-    data += serial_number.to_bytes(4, "little")
-
-    # highColorDepth (2 bytes)
-    data += high_color_depth.to_bytes(2, "little")
-
-    # supportedColorDepths (2 bytes)
-    data += supported_color_depths.to_bytes(2, "little")
-
-    # earlyCapabilityFlags (2 bytes)
-    data += early_capability_flags.to_bytes(2, "little")
-
-    # clientDigProductId (64 bytes)
-    dig_encoded = client_dig_product_id[:31].encode("utf-16-le")
-    dig_padded = dig_encoded.ljust(64, b"\x00")
-    data += dig_padded
-
-    # connectionType (1 byte)
-    data += bytes([connection_type])
-
-    # pad1octet (1 byte)
-    data += bytes([0])
-
-    # serverSelectedProtocol (4 bytes)
-    data += server_selected_protocol.to_bytes(4, "little")
-
-    # Fill in the header
-    length = len(data)
-    data[header_pos : header_pos + 2] = CS_CORE.to_bytes(2, "little")
-    data[header_pos + 2 : header_pos + 4] = length.to_bytes(2, "little")
-
-    return bytes(data)
+    # Strings are UTF-16LE and null-terminated; the "s" fields pad them with zeros
+    return _CLIENT_CORE_DATA.pack(
+        CS_CORE,
+        _CLIENT_CORE_DATA.size,
+        version,
+        desktop_width,
+        desktop_height,
+        color_depth,
+        sas_sequence,
+        keyboard_layout,
+        client_build,
+        client_name[:15].encode("utf-16-le"),
+        keyboard_type,
+        keyboard_sub_type,
+        keyboard_function_key,
+        ime_file_name[:31].encode("utf-16-le"),
+        post_beta2_color_depth,
+        client_product_id,
+        serial_number,
+        high_color_depth,
+        supported_color_depths,
+        early_capability_flags,
+        client_dig_product_id[:31].encode("utf-16-le"),
+        connection_type,
+        server_selected_protocol,
+    )
 
 
 def build_client_security_data(
@@ -254,6 +238,18 @@ def build_client_security_data(
     return bytes(data)
 
 
+# TS_UD_CS_NET header (type, length) + channelCount, and one CHANNEL_DEF
+_CLIENT_NETWORK_DATA_HEADER = struct.Struct("<HHI")
+_CHANNEL_DEF = struct.Struct("<8sI")
+
+
+@functools.lru_cache(maxsize=64)
+def _encode_channel_def(name: str, options: int) -> bytes:
+    """Encode one CHANNEL_DEF; cached since a client's channel list rarely changes."""
+    # name (8 bytes, null-terminated ASCII) + options (4 bytes)
+    return _CHANNEL_DEF.pack(name[:7].encode("ascii"), options)
+
+
 def build_client_network_data(channels: list[tuple[str, int]] | None = None) -> bytes:
     """Build Client Network Data (TS_UD_CS_NET).
 
@@ -264,30 +260,13 @@ def build_client_network_data(channels: list[tuple[str, int]] | None = None) ->
     if channels is None:
         channels = []
 
-    data = bytearray()
-
-    # Header placeholder
-    header_pos = len(data)
-    data += bytes(4)
-
-    # channelCount (4 bytes)
-    data += len(channels).to_bytes(4, "little")
-
-    # channelDefArray
-    for name, options in channels:
-        # name (8 bytes, null-terminated ASCII)
-        name_bytes = name[:7].encode("ascii")
-        name_padded = name_bytes.ljust(8, b"\x00")
-        data += name_padded
-        # options (4 bytes)
-        data += options.to_bytes(4, "little")
-
-    # Fill in the header
-    length = len(data)
-    data[header_pos : header_pos + 2] = CS_NET.to_bytes(2, "little")
-    data[header_pos + 2 : header_pos + 4] = length.to_bytes(2, "little")
-
-    return bytes(data)
+    length = _CLIENT_NETWORK_DATA_HEADER.size + _CHANNEL_DEF.size * len(channels)
+    return b"".join(
+        (
+            _CLIENT_NETWORK_DATA_HEADER.pack(CS_NET, length, len(channels)),
+            *(_encode_channel_def(name, options) for name, options in channels),
+        )
+    )
 
 
 def build_client_cluster_data(
@@ -310,40 +289,35 @@ def build_client_cluster_data(
     return bytes(data)
 
 
+# Fixed GCC Conference Create Request fields preceding the user data length
+_GCC_CCR_HEADER = (
+    bytes(
+        [
+            0x00,  # extension bit + choice (conferenceCreateRequest)
+            0x08,  # optional fields present: userData
+            0x00,  # ConferenceName::numeric length (1 char)
+            0x10,  # ConferenceName::numeric = "1"
+            0x00,  # terminationMethod::automatic
+            0x01,  # Number of UserData sets = 1
+            0xC0,  # UserData present + Key choice (h221NonStandard)
+            0x00,  # h221NonStandard length (4 octets)
+        ]
+    )
+    + H221_CS_KEY  # h221NonStandard key = "Duca"
+)
+
+# Key choice: object (0), object length, T.124 object ID
+_GCC_CONNECT_DATA_HEADER = bytes([0x00, len(GCC_OBJECT_ID)]) + GCC_OBJECT_ID
+
+
 def build_gcc_conference_create_request(user_data: bytes) -> bytes:
     """Build PER-encoded GCC Conference Create Request.
 
     This wraps the user data in the GCC/T.124 structure.
     """
-    # The GCC CCR is PER-encoded (ALIGNED variant)
-    data = bytearray()
-
-    # ConnectGCCPDU choice + ConferenceCreateRequest fields
-    data += bytes([0x00])  # extension bit + choice (conferenceCreateRequest)
-    data += bytes([0x08])  # optional fields present: userData
-    data += bytes([0x00])  # ConferenceName::numeric length (1 char)
-    data += bytes([0x10])  # ConferenceName::numeric = "1"
-    data += bytes([0x00])  # terminationMethod::automatic
-
-    # Number of UserData sets = 1
-    data += bytes([0x01])
-
-    # UserData present + Key choice (h221NonStandard)
-    data += bytes([0xC0])
-
-    # h221NonStandard length (4 octets)
-    data += bytes([0x00])
-
-    # h221NonStandard key = "Duca"
-    data += H221_CS_KEY
-
-    # UserData::value length (PER encoded)
-    data += _per_write_length(len(user_data))
-
-    # UserData::value
-    data += user_data
-
-    return bytes(data)
+    # The GCC CCR is PER-encoded (ALIGNED variant): fixed header, then
+    # UserData::value length (PER encoded) and UserData::value
+    return b"".join((_GCC_CCR_HEADER, _per_write_length(len(user_data)), user_data))
 
 
 def build_gcc_connect_data(gcc_ccr: bytes) -> bytes:
@@ -351,24 +325,28 @@ def build_gcc_connect_data(gcc_ccr: bytes) -> bytes:
 
     This wraps the GCC Conference Create Request.
     """
-    data = bytearray()
-
-    # Key choice: object (0)
-    data += bytes([0x00])
-
-    # Object length
-    data += bytes([len(GCC_OBJECT_ID)])
-
-    # Object ID
-    data += GCC_OBJECT_ID
-
-    # connectPDU length (PER encoded)
-    data += _per_write_length(len(gcc_ccr))
-
-    # connectPDU (GCC Conference Create Request)
-    data += gcc_ccr
-
-    return bytes(data)
+    # Object key header, then connectPDU length (PER encoded) and connectPDU
+    return b"".join((_GCC_CONNECT_DATA_HEADER, _per_write_length(len(gcc_ccr)), gcc_ccr))
+
+
+# Encodings that are identical for every connection, built once at import
+_DEFAULT_TARGET_PARAMS = build_domain_parameters(max_channel_ids=34, max_user_ids=2)
+_DEFAULT_MIN_PARAMS = build_domain_parameters(
+    max_channel_ids=1,
+    max_user_ids=1,
+    max_token_ids=1,
+    max_mcs_pdu_size=1056,
+)
+_DEFAULT_MAX_PARAMS = build_domain_parameters(
+    max_channel_ids=65535,
+    max_user_ids=64535,
+    max_token_ids=65535,
+)
+_CONNECT_INITIAL_SELECTORS = (
+    _ber_write_octet_string(bytes([0x01]))  # callingDomainSelector
+    + _ber_write_octet_string(bytes([0x01]))  # calledDomainSelector
+    + _ber_write_boolean(True)  # upwardFlag
+)
 
 
 def build_mcs_connect_initial(
@@ -388,55 +366,42 @@ def build_mcs_connect_initial(
     """
     # Default domain parameters if not provided
     if target_params is None:
-        target_params = build_domain_parameters(max_channel_ids=34, max_user_ids=2)
+        target_params = _DEFAULT_TARGET_PARAMS
     if min_params is None:
-        min_params = build_domain_parameters(
-            max_channel_ids=1,
-            max_user_ids=1,
-            max_token_ids=1,
-            max_mcs_pdu_size=1056,
-        )
+        min_params = _DEFAULT_MIN_PARAMS
     if max_params is None:
-        max_params = build_domain_parameters(
-            max_channel_ids=65535,
-            max_user_ids=64535,
-            max_token_ids=65535,
-        )
+        max_params = _DEFAULT_MAX_PARAMS
 
     # Build GCC structures
     gcc_ccr = build_gcc_conference_create_request(user_data)
     gcc_connect_data = build_gcc_connect_data(gcc_ccr)
 
     # Build MCS Connect Initial content
-    content = bytearray()
-
-    # callingDomainSelector (OCTET STRING)
-    content += _ber_write_octet_string(bytes([0x01]))
-
-    # calledDomainSelector (OCTET STRING)
-    content += _ber_write_octet_string(bytes([0x01]))
-
-    # upwardFlag (BOOLEAN)
-    content += _ber_write_boolean(True)
-
-    # targetParameters (DomainParameters)
-    content += target_params
-
-    # minimumParameters (DomainParameters)
-    content += min_params
-
-    # maximumParameters (DomainParameters)
-    content += max_params
-
-    # userData (OCTET STRING)
-    content += _ber_write_octet_string(gcc_connect_data)
+    content = b"".join(
+        (
+            # callingDomainSelector, calledDomainSelector, upwardFlag
+            _CONNECT_INITIAL_SELECTORS,
+            # targetParameters (DomainParameters)
+            target_params,
+            # minimumParameters (DomainParameters)
+            min_params,
+            # maximumParameters (DomainParameters)
+            max_params,
+            # userData (OCTET STRING)
+            _ber_write_octet_string(gcc_connect_data),
+        )
+    )
 
     # Wrap in APPLICATION 101 tag
-    mcs_ci = _ber_write_application_tag(MCS_TYPE_CONNECT_INITIAL, bytes(content))
+    mcs_ci = _ber_write_application_tag(MCS_TYPE_CONNECT_INITIAL, content)
 
     return mcs_ci
 
 
+# Encodings of every one-byte PER integer
+_PER_ONE_BYTE_INTEGERS = tuple(bytes([0x01, value]) for value in range(0x100))
+
+
 def _per_write_integer(value: int) -> bytes:
     """Encode an integer in PER (unaligned) format for MCS PDUs.
 
@@ -447,10 +412,12 @@ def _per_write_integer(value: int) -> bytes:
     For value 0: encoded as 01 00 (1 byte length, value 0)
     For value 1: encoded as 01 01 (1 byte length, value 1)
     """
+    if value < 0:
+        raise ValueError(f"Negative integers not supported: {value}")
     if value < 256:
-        return bytes([0x01, value])
+        return _PER_ONE_BYTE_INTEGERS[value]
     if value < 65536:
-        return bytes([0x02, (value >> 8) & 0xFF, value & 0xFF])
+        return b"\x02" + value.to_bytes(2, "big")
     raise ValueError(f"Integer too large for PER encoding: {value}")
 
 
@@ -517,12 +484,9 @@ def build_mcs_send_data_request(
 
     # User data length (PER encoded)
     # Use segmented length encoding for data > 16383 bytes
-    if len(user_data) < 0x80:
-        pdu.append(len(user_data))
-    elif len(user_data) < 0x4000:
-        pdu += bytes([0x80 | ((len(user_data) >> 8) & 0x3F), len(user_data) & 0xFF])
-    else:
+    if len(user_data) >= 0x4000:
         raise ValueError("User data too large for single segment")
+    pdu += _per_write_length(len(user_data))
 
     # User data
     pdu += user_data
@@ -708,6 +672,13 @@ def _parse_server_network_data(data: bytes) -> dict[str, Any]:
     return result
 
 
+# Fixed leading fields of the confirm PDUs: type/flags byte, result, then
+# big-endian initiator (and, for channel join, the requested channel ID)
+_ATTACH_USER_CONFIRM = struct.Struct(">BBH")
+_CHANNEL_JOIN_CONFIRM = struct.Struct(">BBHH")
+_UINT16_BE = struct.Struct(">H")
+
+
 def parse_mcs_attach_user_confirm(data: bytes) -> dict[str, Any]:
     """Parse MCS Attach User Confirm PDU.
 
@@ -726,7 +697,7 @@ def parse_mcs_attach_user_confirm(data: bytes) -> dict[str, Any]:
 
     logger.debug(f"Attach User Confirm raw data: {data[: min(8, len(data))].hex(' ')}")
 
-    first_byte = data[0]
+    first_byte, result_value = data[0], data[1]
     mcs_type = (first_byte >> 2) & 0x3F
     initiator_present = (first_byte >> 1) & 0x01
 
@@ -736,14 +707,13 @@ def parse_mcs_attach_user_confirm(data: bytes) -> dict[str, Any]:
     # Result is encoded across byte boundary
     # Bit 0 of first byte + upper nibble of second byte form the result
     # But for simplicity, since result values are small (0-14), we can just read byte 1
-    result_value = data[1]
     result["result"] = result_value
 
     logger.debug(f"Attach User Confirm: type={mcs_type}, initiator_present={initiator_present}, result={result_value}")
 
     # User ID (2 bytes, big-endian, add 1001) - only if initiator present
     if initiator_present and len(data) >= 4:
-        user_id = int.from_bytes(data[2:4], "big") + 1001
+        user_id = _ATTACH_USER_CONFIRM.unpack_from(data)[2] + 1001
         result["user_id"] = user_id
         logger.debug(f"User ID from confirm: {user_id}")
 
@@ -769,7 +739,7 @@ def parse_mcs_channel_join_confirm(data: bytes) -> dict[str, Any]:
 
     logger.debug(f"Channel Join Confirm raw data: {data[: min(10, len(data))].hex(' ')}")
 
-    first_byte = data[0]
+    first_byte, result_value, initiator, requested_channel = _CHANNEL_JOIN_CONFIRM.unpack_from(data)
     mcs_type = (first_byte >> 2) & 0x3F
     channel_id_present = (first_byte >> 1) & 0x01
 
@@ -777,19 +747,15 @@ def parse_mcs_channel_join_confirm(data: bytes) -> dict[str, Any]:
         raise ValueError(f"Expected Channel Join Confirm (type 15), got type {mcs_type}")
 
     # Result is in byte 1
-    result_value = data[1]
     result["result"] = result_value
 
     # initiator (user ID - 1001)
-    user_id = int.from_bytes(data[2:4], "big") + 1001
+    user_id = initiator + 1001
     result["user_id"] = user_id
 
-    # requested (channel ID)
-    requested_channel = int.from_bytes(data[4:6], "big")
-
     # channelId (only if present flag is set and result is success)
     if channel_id_present and result_value == 0 and len(data) >= 8:
-        result["channel_id"] = int.from_bytes(data[6:8], "big")
+        result["channel_id"] = _UINT16_BE.unpack_from(data, 6)[0]
     else:
         result["channel_id"] = requested_channel
 
@@ -4,129 +4,149 @@ This module implements RDP-specific PDUs for the connection sequence
 and data exchange phases.
 """
 
+import functools
 import struct
+import sys
+from array import array
+from collections.abc import Sequence
 from logging import getLogger
 from typing import Any
+from typing import Final
 
 logger = getLogger(__name__)
 
 # Security header flags
-SEC_EXCHANGE_PKT = 0x0001
-SEC_TRANSPORT_REQ = 0x0002
-SEC_TRANSPORT_RSP = 0x0004
-SEC_ENCRYPT = 0x0008
-SEC_RESET_SEQNO = 0x0010
-SEC_IGNORE_SEQNO = 0x0020
-SEC_INFO_PKT = 0x0040
-SEC_LICENSE_PKT = 0x0080
-SEC_LICENSE_ENCRYPT_CS = 0x0200
-SEC_LICENSE_ENCRYPT_SC = 0x0200
-SEC_REDIRECTION_PKT = 0x0400
-SEC_SECURE_CHECKSUM = 0x0800
-SEC_AUTODETECT_REQ = 0x1000
-SEC_AUTODETECT_RSP = 0x2000
-SEC_HEARTBEAT = 0x4000
-SEC_FLAGSHI_VALID = 0x8000
+SEC_EXCHANGE_PKT: Final[int] = 0x0001
+SEC_TRANSPORT_REQ: Final[int] = 0x0002
+SEC_TRANSPORT_RSP: Final[int] = 0x0004
+SEC_ENCRYPT: Final[int] = 0x0008
+SEC_RESET_SEQNO: Final[int] = 0x0010
+SEC_IGNORE_SEQNO: Final[int] = 0x0020
+SEC_INFO_PKT: Final[int] = 0x0040
+SEC_LICENSE_PKT: Final[int] = 0x0080
+SEC_LICENSE_ENCRYPT_CS: Final[int] = 0x0200
+SEC_LICENSE_ENCRYPT_SC: Final[int] = 0x0200
+SEC_REDIRECTION_PKT: Final[int] = 0x0400
+SEC_SECURE_CHECKSUM: Final[int] = 0x0800
+SEC_AUTODETECT_REQ: Final[int] = 0x1000
+SEC_AUTODETECT_RSP: Final[int] = 0x2000
+SEC_HEARTBEAT: Final[int] = 0x4000
+SEC_FLAGSHI_VALID: Final[int] = 0x8000
 
 # Share control PDU types
-PDUTYPE_DEMANDACTIVEPDU = 0x0001
-PDUTYPE_CONFIRMACTIVEPDU = 0x0003
-PDUTYPE_DEACTIVATEALLPDU = 0x0006
-PDUTYPE_DATAPDU = 0x0007
-PDUTYPE_SERVER_REDIR_PKT = 0x000A
+PDUTYPE_DEMANDACTIVEPDU: Final[int] = 0x0001
+PDUTYPE_CONFIRMACTIVEPDU: Final[int] = 0x0003
+PDUTYPE_DEACTIVATEALLPDU: Final[int] = 0x0006
+PDUTYPE_DATAPDU: Final[int] = 0x0007
+PDUTYPE_SERVER_REDIR_PKT: Final[int] = 0x000A
 
 # Share data PDU types
-PDUTYPE2_UPDATE = 0x02
-PDUTYPE2_CONTROL = 0x14
-PDUTYPE2_POINTER = 0x1B
-PDUTYPE2_INPUT = 0x1C
-PDUTYPE2_SYNCHRONIZE = 0x1F
-PDUTYPE2_REFRESH_RECT = 0x21
-PDUTYPE2_PLAY_SOUND = 0x22
-PDUTYPE2_SUPPRESS_OUTPUT = 0x23
-PDUTYPE2_SHUTDOWN_REQUEST = 0x24
-PDUTYPE2_SHUTDOWN_DENIED = 0x25
-PDUTYPE2_SAVE_SESSION_INFO = 0x26
-PDUTYPE2_FONTLIST = 0x27
-PDUTYPE2_FONTMAP = 0x28
-PDUTYPE2_SET_KEYBOARD_INDICATORS = 0x29
-PDUTYPE2_BITMAPCACHE_PERSISTENT_LIST = 0x2B
-PDUTYPE2_BITMAPCACHE_ERROR_PDU = 0x2C
-PDUTYPE2_SET_KEYBOARD_IME_STATUS = 0x2D
-PDUTYPE2_OFFSCRCACHE_ERROR_PDU = 0x2E
-PDUTYPE2_SET_ERROR_INFO_PDU = 0x2F
-PDUTYPE2_DRAWNINEGRID_ERROR_PDU = 0x30
-PDUTYPE2_DRAWGDIPLUS_ERROR_PDU = 0x31
-PDUTYPE2_ARC_STATUS_PDU = 0x32
-PDUTYPE2_STATUS_INFO_PDU = 0x36
-PDUTYPE2_MONITOR_LAYOUT_PDU = 0x37
+PDUTYPE2_UPDATE: Final[int] = 0x02
+PDUTYPE2_CONTROL: Final[int] = 0x14
+PDUTYPE2_POINTER: Final[int] = 0x1B
+PDUTYPE2_INPUT: Final[int] = 0x1C
+PDUTYPE2_SYNCHRONIZE: Final[int] = 0x1F
+PDUTYPE2_REFRESH_RECT: Final[int] = 0x21
+PDUTYPE2_PLAY_SOUND: Final[int] = 0x22
+PDUTYPE2_SUPPRESS_OUTPUT: Final[int] = 0x23
+PDUTYPE2_SHUTDOWN_REQUEST: Final[int] = 0x24
+PDUTYPE2_SHUTDOWN_DENIED: Final[int] = 0x25
+PDUTYPE2_SAVE_SESSION_INFO: Final[int] = 0x26
+PDUTYPE2_FONTLIST: Final[int] = 0x27
+PDUTYPE2_FONTMAP: Final[int] = 0x28
+PDUTYPE2_SET_KEYBOARD_INDICATORS: Final[int] = 0x29
+PDUTYPE2_BITMAPCACHE_PERSISTENT_LIST: Final[int] = 0x2B
+PDUTYPE2_BITMAPCACHE_ERROR_PDU: Final[int] = 0x2C
+PDUTYPE2_SET_KEYBOARD_IME_STATUS: Final[int] = 0x2D
+PDUTYPE2_OFFSCRCACHE_ERROR_PDU: Final[int] = 0x2E
+PDUTYPE2_SET_ERROR_INFO_PDU: Final[int] = 0x2F
+PDUTYPE2_DRAWNINEGRID_ERROR_PDU: Final[int] = 0x30
+PDUTYPE2_DRAWGDIPLUS_ERROR_PDU: Final[int] = 0x31
+PDUTYPE2_ARC_STATUS_PDU: Final[int] = 0x32
+PDUTYPE2_STATUS_INFO_PDU: Final[int] = 0x36
+PDUTYPE2_MONITOR_LAYOUT_PDU: Final[int] = 0x37
 
 # Control actions
-CTRLACTION_REQUEST_CONTROL = 0x0001
-CTRLACTION_GRANTED_CONTROL = 0x0002
-CTRLACTION_DETACH = 0x0003
-CTRLACTION_COOPERATE = 0x0004
+CTRLACTION_REQUEST_CONTROL: Final[int] = 0x0001
+CTRLACTION_GRANTED_CONTROL: Final[int] = 0x0002
+CTRLACTION_DETACH: Final[int] = 0x0003
+CTRLACTION_COOPERATE: Final[int] = 0x0004
 
 # Input event types
-INPUT_EVENT_SYNC = 0x0000
-INPUT_EVENT_UNUSED = 0x0002
-INPUT_EVENT_SCANCODE = 0x0004
-INPUT_EVENT_UNICODE = 0x0005
-INPUT_EVENT_MOUSE = 0x8001
-INPUT_EVENT_MOUSEX = 0x8002
+INPUT_EVENT_SYNC: Final[int] = 0x0000
+INPUT_EVENT_UNUSED: Final[int] = 0x0002
+INPUT_EVENT_SCANCODE: Final[int] = 0x0004
+INPUT_EVENT_UNICODE: Final[int] = 0x0005
+INPUT_EVENT_MOUSE: Final[int] = 0x8001
+INPUT_EVENT_MOUSEX: Final[int] = 0x8002
 
 # Mouse event flags
-PTRFLAGS_HWHEEL = 0x0400
-PTRFLAGS_WHEEL = 0x0200
-PTRFLAGS_WHEEL_NEGATIVE = 0x0100
-PTRFLAGS_MOVE = 0x0800
-PTRFLAGS_DOWN = 0x8000
-PTRFLAGS_BUTTON1 = 0x1000  # Left button
-PTRFLAGS_BUTTON2 = 0x2000  # Right button
-PTRFLAGS_BUTTON3 = 0x4000  # Middle button
+PTRFLAGS_HWHEEL: Final[int] = 0x0400
+PTRFLAGS_WHEEL: Final[int] = 0x0200
+PTRFLAGS_WHEEL_NEGATIVE: Final[int] = 0x0100
+PTRFLAGS_MOVE: Final[int] = 0x0800
+PTRFLAGS_DOWN: Final[int] = 0x8000
+PTRFLAGS_BUTTON1: Final[int] = 0x1000  # Left button
+PTRFLAGS_BUTTON2: Final[int] = 0x2000  # Right button
+PTRFLAGS_BUTTON3: Final[int] = 0x4000  # Middle button
 
 # Keyboard event flags
-KBDFLAGS_EXTENDED = 0x0100
-KBDFLAGS_EXTENDED1 = 0x0200
-KBDFLAGS_DOWN = 0x4000
-KBDFLAGS_RELEASE = 0x8000
+KBDFLAGS_EXTENDED: Final[int] = 0x0100
+KBDFLAGS_EXTENDED1: Final[int] = 0x0200
+KBDFLAGS_DOWN: Final[int] = 0x4000
+KBDFLAGS_RELEASE: Final[int] = 0x8000
 
 # Update types
-UPDATETYPE_ORDERS = 0x0000
-UPDATETYPE_BITMAP = 0x0001
-UPDATETYPE_PALETTE = 0x0002
-UPDATETYPE_SYNCHRONIZE = 0x0003
+UPDATETYPE_ORDERS: Final[int] = 0x0000
+UPDATETYPE_BITMAP: Final[int] = 0x0001
+UPDATETYPE_PALETTE: Final[int] = 0x0002
+UPDATETYPE_SYNCHRONIZE: Final[int] = 0x0003
 
 # Info packet flags
-INFO_MOUSE = 0x00000001
-INFO_DISABLECTRLALTDEL = 0x00000002
-INFO_AUTOLOGON = 0x00000008
-INFO_UNICODE = 0x00000010
-INFO_MAXIMIZESHELL = 0x00000020
-INFO_LOGONNOTIFY = 0x00000040
-INFO_COMPRESSION = 0x00000080
-INFO_ENABLEWINDOWSKEY = 0x00000100
-INFO_REMOTECONSOLEAUDIO = 0x00002000
-INFO_FORCE_ENCRYPTED_CS_PDU = 0x00004000
-INFO_RAIL = 0x00008000
-INFO_LOGONERRORS = 0x00010000
-INFO_MOUSE_HAS_WHEEL = 0x00020000
-INFO_PASSWORD_IS_SC_PIN = 0x00040000
-INFO_NOAUDIOPLAYBACK = 0x00080000
-INFO_USING_SAVED_CREDS = 0x00100000
-INFO_AUDIOCAPTURE = 0x00200000
-INFO_VIDEO_DISABLE = 0x00400000
-INFO_HIDEF_RAIL_SUPPORTED = 0x02000000
+INFO_MOUSE: Final[int] = 0x00000001
+INFO_DISABLECTRLALTDEL: Final[int] = 0x00000002
+INFO_AUTOLOGON: Final[int] = 0x00000008
+INFO_UNICODE: Final[int] = 0x00000010
+INFO_MAXIMIZESHELL: Final[int] = 0x00000020
+INFO_LOGONNOTIFY: Final[int] = 0x00000040
+INFO_COMPRESSION: Final[int] = 0x00000080
+INFO_ENABLEWINDOWSKEY: Final[int] = 0x00000100
+INFO_REMOTECONSOLEAUDIO: Final[int] = 0x00002000
+INFO_FORCE_ENCRYPTED_CS_PDU: Final[int] = 0x00004000
+INFO_RAIL: Final[int] = 0x00008000
+INFO_LOGONERRORS: Final[int] = 0x00010000
+INFO_MOUSE_HAS_WHEEL: Final[int] = 0x00020000
+INFO_PASSWORD_IS_SC_PIN: Final[int] = 0x00040000
+INFO_NOAUDIOPLAYBACK: Final[int] = 0x00080000
+INFO_USING_SAVED_CREDS: Final[int] = 0x00100000
+INFO_AUDIOCAPTURE: Final[int] = 0x00200000
+INFO_VIDEO_DISABLE: Final[int] = 0x00400000
+INFO_HIDEF_RAIL_SUPPORTED: Final[int] = 0x02000000
 
 # Performance flags
-PERF_DISABLE_WALLPAPER = 0x00000001
-PERF_DISABLE_FULLWINDOWDRAG = 0x00000002
-PERF_DISABLE_MENUANIMATIONS = 0x00000004
-PERF_DISABLE_THEMING = 0x00000008
-PERF_DISABLE_CURSOR_SHADOW = 0x00000020
-PERF_DISABLE_CURSORSETTINGS = 0x00000040
-PERF_ENABLE_FONT_SMOOTHING = 0x00000080
-PERF_ENABLE_DESKTOP_COMPOSITION = 0x00000100
+PERF_DISABLE_WALLPAPER: Final[int] = 0x00000001
+PERF_DISABLE_FULLWINDOWDRAG: Final[int] = 0x00000002
+PERF_DISABLE_MENUANIMATIONS: Final[int] = 0x00000004
+PERF_DISABLE_THEMING: Final[int] = 0x00000008
+PERF_DISABLE_CURSOR_SHADOW: Final[int] = 0x00000020
+PERF_DISABLE_CURSORSETTINGS: Final[int] = 0x00000040
+PERF_ENABLE_FONT_SMOOTHING: Final[int] = 0x00000080
+PERF_ENABLE_DESKTOP_COMPOSITION: Final[int] = 0x00000100
+
+
+# Flags sent when the caller does not override them
+_DEFAULT_INFO_FLAGS = INFO_MOUSE | INFO_UNICODE | INFO_LOGONNOTIFY | INFO_DISABLECTRLALTDEL
+
+# codePage(4) + flags(4) + cbDomain, cbUserName, cbPassword,
+# cbAlternateShell, cbWorkingDir (2 bytes each)
+_CLIENT_INFO_HEADER = struct.Struct("<II5H")
+_EMPTY_UTF16 = b""
+_UTF16_TERMINATOR = b"\x00\x00"
+
+# Fixed start of TS_EXTENDED_INFO_PACKET: address family AF_INET (2 bytes),
+# empty client address and client directory (length-prefixed null
+# terminators) and an all-zero time zone (172 bytes) and session ID (4 bytes)
+_EXTENDED_INFO_PREFIX = struct.pack("<HH2sH2s172sI", 0x0002, 2, b"\x00\x00", 2, b"\x00\x00", b"", 0)
 
 
 def build_client_info_pdu(
@@ -135,7 +155,7 @@ def build_client_info_pdu(
     password: str = "",
     shell: str = "",
     work_dir: str = "",
-    flags: int = INFO_MOUSE | INFO_UNICODE | INFO_LOGONNOTIFY | INFO_DISABLECTRLALTDEL,
+    flags: int = _DEFAULT_INFO_FLAGS,
     performance_flags: int = PERF_DISABLE_WALLPAPER,
 ) -> bytes:
     """Build Client Info PDU (TS_INFO_PACKET).
@@ -143,54 +163,35 @@ def build_client_info_pdu(
     This is sent after the channel join sequence to provide user credentials
     and session configuration.
     """
-    data = bytearray()
-
-    # Code page (4 bytes) - not used with INFO_UNICODE
-    data += struct.pack("<I", 0)
-
-    # Flags (4 bytes)
-    data += struct.pack("<I", flags)
-
-    # Encode strings as UTF-16LE (without null terminator for length fields)
-    domain_bytes = domain.encode("utf-16-le")
-    username_bytes = username.encode("utf-16-le")
-    password_bytes = password.encode("utf-16-le")
-    shell_bytes = shell.encode("utf-16-le")
-    work_dir_bytes = work_dir.encode("utf-16-le")
-
-    # String lengths (in bytes, excluding null terminator)
-    data += struct.pack("<H", len(domain_bytes))
-    data += struct.pack("<H", len(username_bytes))
-    data += struct.pack("<H", len(password_bytes))
-    data += struct.pack("<H", len(shell_bytes))
-    data += struct.pack("<H", len(work_dir_bytes))
+    # Encode strings as UTF-16LE (without null terminator for length fields);
+    # empty strings, the common case, skip the encoder
+    domain_bytes = domain.encode("utf-16-le") if domain else _EMPTY_UTF16
+    username_bytes = username.encode("utf-16-le") if username else _EMPTY_UTF16
+    password_bytes = password.encode("utf-16-le") if password else _EMPTY_UTF16
+    shell_bytes = shell.encode("utf-16-le") if shell else _EMPTY_UTF16
+    work_dir_bytes = work_dir.encode("utf-16-le") if work_dir else _EMPTY_UTF16
+
+    # Code page (not used with INFO_UNICODE), flags and string lengths (in
+    # bytes, excluding null terminator)
+    data = bytearray(
+        _CLIENT_INFO_HEADER.pack(
+            0,
+            flags,
+            len(domain_bytes),
+            len(username_bytes),
+            len(password_bytes),
+            len(shell_bytes),
+            len(work_dir_bytes),
+        )
+    )
 
     # Strings with null terminators
-    data += domain_bytes + b"\x00\x00"
-    data += username_bytes + b"\x00\x00"
-    data += password_bytes + b"\x00\x00"
-    data += shell_bytes + b"\x00\x00"
-    data += work_dir_bytes + b"\x00\x00"
-
-    # Extended Info (TS_EXTENDED_INFO_PACKET)
-    # Client address family (2 bytes) - AF_INET = 0x0002
-    data += struct.pack("<H", 0x0002)
-
-    # Client address length (2 bytes)
-    client_address = b"\x00\x00"  # Empty address
-    data += struct.pack("<H", len(client_address))
-    data += client_address
-
-    # Client directory length (2 bytes)
-    client_dir = b"\x00\x00"
-    data += struct.pack("<H", len(client_dir))
-    data += client_dir
+    for string_bytes in (domain_bytes, username_bytes, password_bytes, shell_bytes, work_dir_bytes):
+        data += string_bytes
+        data += _UTF16_TERMINATOR
 
-    # Time zone info (172 bytes) - simplified, all zeros
-    data += bytes(172)
-
-    # Client session ID (4 bytes)
-    data += struct.pack("<I", 0)
+    # Extended Info (TS_EXTENDED_INFO_PACKET) up to the performance flags
+    data += _EXTENDED_INFO_PREFIX
 
     # Performance flags (4 bytes)
     data += struct.pack("<I", performance_flags)
@@ -201,42 +202,36 @@ def build_client_info_pdu(
     return bytes(data)
 
 
+# flags(4) + length(4)
+_SECURITY_EXCHANGE_HEADER = struct.Struct("<II")
+_SECURITY_EXCHANGE_PADDING = b"\x00" * 8
+
+
 def build_security_exchange_pdu(encrypted_client_random: bytes) -> bytes:
     """Build Security Exchange PDU.
 
     This is only used with Standard RDP Security (not TLS/NLA).
     """
-    data = bytearray()
+    # Security header flags, length of encrypted client random + padding
+    header = _SECURITY_EXCHANGE_HEADER.pack(SEC_EXCHANGE_PKT, len(encrypted_client_random) + 8)
 
-    # Security header flags (4 bytes)
-    data += struct.pack("<I", SEC_EXCHANGE_PKT)
+    # Encrypted client random, then 8 bytes of padding
+    return header + encrypted_client_random + _SECURITY_EXCHANGE_PADDING
 
-    # Length of encrypted client random (4 bytes)
-    data += struct.pack("<I", len(encrypted_client_random) + 8)
 
-    # Encrypted client random
-    data += encrypted_client_random
-
-    # Padding (8 bytes)
-    data += bytes(8)
-
-    return bytes(data)
+# totalLength(2) + pduType(2) + pduSource(2)
+_SHARE_CONTROL_HEADER = struct.Struct("<HHH")
 
 
 def build_share_control_header(pdu_type: int, pdu_source: int, share_id: int = 0) -> bytes:
     """Build Share Control Header."""
-    data = bytearray()
+    # Total length placeholder - will be filled by caller; PDU type is version 1
+    return _SHARE_CONTROL_HEADER.pack(0, pdu_type | 0x0010, pdu_source)
 
-    # Total length placeholder (2 bytes) - will be filled by caller
-    data += struct.pack("<H", 0)
-
-    # PDU type (2 bytes)
-    data += struct.pack("<H", pdu_type | 0x0010)  # Version 1
 
-    # PDU source (2 bytes)
-    data += struct.pack("<H", pdu_source)
-
-    return bytes(data)
+# shareId(4) + pad1(1) + streamId(1) + uncompressedLength(2) + pduType2(1)
+# + compressedType(1) + compressedLength(2)
+_SHARE_DATA_HEADER = struct.Struct("<IBBHBBH")
 
 
 def build_share_data_header(
@@ -245,80 +240,62 @@ def build_share_data_header(
     pdu_type2: int,
     compressed_type: int = 0,
     compressed_length: int = 0,
+    uncompressed_length: int = 0,
 ) -> bytes:
     """Build Share Data Header."""
-    data = bytearray()
-
-    # Share ID (4 bytes)
-    data += struct.pack("<I", share_id)
-
-    # Padding (1 byte)
-    data += bytes([0])
-
-    # Stream ID (1 byte) - STREAM_MED = 0x01
-    data += bytes([0x01])
-
-    # Uncompressed length placeholder (2 bytes)
-    data += struct.pack("<H", 0)
+    # Padding, stream ID (STREAM_MED = 0x01) and uncompressed length
+    return _SHARE_DATA_HEADER.pack(
+        share_id, 0, 0x01, uncompressed_length, pdu_type2, compressed_type, compressed_length
+    )
 
-    # PDU type 2 (1 byte)
-    data += bytes([pdu_type2])
 
-    # Compressed type (1 byte)
-    data += bytes([compressed_type])
-
-    # Compressed length (2 bytes)
-    data += struct.pack("<H", compressed_length)
-
-    return bytes(data)
+# messageType(2) + targetUser(2)
+_SYNCHRONIZE_PDU = struct.Struct("<HH")
 
 
+@functools.lru_cache(maxsize=64)
 def build_synchronize_pdu(target_user: int) -> bytes:
-    """Build Synchronize PDU."""
-    data = bytearray()
+    """Build Synchronize PDU; cached since the target user is fixed per session."""
+    # Message type - SYNCMSGTYPE_SYNC = 0x0001, then target user
+    return _SYNCHRONIZE_PDU.pack(0x0001, target_user)
 
-    # Message type (2 bytes) - SYNCMSGTYPE_SYNC = 0x0001
-    data += struct.pack("<H", 0x0001)
 
-    # Target user (2 bytes)
-    data += struct.pack("<H", target_user)
+# action(2) + grantId(2) + controlId(4)
+_CONTROL_PDU = struct.Struct("<HHI")
 
-    return bytes(data)
+# Control PDUs as sent during connection finalization (no grant/control ID),
+# packed once per action
+_CONTROL_PDUS = {
+    action: _CONTROL_PDU.pack(action, 0, 0)
+    for action in (CTRLACTION_REQUEST_CONTROL, CTRLACTION_GRANTED_CONTROL, CTRLACTION_DETACH, CTRLACTION_COOPERATE)
+}
 
 
 def build_control_pdu(action: int, grant_id: int = 0, control_id: int = 0) -> bytes:
     """Build Control PDU."""
-    data = bytearray()
+    if not grant_id and not control_id:
+        pdu = _CONTROL_PDUS.get(action)
+        if pdu is not None:
+            return pdu
 
-    # Action (2 bytes)
-    data += struct.pack("<H", action)
+    # Action, grant ID, control ID
+    return _CONTROL_PDU.pack(action, grant_id, control_id)
 
-    # Grant ID (2 bytes)
-    data += struct.pack("<H", grant_id)
 
-    # Control ID (4 bytes)
-    data += struct.pack("<I", control_id)
-
-    return bytes(data)
+# numberFonts(2) + totalNumFonts(2) + listFlags(2) - FONTLIST_FIRST |
+# FONTLIST_LAST = 0x0003 + entrySize(2); the client never sends any fonts
+_FONT_LIST_PDU = struct.pack("<HHHH", 0, 0, 0x0003, 0x0032)
 
 
 def build_font_list_pdu() -> bytes:
     """Build Font List PDU."""
-    data = bytearray()
-
-    # Number of fonts (2 bytes)
-    data += struct.pack("<H", 0)
-
-    # Total number of fonts (2 bytes)
-    data += struct.pack("<H", 0)
-
-    # List flags (2 bytes) - FONTLIST_FIRST | FONTLIST_LAST = 0x0003
-    data += struct.pack("<H", 0x0003)
+    return _FONT_LIST_PDU
 
-    # Entry size (2 bytes)
-    data += struct.pack("<H", 0x0032)
 
-    return bytes(data)
+# numEvents(2) + pad2Octets(2)
+_INPUT_EVENT_PDU_HEADER = struct.Struct("<HH")
+# eventTime(4) + messageType(2)
+_INPUT_EVENT_HEADER = struct.Struct("<IH")
 
 
 def build_input_event_pdu(events: list[tuple[int, int, bytes]]) -> bytes:
@@ -328,24 +305,53 @@ def build_input_event_pdu(events: list[tuple[int, int, bytes]]) -> bytes:
         events: List of (event_time, event_type, event_data) tuples
 
     """
-    data = bytearray()
+    pack_event_header = _INPUT_EVENT_HEADER.pack
 
-    # Number of events (2 bytes)
-    data += struct.pack("<H", len(events))
+    # Number of events (2 bytes) + padding (2 bytes)
+    parts = [_INPUT_EVENT_PDU_HEADER.pack(len(events), 0)]
 
-    # Padding (2 bytes)
-    data += struct.pack("<H", 0)
-
-    # Events
+    # Events: event time (4 bytes) + event type (2 bytes), then the event data
     for event_time, event_type, event_data in events:
-        # Event time (4 bytes)
-        data += struct.pack("<I", event_time)
-        # Event type (2 bytes)
-        data += struct.pack("<H", event_type)
-        # Event data
-        data += event_data
+        parts.append(pack_event_header(event_time, event_type))
+        parts.append(event_data)
+
+    return b"".join(parts)
+
+
+def build_mouse_move_input_event_pdu(points: Sequence[tuple[int, int]], event_time: int) -> bytes:
+    """Build a slow-path Input Event PDU of plain mouse moves.
+
+    Equivalent to build_input_event_pdu over build_mouse_event(x, y) for
+    each point, all stamped with the same event time. Every field of a
+    mouse move event is a 16-bit word (the time as two), so the events are
+    laid out as one uint16 array: a repeated template with the x and y
+    columns filled in by slice assignment rather than packed per event.
+
+    Args:
+        points: (x, y) positions, in order.
+        event_time: Event time in milliseconds, shared by all events.
+
+    Returns:
+        The Input Event PDU data (without Share Data Header).
+
+    """
+    num_events = len(points)
+    # eventTime (low, high word) + messageType + pointerFlags + xPos + yPos
+    words = array(
+        "H",
+        (event_time & 0xFFFF, (event_time >> 16) & 0xFFFF, INPUT_EVENT_MOUSE, PTRFLAGS_MOVE, 0, 0),
+    )
+    words *= num_events
+    words[4::6] = array("H", [x & 0xFFFF for x, _ in points])
+    words[5::6] = array("H", [y & 0xFFFF for _, y in points])
+    if sys.byteorder == "big":
+        words.byteswap()
+
+    return _INPUT_EVENT_PDU_HEADER.pack(num_events, 0) + words.tobytes()
 
-    return bytes(data)
+
+# keyboardFlags(2) + keyCode/unicodeCode(2) + pad2Octets(2)
+_KEYBOARD_EVENT = struct.Struct("<HHH")
 
 
 def build_scancode_event(
@@ -360,15 +366,8 @@ def build_scancode_event(
     if is_extended:
         flags |= KBDFLAGS_EXTENDED
 
-    data = bytearray()
-    # Key flags (2 bytes)
-    data += struct.pack("<H", flags)
-    # Key code (2 bytes)
-    data += struct.pack("<H", scan_code)
-    # Padding (2 bytes)
-    data += struct.pack("<H", 0)
-
-    return bytes(data)
+    # Key flags, key code, padding
+    return _KEYBOARD_EVENT.pack(flags, scan_code, 0)
 
 
 def build_unicode_event(unicode_code: int, is_release: bool = False) -> bytes:
@@ -377,15 +376,12 @@ def build_unicode_event(unicode_code: int, is_release: bool = False) -> bytes:
     if is_release:
         flags |= KBDFLAGS_RELEASE
 
-    data = bytearray()
-    # Key flags (2 bytes)
-    data += struct.pack("<H", flags)
-    # Unicode code (2 bytes)
-    data += struct.pack("<H", unicode_code)
-    # Padding (2 bytes)
-    data += struct.pack("<H", 0)
+    # Key flags, unicode code, padding
+    return _KEYBOARD_EVENT.pack(flags, unicode_code, 0)
 
-    return bytes(data)
+
+# pointerFlags(2) + xPos(2) + yPos(2)
+_MOUSE_EVENT = struct.Struct("<HHH")
 
 
 def build_mouse_event(
@@ -421,24 +417,21 @@ def build_mouse_event(
         # Wheel delta is in the lower 9 bits (0-511), typically 120 per notch
         flags |= wheel_delta & 0x01FF
 
-    data = bytearray()
-    # Pointer flags (2 bytes)
-    data += struct.pack("<H", flags)
-    # X position (2 bytes)
-    data += struct.pack("<H", x & 0xFFFF)
-    # Y position (2 bytes)
-    data += struct.pack("<H", y & 0xFFFF)
-
-    return bytes(data)
+    # Pointer flags, X position, Y position
+    return _MOUSE_EVENT.pack(flags, x & 0xFFFF, y & 0xFFFF)
 
 
 # Fast-path input event codes
-FASTPATH_INPUT_EVENT_SCANCODE = 0
-FASTPATH_INPUT_EVENT_MOUSE = 1
-FASTPATH_INPUT_EVENT_MOUSEX = 2
-FASTPATH_INPUT_EVENT_SYNC = 3
-FASTPATH_INPUT_EVENT_UNICODE = 4
-FASTPATH_INPUT_EVENT_MOUSEREL = 5
+FASTPATH_INPUT_EVENT_SCANCODE: Final[int] = 0
+FASTPATH_INPUT_EVENT_MOUSE: Final[int] = 1
+FASTPATH_INPUT_EVENT_MOUSEX: Final[int] = 2
+FASTPATH_INPUT_EVENT_SYNC: Final[int] = 3
+FASTPATH_INPUT_EVENT_UNICODE: Final[int] = 4
+FASTPATH_INPUT_EVENT_MOUSEREL: Final[int] = 5
+
+
+# eventHeader(1) + pointerFlags(2) + xPos(2) + yPos(2)
+_FAST_PATH_MOUSE_EVENT = struct.Struct("<BHHH")
 
 
 def build_fast_path_mouse_event(
@@ -483,13 +476,7 @@ def build_fast_path_mouse_event(
     # Format: eventCode << 5 | eventFlags
     event_header = (FASTPATH_INPUT_EVENT_MOUSE << 5) | 0
 
-    data = bytearray()
-    data += bytes([event_header])
-    data += struct.pack("<H", flags)
-    data += struct.pack("<H", x & 0xFFFF)
-    data += struct.pack("<H", y & 0xFFFF)
-
-    return bytes(data)
+    return _FAST_PATH_MOUSE_EVENT.pack(event_header, flags, x & 0xFFFF, y & 0xFFFF)
 
 
 def build_fast_path_input_pdu(events: list[bytes]) -> bytes:
@@ -545,37 +532,67 @@ def build_fast_path_input_pdu(events: list[bytes]) -> bytes:
     return header_data + length_data + content
 
 
-def build_confirm_active_pdu(
-    share_id: int,
-    originator_id: int,
-    source_descriptor: bytes,
-    capabilities: bytes,
-) -> bytes:
-    """Build Confirm Active PDU."""
-    data = bytearray()
+def build_fast_path_mouse_move_pdu(points: Sequence[tuple[int, int]]) -> bytes:
+    """Build a fast-path input PDU of plain mouse moves.
 
-    # Share ID (4 bytes)
-    data += struct.pack("<I", share_id)
+    Equivalent to build_fast_path_input_pdu over build_fast_path_mouse_event
+    for each point, but packs every event straight into one preallocated
+    buffer instead of building and joining per-event bytes.
 
-    # Originator ID (2 bytes)
-    data += struct.pack("<H", originator_id)
+    Args:
+        points: Up to 255 (x, y) positions.
 
-    # Source descriptor length (2 bytes)
-    data += struct.pack("<H", len(source_descriptor))
+    Returns:
+        Complete fast-path input PDU ready to send.
+    """
+    num_events = len(points)
+    if num_events == 0:
+        return b""
+    if num_events > 255:
+        raise ValueError(f"A fast-path input PDU holds at most 255 events, got {num_events}")
+
+    # numEvents goes in the header when it fits in 4 bits, else in its own byte
+    extra = 0 if num_events <= 15 else 1
+    content_len = extra + num_events * _FAST_PATH_MOUSE_EVENT.size
+    length_size = 1 if 2 + content_len <= 127 else 2
+    total_len = 1 + length_size + content_len
+
+    pdu = bytearray(total_len)
+    pdu[0] = num_events << 2 if num_events <= 15 else 0
+    if length_size == 1:
+        pdu[1] = total_len
+    else:
+        pdu[1] = 0x80 | ((total_len >> 8) & 0x7F)
+        pdu[2] = total_len & 0xFF
+    offset = 1 + length_size
+    if extra:
+        pdu[offset] = num_events
+        offset += 1
 
-    # Combined capabilities length (2 bytes)
-    data += struct.pack("<H", len(capabilities))
+    event_header = FASTPATH_INPUT_EVENT_MOUSE << 5
+    for x, y in points:
+        _FAST_PATH_MOUSE_EVENT.pack_into(pdu, offset, event_header, PTRFLAGS_MOVE, x & 0xFFFF, y & 0xFFFF)
+        offset += _FAST_PATH_MOUSE_EVENT.size
 
-    # Source descriptor
-    data += source_descriptor
+    return bytes(pdu)
 
-    # Number of capability sets (2 bytes) - encoded in capabilities
-    # Padding (2 bytes)
-    # Capability sets
 
-    data += capabilities
+# shareId(4) + originatorId(2) + lengthSourceDescriptor(2) + lengthCombinedCapabilities(2)
+_CONFIRM_ACTIVE_HEADER = struct.Struct("<IHHH")
 
-    return bytes(data)
+
+def build_confirm_active_pdu(
+    share_id: int,
+    originator_id: int,
+    source_descriptor: bytes,
+    capabilities: bytes,
+) -> bytes:
+    """Build Confirm Active PDU."""
+    # Share ID, originator ID, source descriptor length, combined
+    # capabilities length, then the source descriptor. The number of
+    # capability sets and padding are encoded in capabilities.
+    header = _CONFIRM_ACTIVE_HEADER.pack(share_id, originator_id, len(source_descriptor), len(capabilities))
+    return b"".join((header, source_descriptor, capabilities))
 
 
 def parse_demand_active_pdu(data: bytes) -> dict[str, Any]:
@@ -629,6 +646,9 @@ def parse_demand_active_pdu(data: bytes) -> dict[str, Any]:
     return result
 
 
+_UPDATE_TYPE = struct.Struct("<H")
+
+
 def parse_update_pdu(data: bytes) -> dict[str, Any]:
     """Parse Update PDU from server."""
     result: dict[str, Any] = {"update_type": 0, "data": b""}
@@ -636,12 +656,17 @@ def parse_update_pdu(data: bytes) -> dict[str, Any]:
     if len(data) < 2:
         return result
 
-    result["update_type"] = struct.unpack_from("<H", data, 0)[0]
+    result["update_type"] = _UPDATE_TYPE.unpack_from(data, 0)[0]
     result["data"] = data[2:]
 
     return result
 
 
+# TS_BITMAP_DATA header: destLeft, destTop, destRight, destBottom, width,
+# height, bitsPerPixel, flags, bitmapLength
+_BITMAP_DATA_HEADER = struct.Struct("<9H")
+
+
 def parse_bitmap_update(data: bytes) -> list[dict[str, Any]]:
     """Parse Bitmap Update data."""
     bitmaps: list[dict[str, Any]] = []
@@ -653,25 +678,29 @@ def parse_bitmap_update(data: bytes) -> list[dict[str, Any]]:
     num_rects = struct.unpack_from("<H", data, offset)[0]
     offset += 2
 
+    unpack_header = _BITMAP_DATA_HEADER.unpack_from
+    header_size = _BITMAP_DATA_HEADER.size
+
     logger.debug(f"Parsing bitmap update: {len(data)} bytes, {num_rects} rectangles")
 
     for i in range(num_rects):
-        if offset + 18 > len(data):
+        if offset + header_size > len(data):
             logger.debug(f"Stopping at rect {i}: not enough data for header (offset={offset}, data_len={len(data)})")
             break
 
-        bitmap = {
-            "dest_left": struct.unpack_from("<H", data, offset)[0],
-            "dest_top": struct.unpack_from("<H", data, offset + 2)[0],
-            "dest_right": struct.unpack_from("<H", data, offset + 4)[0],
-            "dest_bottom": struct.unpack_from("<H", data, offset + 6)[0],
-            "width": struct.unpack_from("<H", data, offset + 8)[0],
-            "height": struct.unpack_from("<H", data, offset + 10)[0],
-            "bpp": struct.unpack_from("<H", data, offset + 12)[0],
-            "flags": struct.unpack_from("<H", data, offset + 14)[0],
-            "length": struct.unpack_from("<H", data, offset + 16)[0],
+        dest_left, dest_top, dest_right, dest_bottom, width, height, bpp, flags, length = unpack_header(data, offset)
+        bitmap: dict[str, Any] = {
+            "dest_left": dest_left,
+            "dest_top": dest_top,
+            "dest_right": dest_right,
+            "dest_bottom": dest_bottom,
+            "width": width,
+            "height": height,
+            "bpp": bpp,
+            "flags": flags,
+            "length": length,
         }
-        offset += 18
+        offset += header_size
 
         # Validate bitmap data
         if bitmap["bpp"] not in (8, 15, 16, 24, 32):
@@ -699,6 +728,10 @@ def parse_bitmap_update(data: bytes) -> list[dict[str, Any]]:
     return bitmaps
 
 
+# TS_RECTANGLE16: left, top, right, bottom
+_RECTANGLE16 = struct.Struct("<HHHH")
+
+
 def build_refresh_rect_pdu(rectangles: list[tuple[int, int, int, int]]) -> bytes:
     """Build Refresh Rect PDU to request screen redraw.
 
@@ -713,22 +746,11 @@ def build_refresh_rect_pdu(rectangles: list[tuple[int, int, int, int]]) -> bytes
         The Refresh Rect PDU data (without Share Data Header).
 
     """
-    data = bytearray()
-
-    # numberOfAreas (1 byte)
-    data += bytes([len(rectangles)])
+    pack_rectangle = _RECTANGLE16.pack
 
-    # pad3Octets (3 bytes)
-    data += bytes(3)
-
-    # areasToRefresh - array of TS_RECTANGLE16
-    for left, top, right, bottom in rectangles:
-        data += struct.pack("<H", left)
-        data += struct.pack("<H", top)
-        data += struct.pack("<H", right)
-        data += struct.pack("<H", bottom)
-
-    return bytes(data)
+    # numberOfAreas (1 byte) + pad3Octets (3 bytes), then areasToRefresh -
+    # array of TS_RECTANGLE16
+    return bytes((len(rectangles), 0, 0, 0)) + b"".join([pack_rectangle(*rectangle) for rectangle in rectangles])
 
 
 def build_suppress_output_pdu(allow_display_updates: bool, rectangle: tuple[int, int, int, int] | None = None) -> bytes:
@@ -758,10 +780,6 @@ def build_suppress_output_pdu(allow_display_updates: bool, rectangle: tuple[int,
 
     # desktopRect (TS_RECTANGLE16) - only if allowDisplayUpdates is TRUE
     if allow_display_updates and rectangle:
-        left, top, right, bottom = rectangle
-        data += struct.pack("<H", left)
-        data += struct.pack("<H", top)
-        data += struct.pack("<H", right)
-        data += struct.pack("<H", bottom)
+        data += _RECTANGLE16.pack(*rectangle)
 
     return bytes(data)
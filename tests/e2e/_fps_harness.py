@@ -0,0 +1,370 @@
+"""Shared FPS limit harness for the e2e FPS tests.
+
+Injects a connected client's current screen into a Display at a target
+rate and reports throughput, consumer lag and memory usage per run.
+"""
+
+import asyncio
+import contextlib
+import csv
+import gc
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import astuple
+from dataclasses import dataclass
+from dataclasses import fields
+from typing import Literal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from simple_rdp import Display  # noqa: E402
+from simple_rdp import RDPClient  # noqa: E402
+
+# Frames injected per scheduler wakeup in the pacing loop
+BATCH = 4
+
+# Periodic report lines are buffered and written off the event loop in batches
+REPORT_FLUSH_EVERY = 10
+_report_buf: deque[str] = deque()
+
+
+async def flush_reports() -> None:
+    """Write buffered report lines to stdout from a worker thread."""
+    if not _report_buf:
+        return
+    lines = tuple(_report_buf)
+    _report_buf.clear()
+    await asyncio.to_thread(sys.stdout.writelines, lines)
+
+
+@dataclass(slots=True, frozen=True)
+class FPSTestResult:
+    """Result from testing a specific FPS target."""
+
+    target_fps: int
+    duration_seconds: float
+    frames_captured: int
+    frames_encoded: int
+    actual_capture_fps: float
+    actual_encode_fps: float
+    memory_start_mb: float
+    memory_end_mb: float
+    memory_peak_mb: float
+    avg_lag_chunks: float
+    success: bool
+    error: str = ""
+
+
+# Without procfs (e.g. macOS) only the peak RSS is available, which never
+# falls and so can't be used to tell when memory is growing
+_HAS_PROCFS = os.path.exists("/proc/self/statm")
+
+# ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+_MAXRSS_PER_MB = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+
+def _rss_mb() -> float:
+    """Return the resident set size of this process in MB.
+
+    Falls back to the peak resident set size when procfs isn't available.
+    """
+    if _HAS_PROCFS:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / _MAXRSS_PER_MB
+
+
+class AdaptiveMemoryProbe:
+    """Watch RSS and only turn on tracemalloc once memory starts growing.
+
+    tracemalloc slows every allocation while active, so steady-state runs go
+    without it. When RSS grows faster than ``threshold_mb_per_sec`` between two
+    samples, tracing is started for the rest of the test so the offending
+    allocation sites show up in report().
+
+    Growth detection is off when _rss_mb() can only report the peak RSS.
+    """
+
+    def __init__(self, threshold_mb_per_sec: float = 10.0) -> None:
+        self.threshold_mb_per_sec = threshold_mb_per_sec
+        self.start_mb = self.peak_mb = self._last_mb = _rss_mb()
+        self._last_sample_ns = time.perf_counter_ns()
+        self._started_tracing = False
+
+    def sample(self) -> float:
+        """Sample RSS in MB, starting tracemalloc if it grew too fast."""
+        rss_mb = _rss_mb()
+        now_ns = time.perf_counter_ns()
+        elapsed = (now_ns - self._last_sample_ns) / 1e9
+        if elapsed > 0 and _HAS_PROCFS:
+            self.maybe_activate_tracemalloc((rss_mb - self._last_mb) / elapsed)
+        self.peak_mb = max(self.peak_mb, rss_mb)
+        self._last_mb = rss_mb
+        self._last_sample_ns = now_ns
+        return rss_mb
+
+    def maybe_activate_tracemalloc(self, growth_mb_per_sec: float) -> bool:
+        """Start tracemalloc if growth exceeds the threshold. Returns True if tracing."""
+        if growth_mb_per_sec >= self.threshold_mb_per_sec and not tracemalloc.is_tracing():
+            print(f"  RSS growing at {growth_mb_per_sec:.1f}MB/s, starting tracemalloc")
+            tracemalloc.start()
+            self._started_tracing = True
+        return tracemalloc.is_tracing()
+
+    def report(self, limit: int = 10) -> list[str]:
+        """Return the top allocation sites, or an empty list if not tracing."""
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot()
+        return [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+
+    def stop(self) -> None:
+        """Stop tracemalloc if this probe started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+async def sleep_until_ns(loop: asyncio.AbstractEventLoop, deadline_ns: int) -> None:
+    """Sleep until a perf_counter_ns() deadline.
+
+    Sub-200µs waits just yield to the loop; longer ones schedule a single
+    call_at wakeup rather than going through asyncio.sleep().
+    """
+    remaining_ns = deadline_ns - time.perf_counter_ns()
+    if remaining_ns <= 0:
+        return
+    if remaining_ns < 200_000:
+        await asyncio.sleep(0)
+        return
+    fut: asyncio.Future[None] = loop.create_future()
+    handle = loop.call_at(loop.time() + remaining_ns / 1e9, fut.set_result, None)
+    try:
+        await fut
+    finally:
+        handle.cancel()
+
+
+async def consume_at_rate(display: Display, target_fps: int) -> None:
+    """Take at most one video chunk per frame interval, like a real-time reader."""
+    loop = asyncio.get_running_loop()
+    interval_ns = 10**9 // target_fps
+    deadline_ns = time.perf_counter_ns() + interval_ns
+    while True:
+        await display.get_next_video_chunk(timeout=interval_ns / 1e9)
+        await sleep_until_ns(loop, deadline_ns)
+        deadline_ns += interval_ns
+
+
+async def stop_consumer(consumer: asyncio.Task[None] | None) -> None:
+    """Cancel a consume_at_rate() task and wait for it to finish."""
+    if consumer is None:
+        return
+    consumer.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await consumer
+
+
+async def run_fps_test(
+    client: RDPClient,
+    target_fps: int,
+    duration: float = 15.0,
+    mode: Literal["raw", "streaming"] = "streaming",
+    batch: int = BATCH,
+) -> FPSTestResult:
+    """Test the Display pipeline at a target FPS.
+
+    In "streaming" mode frames are fed to the ffmpeg encoder; in "raw" mode
+    streaming stays off, measuring frame injection alone.
+
+    Frames are injected in batches of ``batch`` per wakeup, with the pacing
+    interval stretched to match, to amortize scheduler overhead at high FPS.
+    """
+    print(f"\n{'=' * 60}")
+    print(f"Testing FPS: {target_fps} {'WITH' if mode == 'streaming' else 'WITHOUT'} VIDEO ENCODING")
+    print(f"{'=' * 60}")
+
+    # Stop the client's own encoder so it doesn't compete with the run
+    if client.is_streaming:
+        await client.display.stop_streaming()
+
+    # Drive a Display of the client's size at the target FPS, so every run
+    # starts with fresh stats and an empty video queue. The current screen
+    # is used as the frame; get_latest_frame() views bytes, so it's queued
+    # without a copy.
+    display = Display(width=client.width, height=client.height, fps=target_fps)
+    frames = (await client.display.get_latest_frame(),) * batch
+
+    gc.collect()
+    memory_probe = AdaptiveMemoryProbe()
+    memory_start = memory_probe.start_mb
+
+    if mode == "streaming":
+        await display.start_streaming()
+
+    clock = time.perf_counter_ns
+    start_ns = clock()
+    last_report_ns = start_ns
+
+    # Running totals rather than a sample list, so the harness itself
+    # doesn't grow memory with duration x fps
+    lag_sum = 0
+    lag_count = 0
+
+    # Keep cyclic GC pauses out of the timed loop; main() has already frozen
+    # the long-lived objects, so only this test's garbage is left to collect.
+    gc.disable()
+
+    consumer: asyncio.Task[None] | None = None
+    try:
+        loop = asyncio.get_running_loop()
+        # Pull chunks off the real video queue at the target rate, so
+        # consumer_lag_chunks grows only when the encoder outpaces a
+        # real-time reader.
+        consumer = asyncio.create_task(consume_at_rate(display, target_fps))
+        frames_in = 0
+        interval_ns = 10**9 // target_fps * batch
+        duration_ns = int(duration * 1e9)
+        # Deadlines advance on a fixed grid from the start time, so overshoot in
+        # one iteration doesn't accumulate as drift across the run.
+        deadline_ns = start_ns + interval_ns
+
+        # One clock read per iteration; the same sample drives the duration
+        # check, the report cadence and the final elapsed time.
+        while (now_ns := clock()) - start_ns < duration_ns:
+            await display.add_raw_frames(frames)
+            frames_in += batch
+
+            # Sample lag
+            lag = display.consumer_lag_chunks
+            lag_sum += lag
+            lag_count += 1
+
+            # Periodic reporting
+            if now_ns - last_report_ns >= 2 * 10**9:
+                current_mem = memory_probe.sample()
+                elapsed = (now_ns - start_ns) / 1e9
+                stats = display.stats
+
+                _report_buf.append(
+                    f"  [{elapsed:.1f}s] In: {frames_in} | Enc: {stats['frames_encoded']} | "
+                    f"Lag: {lag} | Mem: {current_mem:.1f}MB\n",
+                )
+                if len(_report_buf) >= REPORT_FLUSH_EVERY:
+                    await flush_reports()
+                last_report_ns = now_ns
+
+            await sleep_until_ns(loop, deadline_ns)
+            deadline_ns += interval_ns
+
+        end_ns = now_ns
+        frames_encoded = display.stats["frames_encoded"]
+        gc.enable()
+        gc.collect(0)
+        await flush_reports()
+
+        # Stop streaming
+        await stop_consumer(consumer)
+        await display.stop_streaming()
+
+        memory_end = memory_probe.sample()
+        for line in memory_probe.report():
+            print(f"  {line}")
+        memory_probe.stop()
+
+        total_time = (end_ns - start_ns) / 1e9
+
+        return FPSTestResult(
+            target_fps=target_fps,
+            duration_seconds=total_time,
+            frames_captured=frames_in,
+            frames_encoded=frames_encoded,
+            actual_capture_fps=frames_in / total_time,
+            actual_encode_fps=frames_encoded / total_time,
+            memory_start_mb=memory_start,
+            memory_end_mb=memory_end,
+            memory_peak_mb=memory_probe.peak_mb,
+            avg_lag_chunks=lag_sum / lag_count if lag_count else 0,
+            success=True,
+        )
+
+    except Exception as e:
+        gc.enable()
+        await flush_reports()
+        await stop_consumer(consumer)
+        await display.stop_streaming()
+        memory_probe.stop()
+        return FPSTestResult(
+            target_fps=target_fps,
+            duration_seconds=0,
+            frames_captured=0,
+            frames_encoded=0,
+            actual_capture_fps=0,
+            actual_encode_fps=0,
+            memory_start_mb=0,
+            memory_end_mb=0,
+            memory_peak_mb=0,
+            avg_lag_chunks=0,
+            success=False,
+            error=str(e),
+        )
+
+
+def print_results(results: list[FPSTestResult]) -> None:
+    """Print a summary table of all results."""
+    print("\n" + "=" * 100)
+    print("                              FPS TEST RESULTS SUMMARY")
+    print("=" * 100)
+    print(
+        f"{'Target':>8} | {'CapFPS':>8} | {'EncFPS':>8} | {'Lag(avg)':>8} | "
+        f"{'MemStart':>10} | {'MemEnd':>10} | {'MemPeak':>10} | {'Status':>8}",
+    )
+    print("-" * 100)
+
+    # Track the best sustained target in the same pass as the table. A target
+    # counts as sustained at >= 90% of its frames, checked as
+    # 10 * frames >= 9 * expected to avoid dividing by the duration.
+    best_sustained: FPSTestResult | None = None
+    for r in results:
+        status = "✓ OK" if r.success else f"✗ {r.error[:20]}"
+        print(
+            f"{r.target_fps:>8} | {r.actual_capture_fps:>8.1f} | {r.actual_encode_fps:>8.1f} | "
+            f"{r.avg_lag_chunks:>8.1f} | "
+            f"{r.memory_start_mb:>9.1f}M | {r.memory_end_mb:>9.1f}M | "
+            f"{r.memory_peak_mb:>9.1f}M | {status}",
+        )
+        if (
+            r.success
+            and 10 * r.frames_captured >= 9 * r.target_fps * r.duration_seconds
+            and (best_sustained is None or r.target_fps > best_sustained.target_fps)
+        ):
+            best_sustained = r
+
+    print("=" * 100)
+    if best_sustained is not None:
+        print(f"Max sustainable FPS: {best_sustained.target_fps} (achieved {best_sustained.actual_capture_fps:.1f})")
+    else:
+        print("Max sustainable FPS: none of the targets reached 90%")
+
+
+def write_results_csv(results: list[FPSTestResult], path: str) -> None:
+    """Write results to a CSV file, one row per FPS target."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([field.name for field in fields(FPSTestResult)])
+        writer.writerows(astuple(r) for r in results)
+
+
+def report_results(results: list[FPSTestResult], csv_path: str) -> None:
+    """Print the summary table and export results to CSV.
+
+    Blocking; run it with asyncio.to_thread() to keep it off the event loop.
+    """
+    print_results(results)
+    write_results_csv(results, csv_path)
+    print(f"Results written to {csv_path}")
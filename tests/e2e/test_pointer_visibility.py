@@ -9,11 +9,15 @@ The pointer should be visible in the recording at all times.
 """
 
 import asyncio
+import cmath
 import logging
 import math
 import os
 from datetime import datetime
+from functools import cache
+from itertools import pairwise
 from pathlib import Path
+from typing import Final
 
 from dotenv import load_dotenv
 from rich.logging import RichHandler
@@ -22,6 +26,81 @@ from simple_rdp import RDPClient
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Screen dimensions (assuming 1920x1080)
+WIDTH: Final[int] = 1920
+HEIGHT: Final[int] = 1080
+CENTER: Final[tuple[int, int]] = (WIDTH // 2, HEIGHT // 2)
+
+# Cap on pointer moves per second sent to the server; denser paths are thinned
+MIN_MOVE_INTERVAL = 1 / 25
+
+# Resolution of the curved patterns
+CIRCLE_STEPS = 60  # Full circle
+SPIRAL_ROTATIONS = 3
+SPIRAL_POINTS_PER_ROTATION = 40
+
+
+@cache
+def _unit_circle(steps: int, turns: float = 1.0) -> tuple[tuple[float, float], ...]:
+    """Return steps + 1 evenly spaced (cos, sin) pairs covering ``turns`` revolutions.
+
+    Built by repeatedly rotating a unit phasor, so the whole table costs one
+    exp() instead of a cos()/sin() pair per point.
+    """
+    rotation = cmath.exp(2j * math.pi * turns / steps)
+    z = 1 + 0j
+    table = []
+    for _ in range(steps + 1):
+        table.append((z.real, z.imag))
+        z *= rotation
+    return tuple(table)
+
+
+def _line(x1: int, y1: int, x2: int, y2: int, steps: int) -> list[tuple[int, int]]:
+    """Return steps + 1 integer points from (x1, y1) to (x2, y2), endpoints included."""
+    dx, dy = x2 - x1, y2 - y1
+    return [(x1 + dx * step // steps, y1 + dy * step // steps) for step in range(steps + 1)]
+
+
+def _circle(cx: int, cy: int, radius: int, steps: int) -> list[tuple[int, int]]:
+    """Return steps + 1 points once around a circle, starting and ending at angle 0."""
+    return [(int(cx + radius * cos), int(cy + radius * sin)) for cos, sin in _unit_circle(steps)]
+
+
+def _spiral(cx: int, cy: int, max_radius: int, turns: int, steps: int) -> list[tuple[int, int]]:
+    """Return steps + 1 points on a spiral growing from the center to max_radius."""
+    scale = max_radius / steps
+    return [
+        (int(cx + point * scale * cos), int(cy + point * scale * sin))
+        for point, (cos, sin) in enumerate(_unit_circle(steps, turns))
+    ]
+
+
+def _throttle_path(
+    points: list[tuple[int, int]], delay: float, min_interval: float = MIN_MOVE_INTERVAL
+) -> tuple[list[tuple[int, int]], float]:
+    """Drop intermediate points so moves are at least ``min_interval`` apart.
+
+    The first and last points are always kept, so corners and drag end
+    positions land exactly. Returns the thinned path and its new delay.
+    """
+    if delay >= min_interval or len(points) <= 2:
+        return points, delay
+    stride = math.ceil(min_interval / delay)
+    kept = points[::stride]
+    if (len(points) - 1) % stride:
+        kept.append(points[-1])
+    return kept, delay * stride
+
+
+async def _stream_moves(client: RDPClient, points: list[tuple[int, int]], delay: float) -> None:
+    """Send a precomputed list of pointer positions, one every ``delay`` seconds."""
+    points, delay = _throttle_path(points, delay)
+    await client.mouse_move_path(points, interval=delay)
+    await asyncio.sleep(delay)
+
 
 async def rectangular_pattern(client: RDPClient, width: int, height: int) -> None:
     """Move mouse in a rectangular pattern around screen edges.
@@ -33,26 +112,19 @@ async def rectangular_pattern(client: RDPClient, width: int, height: int) -> Non
     steps = 20
     delay = 0.1
 
-    corners = [
+    corners = (
         (margin, margin),  # Top-left
         (width - margin, margin),  # Top-right
         (width - margin, height - margin),  # Bottom-right
         (margin, height - margin),  # Bottom-left
         (margin, margin),  # Back to top-left
-    ]
-
-    for i in range(len(corners) - 1):
-        x1, y1 = corners[i]
-        x2, y2 = corners[i + 1]
+    )
 
-        for step in range(steps + 1):
-            t = step / steps
-            x = int(x1 + (x2 - x1) * t)
-            y = int(y1 + (y2 - y1) * t)
-            await client.mouse_move(x, y)
-            await asyncio.sleep(delay)
+    for i, ((x1, y1), (x2, y2)) in enumerate(pairwise(corners)):
+        points = _line(x1, y1, x2, y2, steps)
+        await _stream_moves(client, points, delay)
 
-        print(f"    Corner {i + 1} -> {i + 2}: ({x2}, {y2})")
+        logger.info("Corner %d -> %d: (%d, %d)", i + 1, i + 2, x2, y2)
 
 
 async def circular_pattern(client: RDPClient, width: int, height: int) -> None:
@@ -63,15 +135,9 @@ async def circular_pattern(client: RDPClient, width: int, height: int) -> None:
     print("\n  === Circular Pattern ===")
     cx, cy = width // 2, height // 2
     radius = 200
-    steps = 60  # Full circle
     delay = 0.05
 
-    for step in range(steps + 1):
-        angle = (step / steps) * 2 * math.pi
-        x = int(cx + radius * math.cos(angle))
-        y = int(cy + radius * math.sin(angle))
-        await client.mouse_move(x, y)
-        await asyncio.sleep(delay)
+    await _stream_moves(client, _circle(cx, cy, radius, CIRCLE_STEPS), delay)
 
     print(f"    Completed circle at center ({cx}, {cy}), radius {radius}")
 
@@ -86,37 +152,23 @@ async def diagonal_selection_pattern(client: RDPClient, width: int, height: int)
     delay = 0.05
 
     # Diagonal from top-left to center (drag)
-    print("    Selection 1: Top-left to center")
+    logger.info("Selection 1: Top-left to center")
     await client.mouse_move(100, 100)
     await asyncio.sleep(0.2)
-    await client.mouse_button_down(100, 100, button="left")
-    await asyncio.sleep(0.1)
 
-    for step in range(steps + 1):
-        t = step / steps
-        x = int(100 + (width // 2 - 100) * t)
-        y = int(100 + (height // 2 - 100) * t)
-        await client.mouse_move(x, y)
-        await asyncio.sleep(delay)
-
-    await client.mouse_button_up(width // 2, height // 2, button="left")
+    points = _line(100, 100, width // 2, height // 2, steps)
+    points, interval = _throttle_path(points, delay)
+    await client.drag_path(points, interval=interval)
     await asyncio.sleep(0.3)
 
     # Diagonal from top-right to bottom-left (drag)
-    print("    Selection 2: Top-right to bottom-left")
+    logger.info("Selection 2: Top-right to bottom-left")
     await client.mouse_move(width - 100, 100)
     await asyncio.sleep(0.2)
-    await client.mouse_button_down(width - 100, 100, button="left")
-    await asyncio.sleep(0.1)
-
-    for step in range(steps + 1):
-        t = step / steps
-        x = int((width - 100) - (width - 200) * t)
-        y = int(100 + (height - 200) * t)
-        await client.mouse_move(x, y)
-        await asyncio.sleep(delay)
 
-    await client.mouse_button_up(100, height - 100, button="left")
+    points = _line(width - 100, 100, 100, height - 100, steps)
+    points, interval = _throttle_path(points, delay)
+    await client.drag_path(points, interval=interval)
     await asyncio.sleep(0.3)
 
 
@@ -128,19 +180,11 @@ async def spiral_pattern(client: RDPClient, width: int, height: int) -> None:
     print("\n  === Spiral Pattern ===")
     cx, cy = width // 2, height // 2
     max_radius = min(width, height) // 3
-    rotations = 3
-    points_per_rotation = 40
-    total_points = rotations * points_per_rotation
+    rotations = SPIRAL_ROTATIONS
+    total_points = rotations * SPIRAL_POINTS_PER_ROTATION
     delay = 0.03
 
-    for point in range(total_points + 1):
-        t = point / total_points
-        radius = max_radius * t
-        angle = t * rotations * 2 * math.pi
-        x = int(cx + radius * math.cos(angle))
-        y = int(cy + radius * math.sin(angle))
-        await client.mouse_move(x, y)
-        await asyncio.sleep(delay)
+    await _stream_moves(client, _spiral(cx, cy, max_radius, rotations, total_points), delay)
 
     print(f"    Completed spiral with {rotations} rotations")
 
@@ -150,33 +194,34 @@ async def perform_pointer_test(client: RDPClient) -> None:
     print("\n=== Pointer Visibility Test ===")
     print("Testing pointer compositing with various movement patterns...")
 
-    # Screen dimensions (assuming 1920x1080)
-    width, height = 1920, 1080
+    # Build the curved patterns' trig tables now rather than mid-recording
+    _unit_circle(CIRCLE_STEPS)
+    _unit_circle(SPIRAL_ROTATIONS * SPIRAL_POINTS_PER_ROTATION, SPIRAL_ROTATIONS)
 
     # Initial position - center of screen
     print("\n  Moving pointer to center...")
-    await client.mouse_move(width // 2, height // 2)
+    await client.mouse_move(*CENTER)
     await asyncio.sleep(1)
 
     # Pattern 1: Rectangle
-    await rectangular_pattern(client, width, height)
+    await rectangular_pattern(client, WIDTH, HEIGHT)
     await asyncio.sleep(0.5)
 
     # Pattern 2: Circle
-    await circular_pattern(client, width, height)
+    await circular_pattern(client, WIDTH, HEIGHT)
     await asyncio.sleep(0.5)
 
     # Pattern 3: Spiral
-    await spiral_pattern(client, width, height)
+    await spiral_pattern(client, WIDTH, HEIGHT)
     await asyncio.sleep(0.5)
 
     # Pattern 4: Diagonal selections
-    await diagonal_selection_pattern(client, width, height)
+    await diagonal_selection_pattern(client, WIDTH, HEIGHT)
     await asyncio.sleep(0.5)
 
     # Final position - center
     print("\n  Returning pointer to center...")
-    await client.mouse_move(width // 2, height // 2)
+    await client.mouse_move(*CENTER)
     await asyncio.sleep(1)
 
     print("\n=== Pointer Test Complete ===\n")
@@ -210,12 +255,9 @@ async def main() -> None:
     async with RDPClient(host=host, username=username, password=password, show_wallpaper=True) as client:
         print("Connected to RDP server!\n")
 
-        # Wait for initial screen to render
-        await asyncio.sleep(2)
-
-        # Start recording
+        # Start recording while the initial screen renders
         print("Starting recording...")
-        await client.start_file_recording(str(video_ts_path))
+        await asyncio.gather(asyncio.sleep(2), client.start_file_recording(str(video_ts_path)))
         print(f"Recording to: {video_ts_path}")
 
         try:
@@ -225,6 +267,8 @@ async def main() -> None:
         finally:
             # Stop recording
             print("Stopping recording...")
+            # Sequential, unlike start-up: the file recording reads from the
+            # stream, so it must finish before streaming is torn down
             await client.stop_file_recording()
             await client.stop_streaming()
 
@@ -234,17 +278,26 @@ async def main() -> None:
     print(f"{'=' * 60}\n")
 
     if video_ts_path.exists():
-        size_mb = video_ts_path.stat().st_size / (1024 * 1024)
-        stats = client.get_recording_stats()
-        print(f"✓ Video saved: {video_ts_path}")
-        print(f"  Size: {size_mb:.2f} MB")
-        print(f"  Frames encoded: {stats.get('frames_encoded', 'N/A')}")
-        print(f"  Pointer updates: {stats.get('pointer_updates', 'N/A')}")
-        print(f"  Pointer throttled: {stats.get('pointer_updates_throttled', 'N/A')}")
-
-        # Transcode to MP4
-        print("\nTranscoding to MP4...")
-        if RDPClient.transcode(str(video_ts_path), str(video_mp4_path)):
+        # Transcode in a worker thread while the recording stats are printed
+        transcode_task = asyncio.create_task(
+            asyncio.to_thread(RDPClient.transcode, str(video_ts_path), str(video_mp4_path))
+        )
+        try:
+            size_mb = video_ts_path.stat().st_size / (1024 * 1024)
+            stats = client.get_recording_stats()
+            print(f"✓ Video saved: {video_ts_path}")
+            print(f"  Size: {size_mb:.2f} MB")
+            print(f"  Frames encoded: {stats.get('frames_encoded', 'N/A')}")
+            print(f"  Pointer updates: {stats.get('pointer_updates', 'N/A')}")
+            print(f"  Pointer throttled: {stats.get('pointer_updates_throttled', 'N/A')}")
+
+            # Transcode to MP4
+            print("\nTranscoding to MP4...")
+        finally:
+            # Always collect the transcode, so its failure is reported even
+            # if printing the stats raised
+            transcoded = await transcode_task
+        if transcoded:
             mp4_size_mb = video_mp4_path.stat().st_size / (1024 * 1024)
             print(f"✓ MP4 saved: {video_mp4_path}")
             print(f"  Size: {mp4_size_mb:.2f} MB")
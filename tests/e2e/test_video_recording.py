@@ -11,6 +11,8 @@ import logging
 import os
 from datetime import datetime
 from pathlib import Path
+from typing import Any
+from typing import Final
 
 from dotenv import load_dotenv
 from rich.logging import RichHandler
@@ -19,78 +21,81 @@ from simple_rdp import RDPClient
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+# Screen dimensions (assuming 1920x1080)
+WIDTH: Final[int] = 1920
+HEIGHT: Final[int] = 1080
+
+# Windows button location (bottom-left, Start button)
+START_BUTTON: Final[tuple[int, int]] = (28, HEIGHT - 28)  # ~center of Start button
+
+# Clock/system tray location (bottom-right)
+CLOCK_AREA: Final[tuple[int, int]] = (WIDTH - 100, HEIGHT - 28)
+
+# Center of screen
+CENTER: Final[tuple[int, int]] = (WIDTH // 2, HEIGHT // 2)
+
+# Scripted interactions as (seconds from start, description, client method,
+# args). Each action fires at its offset; the gaps between them are the waits.
+SCRIPT: Final[tuple[tuple[float, str, str, tuple[Any, ...]], ...]] = (
+    # Phase 1: Initial setup
+    (0, "Move mouse to center", "mouse_move", CENTER),
+    (1, "Click center", "mouse_click", CENTER),
+    # Phase 2: Windows Start menu
+    (3, "Move to Start button", "mouse_move", START_BUTTON),
+    (3.5, "Click Start button", "mouse_click", START_BUTTON),
+    (5.5, "Press Windows key to toggle", "send_key", (0x5B,)),
+    # Phase 3: Open Start menu with keyboard
+    (6.5, "Press Windows key", "send_key", (0x5B,)),
+    (8, "Type 'settings'", "send_text_batch", ("settings",)),
+    (10, "Press Escape", "send_key", (0x01,)),
+    # Phase 4: Mouse movements
+    (11, "Move mouse top-left", "mouse_move", (100, 100)),
+    (11.5, "Move mouse top-right", "mouse_move", (WIDTH - 100, 100)),
+    (12, "Move mouse bottom-right", "mouse_move", (WIDTH - 100, HEIGHT - 100)),
+    (12.5, "Move mouse bottom-left", "mouse_move", (100, HEIGHT - 100)),
+    (13, "Move mouse to center", "mouse_move", CENTER),
+    # Phase 5: Click on clock/system tray
+    (14, "Move to clock area", "mouse_move", CLOCK_AREA),
+    (14.5, "Click clock", "mouse_click", CLOCK_AREA),
+    (17.5, "Press Escape to close", "send_key", (0x01,)),
+    # Phase 6: Final interactions
+    (18.5, "Press Windows key", "send_key", (0x5B,)),
+    (20, "Type 'notepad'", "send_text_batch", ("notepad",)),
+    (22, "Press Escape", "send_key", (0x01,)),
+    (23, "Move to center", "mouse_move", CENTER),
+)
+
+# Total run time; the last action is followed by a short settle
+SCRIPT_DURATION: Final[float] = 25
+
 
 async def perform_interactions(client: RDPClient) -> None:
     """Perform automated mouse and keyboard interactions.
 
-    This runs for approximately 1 minute, performing various UI interactions.
+    This runs for SCRIPT_DURATION seconds, performing various UI interactions.
     """
     print("\n=== Starting automated interactions ===\n")
 
-    # Screen dimensions (assuming 1920x1080)
-    width, height = 1920, 1080
-
-    # Windows button location (bottom-left, Start button)
-    start_button = (28, height - 28)  # ~center of Start button
-
-    # Clock/system tray location (bottom-right)
-    clock_area = (width - 100, height - 28)
-
-    # Center of screen
-    center = (width // 2, height // 2)
-
-    interactions = [
-        # Phase 1: Initial setup (0-10 seconds)
-        ("Move mouse to center", lambda: client.mouse_move(*center)),
-        ("Wait", lambda: asyncio.sleep(1)),
-        ("Click center", lambda: client.mouse_click(*center)),
-        ("Wait", lambda: asyncio.sleep(2)),
-        # Phase 2: Windows Start menu (10-20 seconds)
-        ("Move to Start button", lambda: client.mouse_move(*start_button)),
-        ("Wait", lambda: asyncio.sleep(0.5)),
-        ("Click Start button", lambda: client.mouse_click(*start_button)),
-        ("Wait for Start menu", lambda: asyncio.sleep(2)),
-        ("Press Windows key to toggle", lambda: client.send_key(0x5B)),
-        ("Wait", lambda: asyncio.sleep(1)),
-        # Phase 3: Open Start menu with keyboard (20-30 seconds)
-        ("Press Windows key", lambda: client.send_key(0x5B)),
-        ("Wait for menu", lambda: asyncio.sleep(1.5)),
-        ("Type 'settings'", lambda: client.send_text("settings")),
-        ("Wait for search", lambda: asyncio.sleep(2)),
-        ("Press Escape", lambda: client.send_key(0x01)),
-        ("Wait", lambda: asyncio.sleep(1)),
-        # Phase 4: Mouse movements (30-40 seconds)
-        ("Move mouse top-left", lambda: client.mouse_move(100, 100)),
-        ("Wait", lambda: asyncio.sleep(0.5)),
-        ("Move mouse top-right", lambda: client.mouse_move(width - 100, 100)),
-        ("Wait", lambda: asyncio.sleep(0.5)),
-        ("Move mouse bottom-right", lambda: client.mouse_move(width - 100, height - 100)),
-        ("Wait", lambda: asyncio.sleep(0.5)),
-        ("Move mouse bottom-left", lambda: client.mouse_move(100, height - 100)),
-        ("Wait", lambda: asyncio.sleep(0.5)),
-        ("Move mouse to center", lambda: client.mouse_move(*center)),
-        ("Wait", lambda: asyncio.sleep(1)),
-        # Phase 5: Click on clock/system tray (40-50 seconds)
-        ("Move to clock area", lambda: client.mouse_move(*clock_area)),
-        ("Wait", lambda: asyncio.sleep(0.5)),
-        ("Click clock", lambda: client.mouse_click(*clock_area)),
-        ("Wait for calendar popup", lambda: asyncio.sleep(3)),
-        ("Press Escape to close", lambda: client.send_key(0x01)),
-        ("Wait", lambda: asyncio.sleep(1)),
-        # Phase 6: Final interactions (50-60 seconds)
-        ("Press Windows key", lambda: client.send_key(0x5B)),
-        ("Wait", lambda: asyncio.sleep(1.5)),
-        ("Type 'notepad'", lambda: client.send_text("notepad")),
-        ("Wait", lambda: asyncio.sleep(2)),
-        ("Press Escape", lambda: client.send_key(0x01)),
-        ("Wait", lambda: asyncio.sleep(1)),
-        ("Move to center", lambda: client.mouse_move(*center)),
-        ("Final wait", lambda: asyncio.sleep(2)),
-    ]
-
-    for i, (description, action) in enumerate(interactions):
-        print(f"  [{i + 1}/{len(interactions)}] {description}")
-        await action()
+    # Resolve the client methods once rather than per step
+    actions = {name: getattr(client, name) for _, _, name, _ in SCRIPT}
+
+    # Sleep to absolute offsets so time spent in actions doesn't stretch the run
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    total = len(SCRIPT)
+    for i, (offset, description, name, args) in enumerate(SCRIPT):
+        remaining = start + offset - loop.time()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        logger.info("[%d/%d] %s", i + 1, total, description)
+        await actions[name](*args)
+
+    remaining = start + SCRIPT_DURATION - loop.time()
+    if remaining > 0:
+        await asyncio.sleep(remaining)
 
 
 async def main() -> None:
@@ -120,21 +125,21 @@ async def main() -> None:
     async with RDPClient(host=host, username=username, password=password, show_wallpaper=True) as client:
         print("Connected to RDP server!\n")
 
-        # Wait a moment for initial screen to render
-        await asyncio.sleep(2)
-
         # Start native file recording (uses library's built-in ffmpeg streaming)
+        # while the initial screen renders
         print("Starting native file recording...")
-        await client.start_file_recording(str(video_path))
+        await asyncio.gather(asyncio.sleep(2), client.start_file_recording(str(video_path)))
         print(f"Recording to: {video_path}")
 
         try:
-            # Perform automated interactions (~1 minute)
+            # Perform automated interactions (~25 seconds)
             await perform_interactions(client)
 
         finally:
             # Stop recording
             print("\nStopping recording...")
+            # Sequential, unlike start-up: the file recording reads from the
+            # stream, so it must finish before streaming is torn down
             await client.stop_file_recording()
             await client.stop_streaming()
 
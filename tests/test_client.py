@@ -1,5 +1,7 @@
 """Tests for RDP Client."""
 
+import time
+from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
@@ -8,6 +10,23 @@ import pytest
 from simple_rdp.client import IO_CHANNEL_ID
 from simple_rdp.client import MCS_GLOBAL_CHANNEL_ID
 from simple_rdp.client import RDPClient
+from simple_rdp.input import KeyEvent
+from simple_rdp.input import KeyModifier
+from simple_rdp.input import MouseButton
+from simple_rdp.input import MouseEvent
+from simple_rdp.pdu import INPUT_EVENT_MOUSE
+from simple_rdp.pdu import INPUT_EVENT_SCANCODE
+from simple_rdp.pdu import KBDFLAGS_EXTENDED
+from simple_rdp.pdu import KBDFLAGS_RELEASE
+from simple_rdp.pdu import PTRFLAGS_BUTTON1
+from simple_rdp.pdu import PTRFLAGS_DOWN
+from simple_rdp.pdu import PTRFLAGS_MOVE
+
+
+@pytest.fixture(scope="module")
+def client():
+    """A single unconnected client with default settings, shared by read-only tests."""
+    return RDPClient(host="localhost")
 
 
 class TestRDPClient:
@@ -20,11 +39,6 @@ class TestRDPClient:
         assert client.host == "localhost"
         assert client.port == 3389
 
-    def test_client_custom_port(self):
-        """Test client with custom port."""
-        client = RDPClient(host="localhost", port=3390)
-        assert client.port == 3390
-
     def test_client_full_params(self):
         """Test client with all parameters."""
         client = RDPClient(
@@ -36,21 +50,13 @@ class TestRDPClient:
         )
         assert client.host == "server.example.com"
 
-    def test_client_dimensions(self):
-        """Test client dimension properties."""
-        client = RDPClient(host="localhost", width=1280, height=720)
-        assert client.width == 1280
-        assert client.height == 720
-
-    def test_client_default_dimensions(self):
+    def test_client_default_dimensions(self, client):
         """Test client default dimensions."""
-        client = RDPClient(host="localhost")
         assert client.width == 1920
         assert client.height == 1080
 
-    def test_client_connection_properties_initial(self):
+    def test_client_connection_properties_initial(self, client):
         """Test client connection properties are empty initially."""
-        client = RDPClient(host="localhost")
         assert client.connection_properties == {}
 
     @pytest.mark.asyncio
@@ -64,7 +70,12 @@ class TestRDPClient:
     async def test_connect_fails_on_invalid_host(self):
         """Test that connect raises ConnectionError on invalid host."""
         client = RDPClient(host="invalid.host.that.does.not.exist.local", port=3389)
-        with pytest.raises(ConnectionError):
+        # Fail name resolution directly rather than waiting on the real resolver
+        resolve_error = OSError("Name or service not known")
+        with (
+            patch("simple_rdp.client.open_connection", new=AsyncMock(side_effect=resolve_error)),
+            pytest.raises(ConnectionError),
+        ):
             await client.connect()
 
 
@@ -83,31 +94,24 @@ class TestClientConstants:
 class TestClientProperties:
     """Tests for client property accessors."""
 
-    def test_host_property(self):
-        """Test host property."""
-        client = RDPClient(host="test-server")
-        assert client.host == "test-server"
-
-    def test_port_property(self):
-        """Test port property."""
-        client = RDPClient(host="localhost", port=13389)
-        assert client.port == 13389
-
-    def test_is_connected_false_by_default(self):
+    @pytest.mark.parametrize(
+        ("attr", "value"),
+        [
+            ("host", "test-server"),
+            ("port", 13389),
+            ("width", 800),
+            ("height", 600),
+        ],
+    )
+    def test_constructor_argument_exposed_as_property(self, attr, value):
+        """Test constructor arguments are exposed through their properties."""
+        client = RDPClient(**{"host": "localhost", attr: value})
+        assert getattr(client, attr) == value
+
+    def test_is_connected_false_by_default(self, client):
         """Test is_connected is False by default."""
-        client = RDPClient(host="localhost")
         assert client.is_connected is False
 
-    def test_width_property(self):
-        """Test width property."""
-        client = RDPClient(host="localhost", width=800)
-        assert client.width == 800
-
-    def test_height_property(self):
-        """Test height property."""
-        client = RDPClient(host="localhost", height=600)
-        assert client.height == 600
-
 
 class TestClientContextManager:
     """Tests for client context manager support."""
@@ -132,9 +136,8 @@ class TestClientMultipleInstances:
         assert client1.host != client2.host
         assert client1.port != client2.port
 
-    def test_client_default_values(self):
+    def test_client_default_values(self, client):
         """Test client default values."""
-        client = RDPClient(host="localhost")
         assert client.width == 1920
         assert client.height == 1080
         # Check it starts disconnected
@@ -144,16 +147,14 @@ class TestClientMultipleInstances:
 class TestClientReaderWriter:
     """Tests for client reader/writer property access."""
 
-    def test_reader_raises_when_not_connected(self):
+    def test_reader_raises_when_not_connected(self, client):
         """Test _reader property raises when not connected."""
-        client = RDPClient(host="localhost")
         # The _reader property should raise ConnectionError
         with pytest.raises(ConnectionError, match="Not connected"):
             _ = client._reader
 
-    def test_writer_raises_when_not_connected(self):
+    def test_writer_raises_when_not_connected(self, client):
         """Test _writer property raises when not connected."""
-        client = RDPClient(host="localhost")
         # The _writer property should raise ConnectionError
         with pytest.raises(ConnectionError, match="Not connected"):
             _ = client._writer
@@ -162,45 +163,37 @@ class TestClientReaderWriter:
 class TestClientInternalState:
     """Tests for client internal state."""
 
-    def test_initial_user_id(self):
+    def test_initial_user_id(self, client):
         """Test initial user_id is 0."""
-        client = RDPClient(host="localhost")
         assert client._user_id == 0
 
-    def test_initial_io_channel_id(self):
+    def test_initial_io_channel_id(self, client):
         """Test initial _io_channel_id."""
-        client = RDPClient(host="localhost")
         assert client._io_channel_id == IO_CHANNEL_ID
 
-    def test_initial_channel_ids_empty(self):
+    def test_initial_channel_ids_empty(self, client):
         """Test initial _channel_ids is empty."""
-        client = RDPClient(host="localhost")
         assert client._channel_ids == []
 
-    def test_initial_share_id(self):
+    def test_initial_share_id(self, client):
         """Test initial _share_id is 0."""
-        client = RDPClient(host="localhost")
         assert client._share_id == 0
 
-    def test_initial_raw_display_image_none(self):
+    def test_initial_raw_display_image_none(self, client):
         """Test initial display _raw_display_image is None."""
-        client = RDPClient(host="localhost")
         assert client._display._raw_display_image is None
 
-    def test_initial_fragment_buffer_empty(self):
+    def test_initial_fragment_buffer_empty(self, client):
         """Test initial fragment buffer is empty."""
-        client = RDPClient(host="localhost")
         assert len(client._fragment_buffer) == 0
         assert client._fragment_type == 0
 
-    def test_initial_running_false(self):
+    def test_initial_running_false(self, client):
         """Test _running is False initially."""
-        client = RDPClient(host="localhost")
         assert client._running is False
 
-    def test_initial_receive_task_none(self):
+    def test_initial_receive_task_none(self, client):
         """Test _receive_task is None initially."""
-        client = RDPClient(host="localhost")
         assert client._receive_task is None
 
 
@@ -239,9 +232,8 @@ class TestClientScreenCapture:
 class TestClientColorDepth:
     """Tests for client color depth settings."""
 
-    def test_default_color_depth(self):
+    def test_default_color_depth(self, client):
         """Test default color depth is 32."""
-        client = RDPClient(host="localhost")
         assert client._color_depth == 32
 
     def test_custom_color_depth(self):
@@ -253,9 +245,8 @@ class TestClientColorDepth:
 class TestClientWallpaper:
     """Tests for client wallpaper settings."""
 
-    def test_default_show_wallpaper_false(self):
+    def test_default_show_wallpaper_false(self, client):
         """Test show_wallpaper is False by default."""
-        client = RDPClient(host="localhost")
         assert client._show_wallpaper is False
 
     def test_show_wallpaper_true(self):
@@ -267,19 +258,16 @@ class TestClientWallpaper:
 class TestClientAuth:
     """Tests for client authentication settings."""
 
-    def test_username_none_by_default(self):
+    def test_username_none_by_default(self, client):
         """Test username is None by default."""
-        client = RDPClient(host="localhost")
         assert client._username is None
 
-    def test_password_none_by_default(self):
+    def test_password_none_by_default(self, client):
         """Test password is None by default."""
-        client = RDPClient(host="localhost")
         assert client._password is None
 
-    def test_domain_none_by_default(self):
+    def test_domain_none_by_default(self, client):
         """Test domain is None by default."""
-        client = RDPClient(host="localhost")
         assert client._domain is None
 
     def test_auth_credentials_set(self):
@@ -411,3 +399,258 @@ class TestClientDisplay:
         mock_run.side_effect = FileNotFoundError()
         result = RDPClient.transcode("input.ts", "output.mp4")
         assert result is False
+
+
+class TestClientMouseMovePath:
+    """Tests for RDPClient.mouse_move_path."""
+
+    @pytest.mark.asyncio
+    async def test_fast_path_moves_sent_in_one_write(self):
+        """Test unpaced moves are packed into a single fast-path PDU."""
+        client = RDPClient(host="localhost")
+        client._tcp_writer = MagicMock()
+        client._tcp_writer.drain = AsyncMock()
+
+        await client.mouse_move_path([(10, 20), (30, 40), (50, 60)])
+
+        client._tcp_writer.write.assert_called_once()
+        pdu = client._tcp_writer.write.call_args[0][0]
+        assert pdu[0] >> 2 == 3  # numEvents in fpInputHeader
+        client._tcp_writer.drain.assert_awaited_once()
+        assert client.pointer_position == (50, 60)
+
+    @pytest.mark.asyncio
+    async def test_fast_path_splits_at_255_events(self):
+        """Test long paths are split into PDUs of at most 255 events."""
+        client = RDPClient(host="localhost")
+        client._tcp_writer = MagicMock()
+        client._tcp_writer.drain = AsyncMock()
+
+        await client.mouse_move_path([(i, i) for i in range(300)])
+
+        assert client._tcp_writer.write.call_count == 2
+        client._tcp_writer.drain.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_slow_path_splits_at_1024_events(self):
+        """Test unpaced moves without fast-path input go out in PDUs of at most 1024 events."""
+        client = RDPClient(host="localhost")
+        client._use_fast_path_input = False
+        client._send_input_pdu = AsyncMock()
+
+        await client.mouse_move_path([(i, i) for i in range(6000)])
+
+        input_pdus = [call.args[0] for call in client._send_input_pdu.await_args_list]
+        assert [int.from_bytes(pdu[:2], "little") for pdu in input_pdus] == [1024] * 5 + [880]  # numEvents
+        assert all(len(pdu) == 4 + int.from_bytes(pdu[:2], "little") * 12 for pdu in input_pdus)
+        assert client.pointer_position == (5999, 5999)
+
+    @pytest.mark.asyncio
+    async def test_paced_moves_sent_individually(self):
+        """Test a positive interval sends one move per point."""
+        client = RDPClient(host="localhost")
+        client.mouse_move = AsyncMock()
+
+        await client.mouse_move_path([(1, 1), (2, 2)], interval=0.001)
+
+        assert client.mouse_move.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_consecutive_duplicates_skipped(self):
+        """Test repeated positions are only sent once."""
+        client = RDPClient(host="localhost")
+        client._tcp_writer = MagicMock()
+        client._tcp_writer.drain = AsyncMock()
+
+        await client.mouse_move_path([(1, 1), (1, 1), (2, 2), (2, 2), (1, 1)])
+
+        pdu = client._tcp_writer.write.call_args[0][0]
+        assert pdu[0] >> 2 == 3  # numEvents in fpInputHeader
+
+    @pytest.mark.asyncio
+    async def test_paced_duplicates_skipped(self):
+        """Test paced paths skip repeated positions too."""
+        client = RDPClient(host="localhost")
+        client.mouse_move = AsyncMock()
+
+        await client.mouse_move_path([(1, 1), (1, 1), (2, 2)], interval=0.001)
+
+        assert client.mouse_move.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_paced_moves_do_not_sleep_when_behind_schedule(self):
+        """Test slow sends eat into the next interval instead of adding to it."""
+        client = RDPClient(host="localhost")
+        client.mouse_move = AsyncMock(side_effect=lambda x, y: time.sleep(0.02))
+
+        with patch("simple_rdp.client.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            await client.mouse_move_path([(1, 1), (2, 2), (3, 3)], interval=0.01)
+
+        assert client.mouse_move.await_count == 3
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_empty_path_is_noop(self):
+        """Test an empty path sends nothing."""
+        client = RDPClient(host="localhost")
+        await client.mouse_move_path([])
+        assert client.pointer_position == (0, 0)
+
+
+class TestClientDragPath:
+    """Tests for RDPClient.drag_path."""
+
+    @pytest.mark.asyncio
+    async def test_button_state_rides_on_first_and_last_move(self):
+        """Test the press and release are carried on the path's end moves."""
+        client = RDPClient(host="localhost")
+        client._tcp_writer = MagicMock()
+        client._tcp_writer.drain = AsyncMock()
+
+        await client.drag_path([(10, 20), (30, 40), (50, 60)])
+
+        client._tcp_writer.write.assert_called_once()
+        pdu = client._tcp_writer.write.call_args[0][0]
+        assert pdu[0] >> 2 == 3  # numEvents in fpInputHeader
+        # Each event is header(1) + pointerFlags(2) + x(2) + y(2) after the 2-byte header
+        flags = [int.from_bytes(pdu[3 + i * 7 : 5 + i * 7], "little") for i in range(3)]
+        assert flags == [
+            PTRFLAGS_MOVE | PTRFLAGS_BUTTON1 | PTRFLAGS_DOWN,
+            PTRFLAGS_MOVE,
+            PTRFLAGS_MOVE | PTRFLAGS_BUTTON1,
+        ]
+        assert client.pointer_position == (50, 60)
+
+    @pytest.mark.asyncio
+    async def test_single_point_presses_and_releases(self):
+        """Test a one-point path still sends both press and release."""
+        client = RDPClient(host="localhost")
+        client._send_mouse_event = AsyncMock()
+
+        await client.drag_path([(5, 5)], interval=0.001)
+
+        assert client._send_mouse_event.await_count == 2
+        assert client._send_mouse_event.await_args_list[0].kwargs == {"button": 1, "is_down": True}
+        assert client._send_mouse_event.await_args_list[1].kwargs == {"button": 1, "is_down": False}
+
+    @pytest.mark.asyncio
+    async def test_slow_path_splits_at_1024_events(self):
+        """Test a long slow-path drag goes out in PDUs of at most 1024 events."""
+        client = RDPClient(host="localhost")
+        client._use_fast_path_input = False
+        client._send_input_events = AsyncMock()
+
+        await client.drag_path([(i, i) for i in range(6000)])
+
+        assert [len(call.args[0]) for call in client._send_input_events.await_args_list] == [1024] * 5 + [880]
+        assert client.pointer_position == (5999, 5999)
+
+    @pytest.mark.asyncio
+    async def test_failed_send_still_releases_button(self):
+        """Test the button is released when sending the path fails part way."""
+        client = RDPClient(host="localhost")
+        client._use_fast_path_input = False
+        client._send_input_events = AsyncMock(side_effect=[None, ConnectionError("lost")])
+        client._send_mouse_event = AsyncMock()
+
+        with pytest.raises(ConnectionError, match="lost"):
+            await client.drag_path([(i, i) for i in range(2000)], button=2)
+
+        client._send_mouse_event.assert_awaited_once_with(1999, 1999, button=2, is_down=False)
+
+
+class TestClientSendTextBatch:
+    """Tests for RDPClient.send_text_batch."""
+
+    @pytest.mark.asyncio
+    async def test_sends_all_keys_in_one_pdu(self):
+        """Test every character's press and release go out together."""
+        client = RDPClient(host="localhost")
+        client._send_input_events = AsyncMock()
+
+        await client.send_text_batch("abc")
+
+        client._send_input_events.assert_awaited_once()
+        events = client._send_input_events.call_args[0][0]
+        assert len(events) == 6
+
+    @pytest.mark.asyncio
+    async def test_long_text_is_split(self):
+        """Test long strings are split across several PDUs."""
+        client = RDPClient(host="localhost")
+        client._send_input_events = AsyncMock()
+
+        await client.send_text_batch("x" * 600)
+
+        assert client._send_input_events.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_text_is_noop(self):
+        """Test an empty string sends nothing."""
+        client = RDPClient(host="localhost")
+        client._send_input_events = AsyncMock()
+
+        await client.send_text_batch("")
+
+        client._send_input_events.assert_not_awaited()
+
+
+class TestClientSendInput:
+    """Tests for RDPClient.send_input."""
+
+    @pytest.mark.asyncio
+    async def test_mixed_events_go_out_in_one_pdu(self):
+        """Test mouse and key events are encoded in order into a single PDU."""
+        client = RDPClient(host="localhost")
+        client._send_input_events = AsyncMock()
+
+        await client.send_input(
+            [
+                MouseEvent(x=10, y=20),
+                MouseEvent(x=10, y=20, button=MouseButton.LEFT, pressed=True),
+                MouseEvent(x=10, y=20, button=MouseButton.LEFT, pressed=False),
+                KeyEvent(key_code=0x1E),
+                KeyEvent(key_code=0x1E, pressed=False),
+            ]
+        )
+
+        client._send_input_events.assert_awaited_once()
+        events = client._send_input_events.call_args[0][0]
+        assert [event_type for _, event_type, _ in events] == [INPUT_EVENT_MOUSE] * 3 + [INPUT_EVENT_SCANCODE] * 2
+        pointer_flags = [int.from_bytes(data[:2], "little") for _, _, data in events[:3]]
+        assert pointer_flags == [PTRFLAGS_MOVE, PTRFLAGS_BUTTON1 | PTRFLAGS_DOWN, PTRFLAGS_BUTTON1]
+        assert client.pointer_position == (10, 20)
+
+    @pytest.mark.asyncio
+    async def test_modifiers_wrap_key(self):
+        """Test modifiers are pressed before the key and released after it."""
+        client = RDPClient(host="localhost")
+        client._send_input_events = AsyncMock()
+
+        await client.send_input(
+            [
+                KeyEvent(key_code=0x1E, modifiers=(KeyModifier.CTRL, KeyModifier.WIN)),
+                KeyEvent(key_code=0x1E, pressed=False, modifiers=(KeyModifier.CTRL, KeyModifier.WIN)),
+            ]
+        )
+
+        events = client._send_input_events.call_args[0][0]
+        keys = [(int.from_bytes(data[2:4], "little"), int.from_bytes(data[:2], "little")) for _, _, data in events]
+        assert keys == [
+            (0x1D, 0),
+            (0x5B, KBDFLAGS_EXTENDED),
+            (0x1E, 0),
+            (0x1E, KBDFLAGS_RELEASE),
+            (0x5B, KBDFLAGS_RELEASE | KBDFLAGS_EXTENDED),
+            (0x1D, KBDFLAGS_RELEASE),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_noop(self):
+        """Test an empty batch sends nothing."""
+        client = RDPClient(host="localhost")
+        client._send_input_events = AsyncMock()
+
+        await client.send_input([])
+
+        client._send_input_events.assert_not_awaited()
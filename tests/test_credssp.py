@@ -1,18 +1,28 @@
 """Tests for CredSSP module."""
 
+import itertools
+from hashlib import sha256
+
 import pytest
 
 from simple_rdp.credssp import ASN1_CONTEXT_0
+from simple_rdp.credssp import ASN1_CONTEXT_1
+from simple_rdp.credssp import ASN1_CONTEXT_2
 from simple_rdp.credssp import ASN1_INTEGER
 from simple_rdp.credssp import ASN1_OCTET_STRING
 from simple_rdp.credssp import ASN1_SEQUENCE
+from simple_rdp.credssp import CLIENT_SERVER_HASH_MAGIC
 from simple_rdp.credssp import CREDSSP_VERSION
 from simple_rdp.credssp import NONCE_SIZE
+from simple_rdp.credssp import SERVER_CLIENT_HASH_MAGIC
+from simple_rdp.credssp import CredSSPAuth
 from simple_rdp.credssp import _decode_asn1_element
+from simple_rdp.credssp import _decode_asn1_header
 from simple_rdp.credssp import _decode_asn1_length
 from simple_rdp.credssp import _encode_asn1_context
 from simple_rdp.credssp import _encode_asn1_integer
 from simple_rdp.credssp import _encode_asn1_length
+from simple_rdp.credssp import _encode_asn1_nested
 from simple_rdp.credssp import _encode_asn1_octet_string
 from simple_rdp.credssp import _encode_asn1_sequence
 from simple_rdp.credssp import build_ts_credentials
@@ -84,6 +94,18 @@ class TestAsn1LengthDecoding:
         assert length == 256
         assert consumed == 3
 
+    def test_decode_long_form_3_bytes(self) -> None:
+        """Test decoding long form 3 byte length."""
+        length, consumed = _decode_asn1_length(bytes([0x83, 0x01, 0x00, 0x00]), 0)
+        assert length == 0x10000
+        assert consumed == 4
+
+    def test_roundtrip_sweep(self) -> None:
+        """Test every length through the 2-byte form, then a stride up to 3 bytes, round-trips."""
+        for length in itertools.chain(range(0x10100), range(0x10100, 1 << 24, 0xFFF)):
+            encoded = _encode_asn1_length(length)
+            assert _decode_asn1_length(encoded + b"\x00", 0) == (length, len(encoded))
+
 
 class TestAsn1IntegerEncoding:
     """Tests for ASN.1 integer encoding."""
@@ -135,6 +157,17 @@ class TestAsn1Context:
         assert result[2:] == content
 
 
+class TestAsn1Nested:
+    """Tests for nested ASN.1 encoding."""
+
+    @pytest.mark.parametrize("size", [0, 100, 200, 300])
+    def test_matches_step_by_step_encoding(self, size: int) -> None:
+        """Test nesting in one pass matches wrapping one tag at a time."""
+        content = b"\xab" * size
+        expected = _encode_asn1_context(ASN1_CONTEXT_0, _encode_asn1_sequence(_encode_asn1_octet_string(content)))
+        assert _encode_asn1_nested(content, ASN1_OCTET_STRING, ASN1_SEQUENCE, ASN1_CONTEXT_0) == expected
+
+
 class TestAsn1Sequence:
     """Tests for ASN.1 sequence encoding."""
 
@@ -172,6 +205,14 @@ class TestAsn1ElementDecoding:
         assert content == inner
         assert consumed == len(data)
 
+    def test_decode_header_long_form(self) -> None:
+        """Test decoding just the header of a long-form element at an offset."""
+        data = b"\xff" + bytes([ASN1_OCTET_STRING, 0x82, 0x01, 0x00]) + bytes(256)
+        tag, content_start, length = _decode_asn1_header(data, 1)
+        assert tag == ASN1_OCTET_STRING
+        assert content_start == 5
+        assert length == 256
+
 
 class TestTsRequest:
     """Tests for TSRequest building."""
@@ -268,8 +309,6 @@ class TestCredSSPAuth:
 
     def test_credssp_auth_initialization(self) -> None:
         """Test CredSSPAuth can be initialized."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(
             hostname="testserver",
             username="testuser",
@@ -282,8 +321,6 @@ class TestCredSSPAuth:
 
     def test_credssp_auth_client_nonce(self) -> None:
         """Test CredSSPAuth generates random client nonce."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth1 = CredSSPAuth(hostname="test", username="u", password="p")
         auth2 = CredSSPAuth(hostname="test", username="u", password="p")
         # Nonces should be different (random)
@@ -291,23 +328,17 @@ class TestCredSSPAuth:
 
     def test_credssp_auth_server_version_setter(self) -> None:
         """Test CredSSPAuth server version setter."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="test", username="u", password="p")
         auth.server_version = 3
         assert auth.server_version == 3
 
     def test_credssp_auth_pending_token_initial(self) -> None:
         """Test CredSSPAuth pending token is None initially."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="test", username="u", password="p")
         assert auth.pending_token is None
 
     def test_credssp_auth_get_initial_token(self) -> None:
         """Test CredSSPAuth can get initial token."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(
             hostname="testserver",
             username="testuser",
@@ -367,9 +398,6 @@ class TestAsn1EncodingEdgeCases:
 
     def test_encode_asn1_context_higher_tag(self) -> None:
         """Test encoding context with higher tag numbers."""
-        from simple_rdp.credssp import ASN1_CONTEXT_1
-        from simple_rdp.credssp import ASN1_CONTEXT_2
-
         content = b"\x00\x01\x02"
         result1 = _encode_asn1_context(ASN1_CONTEXT_1, content)
         assert result1[0] == ASN1_CONTEXT_1
@@ -423,8 +451,6 @@ class TestCredSSPAuthAdvanced:
 
     def test_credssp_auth_complete_attribute(self) -> None:
         """Test CredSSPAuth complete attribute."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="test", username="u", password="p")
         # Initially, complete is False (depends on underlying SPNEGO context)
         # This just accesses the property
@@ -432,15 +458,11 @@ class TestCredSSPAuthAdvanced:
 
     def test_credssp_auth_hostname_stored(self) -> None:
         """Test CredSSPAuth stores hostname."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="myserver.local", username="u", password="p")
         assert auth._hostname == "myserver.local"
 
     def test_credssp_auth_domain_stored(self) -> None:
         """Test CredSSPAuth stores domain."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="test", username="u", password="p", domain="MYDOMAIN")
         assert auth._domain == "MYDOMAIN"
 
@@ -469,11 +491,6 @@ class TestCredSSPAuthComputeHash:
 
     def test_compute_client_server_hash(self) -> None:
         """Test computing client-to-server hash."""
-        from hashlib import sha256
-
-        from simple_rdp.credssp import CLIENT_SERVER_HASH_MAGIC
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="test", username="u", password="p")
         public_key = b"test_public_key_data"
 
@@ -485,11 +502,6 @@ class TestCredSSPAuthComputeHash:
 
     def test_compute_server_client_hash(self) -> None:
         """Test computing server-to-client hash."""
-        from hashlib import sha256
-
-        from simple_rdp.credssp import SERVER_CLIENT_HASH_MAGIC
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="test", username="u", password="p")
         public_key = b"test_public_key_data"
 
@@ -505,8 +517,6 @@ class TestCredSSPAuthSetters:
 
     def test_set_server_public_key(self) -> None:
         """Test setting server public key."""
-        from simple_rdp.credssp import CredSSPAuth
-
         auth = CredSSPAuth(hostname="test", username="u", password="p")
         public_key = b"server_public_key"
         auth.set_server_public_key(public_key)
@@ -1,6 +1,10 @@
 """Tests for Display class."""
 
 import asyncio
+import dataclasses
+import threading
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -8,6 +12,16 @@ from simple_rdp.display import Display
 from simple_rdp.display import PipelineStats
 from simple_rdp.display import VideoChunk
 
+# Shared payloads; bytes are immutable so every test can reuse the same object
+_FRAME_10x10_BLACK = bytes(300)  # 10x10 RGB
+_BITMAP_10x10_RED_BGRX = b"\x00\x00\xff\x00" * 100  # 10x10 BGRX, 32bpp
+
+
+@pytest.fixture(scope="module")
+def display():
+    """A single uninitialized 100x100 display, shared by read-only tests."""
+    return Display(width=100, height=100)
+
 
 class TestVideoChunk:
     """Tests for VideoChunk dataclass."""
@@ -24,6 +38,13 @@ class TestVideoChunk:
         chunk = VideoChunk(data=b"\x00" * 50, timestamp=1.0, sequence=0)
         assert chunk.size_bytes == 50
 
+    def test_video_chunk_is_immutable(self) -> None:
+        """Test VideoChunk fields can't be reassigned."""
+        chunk = VideoChunk(data=b"\x00" * 50, timestamp=1.0, sequence=0)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            chunk.data = b""  # type: ignore[misc]
+        assert not hasattr(chunk, "__dict__")
+
 
 class TestPipelineStats:
     """Tests for PipelineStats dataclass."""
@@ -95,30 +116,46 @@ class TestDisplay:
         assert stats["queue_drops"] == 0
         assert stats["bitmaps_applied"] == 0
 
-    def test_recording_duration_not_recording(self) -> None:
-        """Test recording_duration_seconds is 0 when not recording."""
+    def test_display_stats_snapshot(self) -> None:
+        """Test stats returns all counters as a copy detached from the display."""
         display = Display(width=100, height=100)
+        display.update_pointer(x=1, y=1)
+        stats = display.stats
+        assert stats == {
+            "frames_received": 0,
+            "frames_encoded": 0,
+            "chunks_produced": 0,
+            "queue_drops": 0,
+            "bitmaps_applied": 0,
+            "pointer_updates": 1,
+            "pointer_updates_throttled": 0,
+        }
+        stats["pointer_updates"] = 100
+        assert display.stats["pointer_updates"] == 1
+
+    def test_recording_duration_not_recording(self, display: Display) -> None:
+        """Test recording_duration_seconds is 0 when not recording."""
         assert display.recording_duration_seconds == 0.0
 
-    def test_effective_fps_no_frames(self) -> None:
+    def test_effective_fps_no_frames(self, display: Display) -> None:
         """Test effective_fps is 0 when no frames."""
-        display = Display(width=100, height=100)
         assert display.effective_fps == 0.0
 
-    def test_consumer_lag_chunks_starts_at_zero(self) -> None:
+    def test_consumer_lag_chunks_starts_at_zero(self, display: Display) -> None:
         """Test consumer_lag_chunks starts at 0."""
-        display = Display(width=100, height=100)
         assert display.consumer_lag_chunks == 0
 
-    def test_is_consumer_behind_false_initially(self) -> None:
+    def test_video_buffer_size_mb_starts_at_zero(self, display: Display) -> None:
+        """Test video_buffer_size_mb starts at 0."""
+        assert display.video_buffer_size_mb == 0
+
+    def test_is_consumer_behind_false_initially(self, display: Display) -> None:
         """Test is_consumer_behind returns False initially."""
-        display = Display(width=100, height=100)
         assert display.is_consumer_behind() is False
         assert display.is_consumer_behind(threshold=0) is False
 
-    def test_get_pipeline_stats(self) -> None:
+    def test_get_pipeline_stats(self, display: Display) -> None:
         """Test get_pipeline_stats returns PipelineStats."""
-        display = Display(width=100, height=100)
         stats = display.get_pipeline_stats()
         assert isinstance(stats, PipelineStats)
         assert stats.frames_received == 0
@@ -156,6 +193,30 @@ class TestDisplayAsync:
         assert img.size == (100, 100)
         assert img.getpixel((0, 0)) == (0, 0, 0)
 
+    @pytest.mark.asyncio
+    async def test_get_latest_frame_before_init(self) -> None:
+        """Test get_latest_frame returns a shared black frame before the screen exists."""
+        display = Display(width=10, height=10)
+        frame = await display.get_latest_frame()
+        assert frame.readonly
+        assert frame == _FRAME_10x10_BLACK
+        again = await display.get_latest_frame()
+        assert again.obj is frame.obj
+
+    @pytest.mark.asyncio
+    async def test_get_latest_frame_shares_cached_bytes(self) -> None:
+        """Test get_latest_frame views the cached frame bytes without copying."""
+        display = Display(width=10, height=10)
+        display.initialize_screen()
+        display.update_pointer(visible=False)
+
+        frame = await display.get_latest_frame()
+        assert frame.readonly
+        assert frame == _FRAME_10x10_BLACK
+        assert frame.obj is display._final_frame_bytes
+        again = await display.get_latest_frame()
+        assert again.obj is frame.obj
+
     @pytest.mark.asyncio
     async def test_get_next_video_chunk_timeout(self) -> None:
         """Test get_next_video_chunk times out when no chunks."""
@@ -163,21 +224,48 @@ class TestDisplayAsync:
         chunk = await display.get_next_video_chunk(timeout=0.1)
         assert chunk is None
 
+    @pytest.mark.asyncio
+    async def test_get_next_video_chunk_returns_queued_chunks_in_order(self) -> None:
+        """Test queued chunks are returned immediately, oldest first."""
+        display = Display(width=10, height=10)
+        for seq in range(3):
+            display._video_queue.put_nowait(VideoChunk(data=b"x", timestamp=0.0, sequence=seq))
+        chunks = [await display.get_next_video_chunk(timeout=0) for _ in range(3)]
+        assert [c.sequence for c in chunks if c] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_video_buffer_size_mb_drops_as_chunks_are_consumed(self) -> None:
+        """Test the queued byte total is reduced by each consumed chunk."""
+        display = Display(width=10, height=10)
+        for seq in range(2):
+            display._queue_video_chunk(bytes(512 * 1024), seq)
+        assert display.video_buffer_size_mb == 1.0
+        await display.get_next_video_chunk(timeout=0)
+        assert display.video_buffer_size_mb == 0.5
+
+    def test_drain_video_chunks_empties_queue_and_byte_total(self) -> None:
+        """Test draining returns queued chunks in order and zeroes the byte total."""
+        display = Display(width=10, height=10)
+        for seq in range(3):
+            display._queue_video_chunk(bytes(1024), seq)
+        chunks = display.drain_video_chunks()
+        assert [c.sequence for c in chunks] == [0, 1, 2]
+        assert display.consumer_lag_chunks == 0
+        assert display.video_buffer_size_mb == 0
+        assert display.drain_video_chunks() == []
+
     @pytest.mark.asyncio
     async def test_apply_bitmap(self) -> None:
         """Test applying bitmap updates."""
         display = Display(width=100, height=100)
         display.initialize_screen()
 
-        # Create a 10x10 red bitmap (BGR format, 32bpp)
-        bitmap_data = b"\x00\x00\xff\x00" * 100  # BGR + X for 10x10
-
         await display.apply_bitmap(
             x=10,
             y=10,
             width=10,
             height=10,
-            data=bitmap_data,
+            data=_BITMAP_10x10_RED_BGRX,
             bpp=32,
         )
 
@@ -189,9 +277,17 @@ class TestDisplayAsync:
         """Test adding a raw frame."""
         display = Display(width=10, height=10)
         display.initialize_screen()
-        # RGB data: 10x10 = 100 pixels * 3 bytes = 300 bytes
-        frame_data = b"\x00" * 300
-        await display.add_raw_frame(frame_data)
+        await display.add_raw_frame(_FRAME_10x10_BLACK)
+        stats = display.stats
+        assert stats["frames_received"] == 1
+
+    @pytest.mark.asyncio
+    async def test_add_raw_frame_memoryview(self) -> None:
+        """Test adding a raw frame from a memoryview."""
+        display = Display(width=10, height=10)
+        display.initialize_screen()
+        frame_buffer = bytearray(300)
+        await display.add_raw_frame(memoryview(frame_buffer))
         stats = display.stats
         assert stats["frames_received"] == 1
 
@@ -200,20 +296,26 @@ class TestDisplayAsync:
         """Test adding multiple frames."""
         display = Display(width=10, height=10)
         display.initialize_screen()
-        frame_data = b"\x00" * 300
         for _ in range(5):
-            await display.add_raw_frame(frame_data)
+            await display.add_raw_frame(_FRAME_10x10_BLACK)
         stats = display.stats
         assert stats["frames_received"] == 5
 
+    @pytest.mark.asyncio
+    async def test_add_raw_frames(self) -> None:
+        """Test adding a batch of raw frames counts each one."""
+        display = Display(width=10, height=10)
+        display.initialize_screen()
+        await display.add_raw_frames([_FRAME_10x10_BLACK] * 5)
+        assert display.stats["frames_received"] == 5
+
     @pytest.mark.asyncio
     async def test_effective_fps_with_frames(self) -> None:
         """Test effective_fps after adding frames."""
         display = Display(width=10, height=10)
         display.initialize_screen()
-        frame_data = b"\x00" * 300
-        await display.add_raw_frame(frame_data)
-        await display.add_raw_frame(frame_data)
+        await display.add_raw_frame(_FRAME_10x10_BLACK)
+        await display.add_raw_frame(_FRAME_10x10_BLACK)
         # After 2 frames, effective_fps should be calculable
         assert display.effective_fps >= 0
 
@@ -241,6 +343,38 @@ class TestDisplayAsync:
         stats = display.stats
         assert stats["frames_received"] == 1
 
+    @pytest.mark.asyncio
+    async def test_add_frame_rgba_without_screen_matches_convert(self) -> None:
+        """Test a 1080p RGBA frame is packed to the same bytes as convert("RGB")."""
+        from PIL import Image
+
+        display = Display(width=1920, height=1080)
+        display.add_raw_frame = AsyncMock()  # type: ignore[method-assign]
+        img = Image.new("RGBA", (1920, 1080), color=(255, 0, 0, 128))
+        img.putpixel((7, 3), (1, 2, 3, 4))
+        await display.add_frame(img)
+        display.add_raw_frame.assert_awaited_once_with(img.convert("RGB").tobytes())
+
+    @pytest.mark.asyncio
+    async def test_add_frame_reuses_bytes_until_redraw(self) -> None:
+        """Test add_frame reuses frame bytes until the display is redrawn."""
+        from PIL import Image
+
+        display = Display(width=10, height=10)
+        display.initialize_screen()
+        img = Image.new("RGB", (10, 10))
+        await display.add_frame(img)
+        first = display._final_frame_bytes
+        assert first is not None
+        assert len(first) == 300
+
+        await display.add_frame(img)
+        assert display._final_frame_bytes is first
+
+        display.update_pointer(x=5, y=5, visible=False)
+        await display.add_frame(img)
+        assert display._final_frame_bytes is not first
+
 
 class TestDisplayPrintStats:
     """Tests for Display print_stats method."""
@@ -259,9 +393,8 @@ class TestDisplayPrintStats:
         """Test print_stats after adding frames."""
         display = Display(width=10, height=10)
         display.initialize_screen()
-        frame_data = b"\x00" * 300
-        await display.add_raw_frame(frame_data)
-        await display.add_raw_frame(frame_data)
+        await display.add_raw_frame(_FRAME_10x10_BLACK)
+        await display.add_raw_frame(_FRAME_10x10_BLACK)
         display.print_stats()
         captured = capsys.readouterr()
         # Should show frames received
@@ -279,23 +412,200 @@ class TestDisplayEncoding:
         await display.stop_streaming()
         assert display.is_streaming is False
 
+    @pytest.mark.asyncio
+    async def test_stop_streaming_transcodes_off_the_event_loop(self, tmp_path) -> None:
+        """Test the recording is transcoded in a worker thread and the temp file removed."""
+        display = Display(width=10, height=10)
+        temp_file = tmp_path / "recording.ts"
+        temp_file.write_bytes(b"ts")
+        display._streaming = True
+        display._temp_file_path = str(temp_file)
+        main_thread = threading.get_ident()
+        calls = []
+
+        def fake_transcode(input_path: str, output_path: str) -> bool:
+            calls.append((input_path, output_path, threading.get_ident()))
+            return True
+
+        display.transcode = fake_transcode  # type: ignore[method-assign]
+        await display.stop_streaming(record_to=str(tmp_path / "out.mp4"))
+
+        [(input_path, output_path, thread_id)] = calls
+        assert (input_path, output_path) == (str(temp_file), str(tmp_path / "out.mp4"))
+        assert thread_id != main_thread
+        assert not temp_file.exists()
+
+
+class TestDisplayFrameWriter:
+    """Tests for handing raw frames to the ffmpeg writer task."""
+
+    @staticmethod
+    def _start_writer(display: Display) -> MagicMock:
+        """Attach a fake ffmpeg process and start the writer task."""
+        process = MagicMock()
+        display._ffmpeg_process = process
+        display._streaming = True
+        display._writer_task = asyncio.create_task(display._write_video_input())
+        return process
+
+    @pytest.mark.asyncio
+    async def test_flush_waits_for_all_frames(self) -> None:
+        """Test every queued frame is written once flush returns."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        for _ in range(5):
+            await display.add_raw_frame(_FRAME_10x10_BLACK)
+        await display.flush()
+        assert display.stats["frames_encoded"] == 5
+        assert process.stdin.write.call_count == 5
+        assert display.get_pipeline_stats().frames_in_flight == 0
+        await display._stop_ffmpeg()
+
+    @pytest.mark.asyncio
+    async def test_add_raw_frames_writes_whole_batch(self) -> None:
+        """Test a batch larger than the in-flight limit is written in order."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        frames = [bytes([i]) * 300 for i in range(Display.MAX_FRAMES_IN_FLIGHT + 3)]
+        await display.add_raw_frames(frames)
+        await display.flush()
+        assert display.stats["frames_received"] == len(frames)
+        assert [call.args[0] for call in process.stdin.write.call_args_list] == frames
+        await display._stop_ffmpeg()
+
+    @pytest.mark.asyncio
+    async def test_mutable_buffer_is_copied(self) -> None:
+        """Test a reusable frame buffer can be overwritten right after add_raw_frame."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        frame_buffer = bytearray(300)
+        await display.add_raw_frame(memoryview(frame_buffer))
+        frame_buffer[:] = b"\xff" * 300
+        await display.flush()
+        process.stdin.write.assert_called_once_with(_FRAME_10x10_BLACK)
+        await display._stop_ffmpeg()
+
+    @pytest.mark.asyncio
+    async def test_read_only_view_of_mutable_buffer_is_copied(self) -> None:
+        """Test a read-only memoryview over a reusable buffer is still copied."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        frame_buffer = bytearray(300)
+        await display.add_raw_frame(memoryview(frame_buffer).toreadonly())
+        frame_buffer[:] = b"\xff" * 300
+        await display.flush()
+        process.stdin.write.assert_called_once_with(_FRAME_10x10_BLACK)
+        await display._stop_ffmpeg()
+
+    @pytest.mark.asyncio
+    async def test_view_over_bytes_is_not_copied(self) -> None:
+        """Test a memoryview over bytes is queued without a copy."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        frame = memoryview(_FRAME_10x10_BLACK)
+        await display.add_raw_frame(frame)
+        await display.flush()
+        assert process.stdin.write.call_args.args[0] is frame
+        await display._stop_ffmpeg()
+
+    @pytest.mark.asyncio
+    async def test_mutable_frames_reuse_ring_slots(self) -> None:
+        """Test full-size mutable frames are copied into a fixed set of preallocated slots."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        frame_buffer = bytearray(300)
+        for value in range(10):
+            frame_buffer[0] = value
+            await display.add_raw_frame(frame_buffer)
+        await display.flush()
+        assert display._frame_ring is not None
+        assert len(display._frame_ring) == Display.MAX_FRAMES_IN_FLIGHT + 2
+        written = [call.args[0] for call in process.stdin.write.call_args_list]
+        assert all(isinstance(frame, memoryview) for frame in written)
+        await display._stop_ffmpeg()
+
+    @pytest.mark.asyncio
+    async def test_odd_sized_mutable_frame_is_copied_to_bytes(self) -> None:
+        """Test a mutable frame that isn't full-size bypasses the ring."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        await display.add_raw_frame(bytearray(30))
+        await display.flush()
+        assert display._frame_ring is None
+        process.stdin.write.assert_called_once_with(bytes(30))
+        await display._stop_ffmpeg()
+
+    @pytest.mark.asyncio
+    async def test_stop_streaming_writes_every_accepted_frame(self) -> None:
+        """Test frames accepted before stop_streaming all reach ffmpeg."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        process.wait.return_value = 0
+        for _ in range(5):
+            await display.add_raw_frame(_FRAME_10x10_BLACK)
+        await display.stop_streaming()
+        assert process.stdin.write.call_count == 5
+        assert display.stats["frames_encoded"] == 5
+        process.stdin.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_write_in_progress(self) -> None:
+        """Test stdin isn't closed while a write is still running in the executor."""
+        display = Display(width=10, height=10)
+        process = self._start_writer(display)
+        process.wait.return_value = 0
+        write_started = threading.Event()
+        release_write = threading.Event()
+        events = []
+
+        def slow_write(data: bytes) -> None:
+            write_started.set()
+            release_write.wait(1.0)
+            events.append("write")
+
+        process.stdin.write.side_effect = slow_write
+        process.stdin.close.side_effect = lambda: events.append("close")
+        await display.add_raw_frame(_FRAME_10x10_BLACK)
+        await asyncio.to_thread(write_started.wait, 1.0)
+        stop = asyncio.create_task(display._stop_ffmpeg())
+        await asyncio.sleep(0.01)
+        release_write.set()
+        await stop
+        assert events == ["write", "close"]
+
+    @pytest.mark.asyncio
+    async def test_stop_discards_unwritten_frames(self) -> None:
+        """Test stopping drops queued frames so flush doesn't hang."""
+        display = Display(width=10, height=10)
+        self._start_writer(display)
+        display._frame_queue.put_nowait(_FRAME_10x10_BLACK)
+        await display._stop_ffmpeg()
+        await asyncio.wait_for(display.flush(), 1.0)
+
 
 class TestDisplayStatsDetails:
     """Tests for Display stats in more detail."""
 
     @pytest.mark.asyncio
-    async def test_stats_are_copy(self) -> None:
-        """Test that stats returns a copy, not the original dict."""
+    async def test_bitmap_apply_times_keep_latest_samples(self) -> None:
+        """Test the bitmap timing window is capped at the most recent samples."""
         display = Display(width=10, height=10)
+        display.initialize_screen()
+        for _ in range(display._max_latency_samples + 5):
+            await display.apply_bitmap(x=0, y=0, width=1, height=1, data=b"\x00\x00\xff\x00", bpp=32)
+        assert len(display._bitmap_apply_times) == display._max_latency_samples
+
+    @pytest.mark.asyncio
+    async def test_stats_are_copy(self, display: Display) -> None:
+        """Test that stats returns a copy, not the original dict."""
         stats1 = display.stats
         stats1["frames_received"] = 999
         stats2 = display.stats
         assert stats2["frames_received"] == 0
 
     @pytest.mark.asyncio
-    async def test_screen_lock_exists(self) -> None:
+    async def test_screen_lock_exists(self, display: Display) -> None:
         """Test that _screen_lock exists and is an asyncio.Lock."""
-        display = Display(width=10, height=10)
         assert hasattr(display, "_screen_lock")
         assert isinstance(display._screen_lock, asyncio.Lock)
 
@@ -303,19 +613,16 @@ class TestDisplayStatsDetails:
 class TestDisplayVideoQueue:
     """Tests for Display video queue management."""
 
-    def test_video_queue_exists(self) -> None:
+    def test_video_queue_exists(self, display: Display) -> None:
         """Test video queue is initialized."""
-        display = Display(width=100, height=100)
         assert display._video_queue is not None
 
-    def test_chunk_sequence_starts_at_zero(self) -> None:
+    def test_chunk_sequence_starts_at_zero(self, display: Display) -> None:
         """Test chunk sequence counter starts at 0."""
-        display = Display(width=100, height=100)
         assert display._chunk_sequence == 0
 
-    def test_default_queue_size(self) -> None:
+    def test_default_queue_size(self, display: Display) -> None:
         """Test default queue size is 600."""
-        display = Display(width=100, height=100)
         assert display._queue_size == Display.DEFAULT_QUEUE_SIZE
         assert display._queue_size == 600
 
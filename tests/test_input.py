@@ -1,5 +1,9 @@
 """Tests for Input types."""
 
+import dataclasses
+
+import pytest
+
 from simple_rdp.input import KeyEvent
 from simple_rdp.input import KeyModifier
 from simple_rdp.input import MouseButton
@@ -44,6 +48,13 @@ class TestMouseEvent:
         assert event.button == MouseButton.LEFT
         assert event.pressed is True
 
+    def test_mouse_event_is_immutable_and_slotted(self):
+        """Test MouseEvent is frozen and has no per-instance __dict__."""
+        event = MouseEvent(x=100, y=200)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            event.x = 5  # type: ignore[misc]
+        assert not hasattr(event, "__dict__")
+
 
 class TestKeyEvent:
     """Tests for KeyEvent dataclass."""
@@ -59,3 +70,7 @@ class TestKeyEvent:
         """Test KeyEvent with modifiers."""
         event = KeyEvent(key_code=0x1C, modifiers=(KeyModifier.CTRL, KeyModifier.SHIFT))
         assert event.modifiers == (KeyModifier.CTRL, KeyModifier.SHIFT)
+
+    def test_key_event_is_hashable(self):
+        """Test equal KeyEvents hash alike, so they can be used as dict keys."""
+        assert hash(KeyEvent(key_code=0x1C)) == hash(KeyEvent(key_code=0x1C))
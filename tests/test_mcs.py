@@ -169,6 +169,11 @@ class TestDomainParameters:
         )
         assert len(result) > 0
 
+    def test_build_domain_parameters_memoized(self) -> None:
+        """Test repeated calls with the same arguments return the cached encoding."""
+        first = build_domain_parameters(max_channel_ids=7, max_user_ids=3)
+        assert build_domain_parameters(max_channel_ids=7, max_user_ids=3) is first
+
 
 class TestMcsPduBuilding:
     """Tests for MCS PDU building functions."""
@@ -2,8 +2,10 @@
 
 import struct
 
+import pytest
+
+from simple_rdp import pdu
 from simple_rdp.pdu import CTRLACTION_COOPERATE
-from simple_rdp.pdu import CTRLACTION_DETACH
 from simple_rdp.pdu import CTRLACTION_GRANTED_CONTROL
 from simple_rdp.pdu import CTRLACTION_REQUEST_CONTROL
 from simple_rdp.pdu import INFO_DISABLECTRLALTDEL
@@ -12,40 +14,29 @@ from simple_rdp.pdu import INFO_MOUSE
 from simple_rdp.pdu import INFO_UNICODE
 from simple_rdp.pdu import INPUT_EVENT_MOUSE
 from simple_rdp.pdu import INPUT_EVENT_SCANCODE
-from simple_rdp.pdu import INPUT_EVENT_SYNC
-from simple_rdp.pdu import INPUT_EVENT_UNICODE
-from simple_rdp.pdu import KBDFLAGS_DOWN
-from simple_rdp.pdu import KBDFLAGS_EXTENDED
-from simple_rdp.pdu import KBDFLAGS_RELEASE
-from simple_rdp.pdu import PDUTYPE2_CONTROL
 from simple_rdp.pdu import PDUTYPE2_INPUT
 from simple_rdp.pdu import PDUTYPE2_SYNCHRONIZE
-from simple_rdp.pdu import PDUTYPE2_UPDATE
 from simple_rdp.pdu import PDUTYPE_CONFIRMACTIVEPDU
 from simple_rdp.pdu import PDUTYPE_DATAPDU
-from simple_rdp.pdu import PDUTYPE_DEMANDACTIVEPDU
-from simple_rdp.pdu import PERF_DISABLE_CURSOR_SHADOW
-from simple_rdp.pdu import PERF_DISABLE_FULLWINDOWDRAG
-from simple_rdp.pdu import PERF_DISABLE_MENUANIMATIONS
-from simple_rdp.pdu import PERF_DISABLE_THEMING
-from simple_rdp.pdu import PERF_DISABLE_WALLPAPER
 from simple_rdp.pdu import PTRFLAGS_BUTTON1
 from simple_rdp.pdu import PTRFLAGS_BUTTON2
 from simple_rdp.pdu import PTRFLAGS_BUTTON3
 from simple_rdp.pdu import PTRFLAGS_DOWN
-from simple_rdp.pdu import PTRFLAGS_MOVE
 from simple_rdp.pdu import SEC_ENCRYPT
 from simple_rdp.pdu import SEC_EXCHANGE_PKT
 from simple_rdp.pdu import SEC_INFO_PKT
 from simple_rdp.pdu import SEC_LICENSE_PKT
 from simple_rdp.pdu import UPDATETYPE_BITMAP
-from simple_rdp.pdu import UPDATETYPE_ORDERS
 from simple_rdp.pdu import build_client_info_pdu
 from simple_rdp.pdu import build_confirm_active_pdu
 from simple_rdp.pdu import build_control_pdu
+from simple_rdp.pdu import build_fast_path_input_pdu
+from simple_rdp.pdu import build_fast_path_mouse_event
+from simple_rdp.pdu import build_fast_path_mouse_move_pdu
 from simple_rdp.pdu import build_font_list_pdu
 from simple_rdp.pdu import build_input_event_pdu
 from simple_rdp.pdu import build_mouse_event
+from simple_rdp.pdu import build_mouse_move_input_event_pdu
 from simple_rdp.pdu import build_refresh_rect_pdu
 from simple_rdp.pdu import build_scancode_event
 from simple_rdp.pdu import build_security_exchange_pdu
@@ -58,94 +49,76 @@ from simple_rdp.pdu import parse_bitmap_update
 from simple_rdp.pdu import parse_demand_active_pdu
 from simple_rdp.pdu import parse_update_pdu
 
-
-class TestSecurityHeaderFlags:
-    """Tests for security header flag constants."""
-
-    def test_sec_info_pkt_flag(self) -> None:
-        """Test SEC_INFO_PKT flag value."""
-        assert SEC_INFO_PKT == 0x0040
-
-    def test_flags_are_powers_of_two(self) -> None:
-        """Test that flags are powers of two for bitwise OR."""
-        from simple_rdp.pdu import SEC_ENCRYPT
-        from simple_rdp.pdu import SEC_EXCHANGE_PKT
-        from simple_rdp.pdu import SEC_LICENSE_PKT
-
+# Minimal update payloads: a bitmap updateType field and an empty rectangle count
+_BITMAP_UPDATE_TYPE = struct.pack("<H", UPDATETYPE_BITMAP)
+_ZERO_RECT_COUNT = struct.pack("<H", 0)
+
+# Protocol constants and their MS-RDPBCGR values, checked in one test
+_EXPECTED_CONSTANTS = {
+    # Security header flags
+    "SEC_EXCHANGE_PKT": 0x0001,
+    "SEC_ENCRYPT": 0x0008,
+    "SEC_INFO_PKT": 0x0040,
+    "SEC_LICENSE_PKT": 0x0080,
+    # Share control / share data PDU types
+    "PDUTYPE_DEMANDACTIVEPDU": 0x0001,
+    "PDUTYPE_CONFIRMACTIVEPDU": 0x0003,
+    "PDUTYPE_DATAPDU": 0x0007,
+    "PDUTYPE2_UPDATE": 0x02,
+    "PDUTYPE2_CONTROL": 0x14,
+    "PDUTYPE2_INPUT": 0x1C,
+    "PDUTYPE2_SYNCHRONIZE": 0x1F,
+    # Control actions
+    "CTRLACTION_REQUEST_CONTROL": 0x0001,
+    "CTRLACTION_GRANTED_CONTROL": 0x0002,
+    "CTRLACTION_DETACH": 0x0003,
+    "CTRLACTION_COOPERATE": 0x0004,
+    # Input event types
+    "INPUT_EVENT_SYNC": 0x0000,
+    "INPUT_EVENT_SCANCODE": 0x0004,
+    "INPUT_EVENT_UNICODE": 0x0005,
+    "INPUT_EVENT_MOUSE": 0x8001,
+    # Update types
+    "UPDATETYPE_ORDERS": 0x0000,
+    "UPDATETYPE_BITMAP": 0x0001,
+    # Mouse event flags
+    "PTRFLAGS_MOVE": 0x0800,
+    "PTRFLAGS_DOWN": 0x8000,
+    "PTRFLAGS_BUTTON1": 0x1000,
+    # Keyboard event flags
+    "KBDFLAGS_EXTENDED": 0x0100,
+    "KBDFLAGS_DOWN": 0x4000,
+    "KBDFLAGS_RELEASE": 0x8000,
+    # Info packet flags
+    "INFO_MOUSE": 0x00000001,
+    "INFO_UNICODE": 0x00000010,
+    # Performance flags
+    "PERF_DISABLE_WALLPAPER": 0x00000001,
+    "PERF_DISABLE_FULLWINDOWDRAG": 0x00000002,
+    "PERF_DISABLE_MENUANIMATIONS": 0x00000004,
+    "PERF_DISABLE_THEMING": 0x00000008,
+    "PERF_DISABLE_CURSOR_SHADOW": 0x00000020,
+}
+
+
+class TestConstants:
+    """Tests for protocol constant values."""
+
+    def test_constant_values(self) -> None:
+        """Test constant values match MS-RDPBCGR."""
+        actual = {name: getattr(pdu, name) for name in _EXPECTED_CONSTANTS}
+        assert actual == _EXPECTED_CONSTANTS
+
+    def test_security_flags_are_powers_of_two(self) -> None:
+        """Test that security flags are powers of two for bitwise OR."""
         # Each flag should be a power of 2
         assert SEC_EXCHANGE_PKT & (SEC_EXCHANGE_PKT - 1) == 0
         assert SEC_ENCRYPT & (SEC_ENCRYPT - 1) == 0
         assert SEC_INFO_PKT & (SEC_INFO_PKT - 1) == 0
         assert SEC_LICENSE_PKT & (SEC_LICENSE_PKT - 1) == 0
 
-
-class TestPduTypes:
-    """Tests for PDU type constants."""
-
-    def test_share_control_pdu_types(self) -> None:
-        """Test share control PDU type values."""
-        assert PDUTYPE_CONFIRMACTIVEPDU == 0x0003
-        assert PDUTYPE_DATAPDU == 0x0007
-
-    def test_share_data_pdu_types(self) -> None:
-        """Test share data PDU type values."""
-        assert PDUTYPE2_SYNCHRONIZE == 0x1F
-        assert PDUTYPE2_CONTROL == 0x14
-
-
-class TestInputEventTypes:
-    """Tests for input event type constants."""
-
-    def test_input_event_scancode(self) -> None:
-        """Test scancode input event type."""
-        assert INPUT_EVENT_SCANCODE == 0x0004
-
-    def test_input_event_mouse(self) -> None:
-        """Test mouse input event type."""
-        assert INPUT_EVENT_MOUSE == 0x8001
-
-
-class TestMouseEventFlags:
-    """Tests for mouse event flag constants."""
-
-    def test_ptrflags_move(self) -> None:
-        """Test mouse move flag."""
-        assert PTRFLAGS_MOVE == 0x0800
-
-    def test_ptrflags_down(self) -> None:
-        """Test mouse button down flag."""
-        assert PTRFLAGS_DOWN == 0x8000
-
-    def test_ptrflags_button1(self) -> None:
-        """Test left button flag."""
-        assert PTRFLAGS_BUTTON1 == 0x1000
-
-
-class TestKeyboardEventFlags:
-    """Tests for keyboard event flag constants."""
-
-    def test_kbdflags_down(self) -> None:
-        """Test key down flag."""
-        assert KBDFLAGS_DOWN == 0x4000
-
-    def test_kbdflags_release(self) -> None:
-        """Test key release flag."""
-        assert KBDFLAGS_RELEASE == 0x8000
-
-
-class TestInfoPacketFlags:
-    """Tests for info packet flag constants."""
-
-    def test_info_mouse(self) -> None:
-        """Test mouse support flag."""
-        assert INFO_MOUSE == 0x00000001
-
-    def test_info_unicode(self) -> None:
-        """Test unicode support flag."""
-        assert INFO_UNICODE == 0x00000010
-
-    def test_combined_flags(self) -> None:
-        """Test combining flags."""
+    def test_combined_info_flags(self) -> None:
+        """Test combining info packet flags."""
         flags = INFO_MOUSE | INFO_UNICODE | INFO_LOGONNOTIFY | INFO_DISABLECTRLALTDEL
         assert flags & INFO_MOUSE
         assert flags & INFO_UNICODE
@@ -186,6 +159,12 @@ class TestSynchronizePdu:
         assert isinstance(result, bytes)
         assert len(result) > 0
 
+    def test_build_synchronize_pdu_cached(self) -> None:
+        """Test repeated calls share one PDU and still pack the target user."""
+        result = build_synchronize_pdu(1002)
+        assert result == struct.pack("<HH", 0x0001, 1002)
+        assert build_synchronize_pdu(1002) is result
+
 
 class TestControlPdu:
     """Tests for control PDU building."""
@@ -201,6 +180,12 @@ class TestControlPdu:
         result = build_control_pdu(CTRLACTION_REQUEST_CONTROL)
         assert isinstance(result, bytes)
 
+    def test_build_control_pdu_with_ids(self) -> None:
+        """Test that grant and control IDs bypass the precomputed PDUs."""
+        assert build_control_pdu(CTRLACTION_COOPERATE) == struct.pack("<HHI", CTRLACTION_COOPERATE, 0, 0)
+        result = build_control_pdu(CTRLACTION_GRANTED_CONTROL, grant_id=1007, control_id=0x03EA)
+        assert result == struct.pack("<HHI", CTRLACTION_GRANTED_CONTROL, 1007, 0x03EA)
+
 
 class TestInputEvents:
     """Tests for input event building."""
@@ -242,30 +227,6 @@ class TestInputEvents:
         assert isinstance(result, bytes)
 
 
-class TestPerformanceFlags:
-    """Tests for performance flag constants."""
-
-    def test_perf_disable_wallpaper(self) -> None:
-        """Test disable wallpaper flag."""
-        assert PERF_DISABLE_WALLPAPER == 0x00000001
-
-    def test_perf_disable_fullwindowdrag(self) -> None:
-        """Test disable full window drag flag."""
-        assert PERF_DISABLE_FULLWINDOWDRAG == 0x00000002
-
-    def test_perf_disable_menuanimations(self) -> None:
-        """Test disable menu animations flag."""
-        assert PERF_DISABLE_MENUANIMATIONS == 0x00000004
-
-    def test_perf_disable_theming(self) -> None:
-        """Test disable theming flag."""
-        assert PERF_DISABLE_THEMING == 0x00000008
-
-    def test_perf_disable_cursor_shadow(self) -> None:
-        """Test disable cursor shadow flag."""
-        assert PERF_DISABLE_CURSOR_SHADOW == 0x00000020
-
-
 class TestShareControlHeader:
     """Tests for share control header building."""
 
@@ -309,13 +270,23 @@ class TestShareDataHeader:
         )
         assert isinstance(result, bytes)
 
+    def test_build_share_data_header_uncompressed_length(self) -> None:
+        """Test the uncompressed length lands after the padding and stream ID."""
+        result = build_share_data_header(
+            share_id=0x12345678,
+            pdu_source=1001,
+            pdu_type2=PDUTYPE2_INPUT,
+            uncompressed_length=0x0102,
+        )
+        assert result == b"\x78\x56\x34\x12\x00\x01\x02\x01" + bytes([PDUTYPE2_INPUT]) + b"\x00\x00\x00"
+
 
 class TestSecurityExchangePdu:
     """Tests for security exchange PDU building."""
 
     def test_build_security_exchange_pdu(self) -> None:
         """Test building security exchange PDU."""
-        encrypted_random = bytes([0x00] * 32)
+        encrypted_random = b"\x00" * 32
         result = build_security_exchange_pdu(encrypted_random)
         assert isinstance(result, bytes)
         # Should include header flags + length + data + padding
@@ -330,6 +301,7 @@ class TestFontListPdu:
         result = build_font_list_pdu()
         assert isinstance(result, bytes)
         assert len(result) == 8  # 4 x 2-byte fields
+        assert build_font_list_pdu() is result
 
 
 class TestInputEventPdu:
@@ -342,7 +314,7 @@ class TestInputEventPdu:
 
     def test_build_input_event_pdu_with_events(self) -> None:
         """Test building input event PDU with events."""
-        event_data = bytes([0x00] * 4)
+        event_data = b"\x00" * 4
         events = [(0, INPUT_EVENT_SCANCODE, event_data)]
         result = build_input_event_pdu(events)
         assert isinstance(result, bytes)
@@ -418,7 +390,7 @@ class TestParsingFunctions:
     def test_parse_update_pdu_bitmap(self) -> None:
         """Test parsing bitmap update PDU."""
         # Build a minimal bitmap update header
-        data = struct.pack("<H", UPDATETYPE_BITMAP)  # Update type
+        data = _BITMAP_UPDATE_TYPE
         result = parse_update_pdu(data)
         assert isinstance(result, dict)
         assert result["update_type"] == UPDATETYPE_BITMAP
@@ -427,7 +399,7 @@ class TestParsingFunctions:
     def test_parse_update_pdu_with_data(self) -> None:
         """Test parsing update PDU with data."""
         extra_data = b"\x01\x02\x03\x04"
-        data = struct.pack("<H", UPDATETYPE_BITMAP) + extra_data
+        data = _BITMAP_UPDATE_TYPE + extra_data
         result = parse_update_pdu(data)
         assert result["update_type"] == UPDATETYPE_BITMAP
         assert result["data"] == extra_data
@@ -440,9 +412,7 @@ class TestParsingFunctions:
 
     def test_parse_bitmap_update_empty(self) -> None:
         """Test parsing empty bitmap update."""
-        # Number of rectangles: 0
-        data = struct.pack("<H", 0)
-        result = parse_bitmap_update(data)
+        result = parse_bitmap_update(_ZERO_RECT_COUNT)
         assert isinstance(result, list)
         assert len(result) == 0
 
@@ -697,47 +667,41 @@ class TestMoreMouseEvents:
         assert not (flags & PTRFLAGS_DOWN)  # Down should NOT be set
 
 
-class TestMoreConstants:
-    """Additional tests for constants."""
-
-    def test_control_actions(self) -> None:
-        """Test control action constants."""
-        assert CTRLACTION_REQUEST_CONTROL == 0x0001
-        assert CTRLACTION_GRANTED_CONTROL == 0x0002
-        assert CTRLACTION_DETACH == 0x0003
-        assert CTRLACTION_COOPERATE == 0x0004
-
-    def test_input_event_types(self) -> None:
-        """Test input event type constants."""
-        assert INPUT_EVENT_SYNC == 0x0000
-        assert INPUT_EVENT_SCANCODE == 0x0004
-        assert INPUT_EVENT_UNICODE == 0x0005
-        assert INPUT_EVENT_MOUSE == 0x8001
-
-    def test_update_types(self) -> None:
-        """Test update type constants."""
-        assert UPDATETYPE_ORDERS == 0x0000
-        assert UPDATETYPE_BITMAP == 0x0001
-
-    def test_pdu_types(self) -> None:
-        """Test PDU type constants."""
-        assert PDUTYPE_DEMANDACTIVEPDU == 0x0001
-        assert PDUTYPE_CONFIRMACTIVEPDU == 0x0003
-
-    def test_pdu2_types(self) -> None:
-        """Test PDU2 type constants."""
-        assert PDUTYPE2_UPDATE == 0x02
-        assert PDUTYPE2_INPUT == 0x1C
-
-    def test_keyboard_flags(self) -> None:
-        """Test keyboard flag constants."""
-        assert KBDFLAGS_EXTENDED == 0x0100
-        assert KBDFLAGS_DOWN == 0x4000
-        assert KBDFLAGS_RELEASE == 0x8000
-
-    def test_security_flags(self) -> None:
-        """Test security flag constants."""
-        assert SEC_EXCHANGE_PKT == 0x0001
-        assert SEC_ENCRYPT == 0x0008
-        assert SEC_INFO_PKT == 0x0040
-        assert SEC_LICENSE_PKT == 0x0080
+class TestFastPathMouseMovePdu:
+    """Tests for build_fast_path_mouse_move_pdu."""
+
+    def test_matches_generic_builder_short(self) -> None:
+        """Test a short path matches the per-event builder byte for byte."""
+        points = [(1, 2), (300, 400), (1919, 1079)]
+        expected = build_fast_path_input_pdu([build_fast_path_mouse_event(x, y) for x, y in points])
+        assert build_fast_path_mouse_move_pdu(points) == expected
+
+    def test_matches_generic_builder_long(self) -> None:
+        """Test a path needing numEvents and a 2-byte length matches too."""
+        points = [(i, 2 * i) for i in range(255)]
+        expected = build_fast_path_input_pdu([build_fast_path_mouse_event(x, y) for x, y in points])
+        assert build_fast_path_mouse_move_pdu(points) == expected
+
+    def test_empty(self) -> None:
+        """Test an empty path builds nothing."""
+        assert build_fast_path_mouse_move_pdu([]) == b""
+
+    def test_too_many_events(self) -> None:
+        """Test more than 255 events is rejected."""
+        with pytest.raises(ValueError, match="255"):
+            build_fast_path_mouse_move_pdu([(0, 0)] * 256)
+
+
+class TestMouseMoveInputEventPdu:
+    """Tests for build_mouse_move_input_event_pdu."""
+
+    def test_matches_generic_builder(self) -> None:
+        """Test a path matches the per-event builder byte for byte."""
+        points = [(i, 2 * i) for i in range(300)] + [(-1, 70000)]
+        event_time = 0x12345678
+        expected = build_input_event_pdu([(event_time, INPUT_EVENT_MOUSE, build_mouse_event(x, y)) for x, y in points])
+        assert build_mouse_move_input_event_pdu(points, event_time) == expected
+
+    def test_empty(self) -> None:
+        """Test an empty path builds a PDU with no events."""
+        assert build_mouse_move_input_event_pdu([], 0) == build_input_event_pdu([])